@@ -0,0 +1,106 @@
+"""
+API Authentication Classes for CalloutRacing Application
+
+This module contains DRF authentication classes for API clients:
+- StatelessJWTAuthentication: Signed bearer tokens checked without touching
+  the session, CSRF or the database
+- RevocationAwareTokenRefreshSerializer: Refresh with rotation that honours
+  the token revocation list and refuses missing or inactive users
+"""
+
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from core.models.auth import User
+from core.token_service import is_revoked
+
+
+class LazyTokenUser(SimpleLazyObject):
+    """
+    Request user backed by token claims.
+
+    Identity checks (is_authenticated, id, pk) are answered from the token.
+    The User row is only loaded the first time a view touches any other
+    attribute, so endpoints that just need the caller's id never query it.
+    A token whose user has since been deleted fails authentication there.
+    """
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id):
+        self.__dict__['_user_id'] = user_id
+        super().__init__(lambda: self._load_user(user_id))
+
+    @staticmethod
+    def _load_user(user_id):
+        try:
+            return User.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+
+    @property
+    def id(self):
+        return self.__dict__['_user_id']
+
+    @property
+    def pk(self):
+        return self.__dict__['_user_id']
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that never hits the database per request.
+
+    The token signature and expiry are verified locally and the revocation
+    list is checked with a single cache lookup. Deactivated users are cut off
+    through core.token_service.revoke_all_for_user rather than an is_active
+    lookup on every request (see core.signals); refreshing a token checks
+    the user row, so access tokens are never renewed for them.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if is_revoked(validated_token.payload):
+            raise InvalidToken({
+                'detail': 'Token has been revoked',
+                'code': 'token_revoked',
+            })
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+        return LazyTokenUser(user_id)
+
+
+class RevocationAwareTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Rotate refresh tokens, refusing ones revoked via the revocation list.
+
+    Refresh is the one token path that loads the user, so a deleted or
+    deactivated account can't mint new access tokens even if its
+    revocation cutoff has been evicted from the cache.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if is_revoked(refresh.payload):
+            raise InvalidToken({
+                'detail': 'Token has been revoked',
+                'code': 'token_revoked',
+            })
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).only('is_active').first()
+        if user is None or not user.is_active:
+            raise InvalidToken({
+                'detail': 'No active account found for this token',
+                'code': 'user_inactive',
+            })
+        return super().validate(attrs)
+
@@ -0,0 +1,54 @@
+"""
+DRF permissions for subscription-gated features.
+
+Checks use core.entitlements, which caches each user's plan and memoizes it
+on the request, so gating a hot endpoint adds no queries. Use the classes
+with @permission_classes([...]) / permission_classes = [...]:
+
+    permission_classes = [IsAuthenticated, requires_feature('Analytics')]
+    permission_classes = [IsAuthenticated, requires_plan('pro')]
+"""
+
+from rest_framework.permissions import BasePermission
+
+from core.entitlements import for_request
+
+
+class HasActiveSubscription(BasePermission):
+    """Allow users with an active or trialing subscription."""
+    message = 'An active subscription is required.'
+
+    def has_permission(self, request, view):
+        return for_request(request).is_subscribed
+
+
+class HasFeature(BasePermission):
+    """Allow users whose plan includes `feature` (a SUBSCRIPTION_PLANS feature name)."""
+    feature = None
+
+    def has_permission(self, request, view):
+        return for_request(request).has_feature(self.feature)
+
+
+class HasPlan(BasePermission):
+    """Allow users on `plan` or a higher tier."""
+    plan = None
+
+    def has_permission(self, request, view):
+        return for_request(request).includes_plan(self.plan)
+
+
+def requires_feature(feature):
+    """Permission class that requires a plan feature."""
+    return type('HasFeature', (HasFeature,), {
+        'feature': feature,
+        'message': f'Your plan does not include {feature}.',
+    })
+
+
+def requires_plan(plan):
+    """Permission class that requires a plan tier or higher."""
+    return type('HasPlan', (HasPlan,), {
+        'plan': plan,
+        'message': f'This requires the {plan} plan or higher.',
+    })
@@ -12,6 +12,7 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from django.db.models import Avg, Count
 from django.utils import timezone
 from datetime import timedelta
 
@@ -31,6 +32,7 @@ from core.models.locations import (
     HotSpot, LocationBroadcast, OpenChallenge, ChallengeResponse
 )
 from core.models.payments import UserWallet
+from core import follow_graph, reputation
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -52,12 +54,26 @@ class UserSerializer(serializers.ModelSerializer):
 class UserProfileSerializer(serializers.ModelSerializer):
     """User profile serializer."""
     user = UserSerializer(read_only=True)
+    reputation = serializers.SerializerMethodField()
+    followers_count = serializers.SerializerMethodField()
+    following_count = serializers.SerializerMethodField()
     
     class Meta:
         model = UserProfile
         fields = '__all__'
         read_only_fields = ['user']
 
+    def get_reputation(self, obj):
+        # Load profiles with select_related('user__reputation') to avoid a query per profile
+        return reputation.summary_stats(obj.user)
+
+    def get_followers_count(self, obj):
+        # Cached; list views load a whole page with follow_graph.counts_for first
+        return follow_graph.counts(obj.user_id)['followers']
+
+    def get_following_count(self, obj):
+        return follow_graph.counts(obj.user_id)['following']
+
 
 class RegisterSerializer(serializers.ModelSerializer):
     """User registration serializer."""
@@ -270,9 +286,15 @@ class CarProfileSerializer(serializers.ModelSerializer):
 # Marketplace Serializers
 
 class MarketplaceSerializer(serializers.ModelSerializer):
-    """Marketplace serializer."""
+    """
+    Marketplace serializer.
+    
+    Review aggregates are read from `reviews_count` / `average_rating`
+    annotations when the queryset provides them (see
+    api.views.marketplace.with_listing_details); otherwise they are computed
+    with one aggregate query per listing.
+    """
     seller = UserSerializer(read_only=True)
-    car = CarProfileSerializer(read_only=True)
     images = serializers.SerializerMethodField()
     reviews_count = serializers.SerializerMethodField()
     average_rating = serializers.SerializerMethodField()
@@ -283,16 +305,23 @@ class MarketplaceSerializer(serializers.ModelSerializer):
         read_only_fields = ['seller', 'created_at', 'updated_at']
     
     def get_images(self, obj):
+        # Served from the prefetch cache when images were prefetched
         return MarketplaceImageSerializer(obj.images.all(), many=True).data
     
+    def _review_stats(self, obj):
+        if not hasattr(obj, 'reviews_count'):
+            stats = MarketplaceReview.objects.filter(order__item=obj).aggregate(
+                reviews_count=Count('id'), average_rating=Avg('rating')
+            )
+            obj.reviews_count = stats['reviews_count']
+            obj.average_rating = stats['average_rating']
+        return obj.reviews_count, obj.average_rating
+    
     def get_reviews_count(self, obj):
-        return obj.reviews.count()
+        return self._review_stats(obj)[0]
     
     def get_average_rating(self, obj):
-        reviews = obj.reviews.all()
-        if reviews:
-            return sum(review.rating for review in reviews) / reviews.count()
-        return 0
+        return self._review_stats(obj)[1] or 0
 
 
 class MarketplaceCreateSerializer(serializers.ModelSerializer):
@@ -375,14 +404,18 @@ class FriendshipCreateSerializer(serializers.ModelSerializer):
 class EventSerializer(serializers.ModelSerializer):
     organizer = UserSerializer(read_only=True)
     track = TrackSerializer(read_only=True)
-    participants_count = serializers.SerializerMethodField()
+    participants_count = serializers.IntegerField(source='participant_count', read_only=True)
     
     class Meta:
         model = Event
-        fields = '__all__'
-    
-    def get_participants_count(self, obj):
-        return obj.participants.count()
+        # Served as participants_count, the name clients already read
+        exclude = ['participant_count']
+
+
+class EventSummarySerializer(EventSerializer):
+    """EventSerializer with organizer and track as ids, for the cached calendar (see core.event_calendar)."""
+    organizer = serializers.PrimaryKeyRelatedField(read_only=True)
+    track = serializers.PrimaryKeyRelatedField(read_only=True)
 
 
 class EventCreateSerializer(serializers.ModelSerializer):
@@ -0,0 +1,92 @@
+"""
+DRF throttles backed by the shared sliding-window limiter (core.rate_limit).
+
+Rates come from REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] keyed by scope,
+in DRF's '<count>/<period>' format. Use the classes with
+@throttle_classes([...]) / throttle_classes = [...], or rate_limit() for a
+one-off scope on a function-based view.
+"""
+
+from django.conf import settings
+from rest_framework.decorators import throttle_classes
+from rest_framework.throttling import BaseThrottle
+
+from core.rate_limit import hit, parse_rate
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """Throttle a scope per client IP, or per user once authenticated."""
+    scope = None
+
+    def get_rate(self):
+        return settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {}).get(self.scope)
+
+    def get_identifier(self, request):
+        """Who the limit applies to; return None to skip throttling this request."""
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+    def allow_request(self, request, view):
+        rate = self.get_rate()
+        identifier = self.get_identifier(request)
+        if rate is None or identifier is None:
+            return True
+
+        limit, window = parse_rate(rate)
+        result = hit(self.scope, identifier, limit, window)
+        self.retry_after = result.retry_after
+        return result.allowed
+
+    def wait(self):
+        return getattr(self, 'retry_after', None)
+
+
+class LoginRateThrottle(SlidingWindowThrottle):
+    """Login attempts per client IP."""
+    scope = 'login'
+
+    def get_identifier(self, request):
+        return f"ip:{self.get_ident(request)}"
+
+
+class LoginAccountRateThrottle(SlidingWindowThrottle):
+    """
+    Login attempts per account from one client IP.
+
+    Keying on the account alone would let anyone lock a known user out by
+    failing logins for them. Including the IP means an attacker only burns
+    their own budget, at the cost of letting guesses spread over many IPs
+    each get the full per-account rate (LoginRateThrottle still caps each IP
+    across all accounts).
+    """
+    scope = 'login_account'
+
+    def get_identifier(self, request):
+        username = request.data.get('username') or request.data.get('email')
+        if not username:
+            return None
+        return f"account:{str(username).strip().lower()}:ip:{self.get_ident(request)}"
+
+
+class UserLookupRateThrottle(SlidingWindowThrottle):
+    """Username/email availability checks, which can be used to enumerate accounts."""
+    scope = 'user_lookup'
+
+
+class ContactRateThrottle(SlidingWindowThrottle):
+    """Contact form submissions, each of which sends email."""
+    scope = 'contact'
+
+
+def rate_limit(scope):
+    """
+    Throttle a function-based view under its own scope.
+
+    Usage:
+        @api_view(['POST'])
+        @rate_limit('password_reset')
+        def password_reset(request): ...
+    """
+    throttle = type(f'{scope.title().replace("_", "")}RateThrottle', (SlidingWindowThrottle,), {'scope': scope})
+    return throttle_classes([throttle])
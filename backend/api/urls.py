@@ -6,14 +6,17 @@ This module contains URL patterns for all API endpoints:
 - Racing (callouts, tracks, race results, events)
 - Marketplace (listings, cars)
 - Social (friends, profiles)
+- Direct messages (inbox, conversations)
 - Hotspots (location-based features)
 """
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     UserViewSet, UserProfileViewSet,
     login_view, register_view, logout_view, user_profile,
+    obtain_token_pair, revoke_token_view,
     run_migrations,
     setup_otp, verify_otp_setup, disable_otp, verify_otp_login,
     generate_backup_codes, sso_config,
@@ -56,6 +59,8 @@ from api.views.subscription_views import (
 from api.views.marketplace import create_connect_account, create_account_link, get_connect_account_status
 from api.views.marketplace_views import MarketplaceListingViewSet, marketplace_webhook
 from api.views.contact import contact_form
+from api.views.seo import get_seo_meta_tags, get_seo_analytics
+from api.views.messaging import send_message, inbox, conversation_history, mark_conversation_read, unread_count
 
 router = DefaultRouter()
 router.register(r'users', UserViewSet)
@@ -73,6 +78,11 @@ auth_patterns = [
     path('logout/', logout_view, name='logout'),
     path('profile/', user_profile, name='user-profile'),
     path('csrf/', get_csrf_token, name='get-csrf-token'),
+    
+    # Stateless token (JWT) URLs for mobile and API clients
+    path('token/', obtain_token_pair, name='token-obtain'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
+    path('token/revoke/', revoke_token_view, name='token-revoke'),
 
     path('verify-email/<str:token>/', verify_email, name='verify-email'),
     path('resend-verification/', resend_verification_email_view, name='resend-verification'),
@@ -127,6 +137,15 @@ social_patterns = [
     path('notifications/<int:notification_id>/read/', mark_notification_read, name='mark-notification-read'),
 ]
 
+# Direct message URLs
+message_patterns = [
+    path('', send_message, name='send-message'),
+    path('inbox/', inbox, name='message-inbox'),
+    path('unread-count/', unread_count, name='message-unread-count'),
+    path('with/<int:user_id>/', conversation_history, name='conversation-history'),
+    path('with/<int:user_id>/read/', mark_conversation_read, name='conversation-read'),
+]
+
 # Add subscription URLs
 subscription_patterns = [
     path('plans/', get_subscription_plans, name='get-subscription-plans'),
@@ -151,13 +170,19 @@ marketplace_patterns = [
 
 # Combine all URL patterns
 urlpatterns = [
+    # Before the router so its marketplace/<pk>/ route doesn't swallow the webhook
+    path('marketplace/', include(marketplace_patterns)),
     path('', include(router.urls)),
     path('auth/', include(auth_patterns)),
     path('racing/', include(racing_patterns)),
     path('social/', include(social_patterns)),
+    path('messages/', include(message_patterns)),
     path('subscriptions/', include(subscription_patterns)),
     path('connect/', include(connect_patterns)),
-    path('marketplace/', include(marketplace_patterns)),
+    # SEO meta tags and structured data
+    path('seo/', get_seo_meta_tags, name='seo-general'),
+    path('seo/analytics/', get_seo_analytics, name='seo-analytics'),
+    path('seo/<str:content_type>/<int:content_id>/', get_seo_meta_tags, name='seo-meta-tags'),
     # Contact form endpoint
     path('contact/', contact_form, name='contact-form'),
     # Aliases for convenience
@@ -12,6 +12,7 @@ This module contains all API views organized by functionality:
 from .auth import (
     UserViewSet, UserProfileViewSet,
     login_view, register_view, logout_view, user_profile,
+    obtain_token_pair, revoke_token_view,
     verify_email, resend_verification_email_view, check_user_exists,
     run_migrations, request_password_reset, reset_password,
     setup_otp, verify_otp_setup, disable_otp, verify_otp_login,
@@ -38,6 +39,7 @@ __all__ = [
     # Auth views
     'UserViewSet', 'UserProfileViewSet',
     'login_view', 'register_view', 'logout_view', 'user_profile',
+    'obtain_token_pair', 'revoke_token_view',
     'verify_email', 'resend_verification_email_view', 'check_user_exists',
     'run_migrations', 'request_password_reset', 'reset_password',
     'setup_otp', 'verify_otp_setup', 'disable_otp', 'verify_otp_login',
@@ -10,13 +10,13 @@ This module contains views for user authentication and profile management:
 """
 
 from rest_framework import viewsets, permissions, status, filters
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes, throttle_classes
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth import authenticate
 from django.core.mail import send_mail
 from django.conf import settings
-# Removed Token import since we're not using authtoken anymore
 from django.utils import timezone
 from datetime import timedelta
 import uuid
@@ -44,6 +44,9 @@ from ..serializers import (
 )
 
 from core.otp_service import OTPService
+from core.token_service import issue_token_pair, revoke_token, revoke_refresh_token
+from core import blocks, counts, follow_graph, reputation
+from ..throttling import LoginRateThrottle, LoginAccountRateThrottle, UserLookupRateThrottle, rate_limit
 import re
 
 
@@ -61,6 +64,15 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['username', 'first_name', 'last_name']
 
 
+class FollowPagination(PageNumberPagination):
+    """Pagination for follower and following lists."""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    # Counts are cached, so paging through a large follower list doesn't COUNT(*) every page
+    django_paginator_class = counts.ApproximateCountPaginator
+
+
 class UserProfileViewSet(viewsets.ModelViewSet):
     """
     ViewSet for UserProfile model.
@@ -79,10 +91,18 @@ class UserProfileViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Users can only see their own profile or public profiles."""
         user = self.request.user
+        profiles = UserProfile.objects.select_related('user__reputation')
         if self.action == 'list':
             # For list view, show all profiles (could be filtered by privacy settings later)
-            return UserProfile.objects.all()
-        return UserProfile.objects.filter(user=user)
+            return profiles
+        return profiles.filter(user=user)
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            # Load the page's follower counts in one go instead of per profile
+            follow_graph.counts_for(profile.user_id for profile in page)
+        return page
 
     def perform_create(self, serializer):
         """Set the user when creating a profile."""
@@ -92,7 +112,7 @@ class UserProfileViewSet(viewsets.ModelViewSet):
     def me(self, request):
         """Get current user's profile."""
         try:
-            profile = UserProfile.objects.get(user=request.user)
+            profile = UserProfile.objects.select_related('user__reputation').get(user=request.user)
             serializer = self.get_serializer(profile)
             return Response(serializer.data)
         except UserProfile.DoesNotExist:
@@ -102,11 +122,10 @@ class UserProfileViewSet(viewsets.ModelViewSet):
     def by_username(self, request, username=None):
         """Get profile by username (public access)."""
         try:
-            user = User.objects.get(username=username)
-            profile = UserProfile.objects.get(user=user)
+            profile = UserProfile.objects.select_related('user__reputation').get(user__username=username)
             serializer = self.get_serializer(profile)
             return Response(serializer.data)
-        except (User.DoesNotExist, UserProfile.DoesNotExist):
+        except UserProfile.DoesNotExist:
             return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
 
     @action(detail=False, methods=['get'], url_path='username/(?P<username>[^/.]+)/edit', permission_classes=[permissions.IsAuthenticated])
@@ -123,6 +142,38 @@ class UserProfileViewSet(viewsets.ModelViewSet):
         except (User.DoesNotExist, UserProfile.DoesNotExist):
             return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
 
+    @action(detail=False, methods=['get'], permission_classes=[permissions.AllowAny])
+    def reputation(self, request):
+        """Get reputation statistics for a user (from the maintained summary, see core.reputation)."""
+        user_id = request.query_params.get('user_id')
+        if not user_id or not user_id.isdigit():
+            return Response({'error': 'user_id required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        user = User.objects.filter(id=user_id).values('id', 'username').first()
+        if not user:
+            return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'user_id': user['id'], 'username': user['username'], **reputation.stats(user['id'])})
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.AllowAny])
+    def leaderboard(self, request):
+        """Get the best-rated users."""
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), 100)
+        except ValueError:
+            return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({'error': 'limit must be at least 1'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response([
+            {
+                'user_id': summary.user_id,
+                'username': summary.user.username,
+                'average_rating': round(summary.average_rating, 2),
+                'total_ratings': summary.rating_count,
+            }
+            for summary in reputation.leaderboard(limit)
+        ])
+
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def follow(self, request, pk=None):
         """Follow a user."""
@@ -131,14 +182,15 @@ class UserProfileViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Cannot follow yourself'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Check if already following
-        if Follow.objects.filter(follower=request.user, following=profile.user).exists():
+        if follow_graph.is_following(request.user.id, profile.user_id):
             return Response({'error': 'Already following this user'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Check if blocked
-        if Block.objects.filter(blocker=request.user, blocked=profile.user).exists():
+        block_set = blocks.for_request(request)
+        if profile.user_id in block_set.blocking:
             return Response({'error': 'Cannot follow blocked user'}, status=status.HTTP_400_BAD_REQUEST)
         
-        if Block.objects.filter(blocker=profile.user, blocked=request.user).exists():
+        if profile.user_id in block_set.blocked_by:
             return Response({'error': 'Cannot follow user who has blocked you'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Create follow relationship
@@ -223,59 +275,60 @@ class UserProfileViewSet(viewsets.ModelViewSet):
             'blocked': False
         })
 
+    def _follow_page(self, request, follows, user_field):
+        """Paginated users from a Follow queryset, newest first."""
+        paginator = FollowPagination()
+        page = paginator.paginate_queryset(
+            follows.select_related(user_field).order_by('-created_at'), request, view=self
+        )
+        return paginator.get_paginated_response([
+            {
+                'id': getattr(follow, user_field).id,
+                'username': getattr(follow, user_field).username,
+                'followed_at': follow.created_at
+            }
+            for follow in page
+        ])
+
     @action(detail=True, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def followers(self, request, pk=None):
-        """Get list of followers for a profile."""
+        """Get a page of followers for a profile."""
         profile = self.get_object()
-        followers = Follow.objects.filter(following=profile.user).select_related('follower')
-        
-        data = []
-        for follow in followers:
-            data.append({
-                'id': follow.follower.id,
-                'username': follow.follower.username,
-                'followed_at': follow.created_at
-            })
-        
-        return Response({'followers': data})
+        return self._follow_page(request, Follow.objects.filter(following=profile.user), 'follower')
 
     @action(detail=True, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def following(self, request, pk=None):
-        """Get list of users that this profile is following."""
+        """Get a page of users that this profile is following."""
         profile = self.get_object()
-        following = Follow.objects.filter(follower=profile.user).select_related('following')
-        
-        data = []
-        for follow in following:
-            data.append({
-                'id': follow.following.id,
-                'username': follow.following.username,
-                'followed_at': follow.created_at
-            })
-        
-        return Response({'following': data})
+        return self._follow_page(request, Follow.objects.filter(follower=profile.user), 'following')
 
     @action(detail=True, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def is_following(self, request, pk=None):
         """Check if current user is following this profile."""
         profile = self.get_object()
-        is_following = Follow.objects.filter(
-            follower=request.user, 
-            following=profile.user
-        ).exists()
-        
-        return Response({'is_following': is_following})
+        return Response({'is_following': follow_graph.is_following(request.user.id, profile.user_id)})
+
+    @action(detail=True, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def mutual(self, request, pk=None):
+        """Get followers of this profile that the current user also follows."""
+        profile = self.get_object()
+        user_ids = follow_graph.followers_you_follow(request.user.id, profile.user_id)
+        users = User.objects.filter(id__in=user_ids).order_by('username').values('id', 'username')[:50]
+        return Response({'count': len(user_ids), 'results': list(users)})
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def suggestions(self, request):
+        """Get users followed by the people the current user follows."""
+        hidden = blocks.for_request(request).hidden
+        user_ids = follow_graph.suggestions(request.user.id, limit=10, exclude=hidden)
+        users = {user['id']: user for user in User.objects.filter(id__in=user_ids).values('id', 'username')}
+        return Response({'results': [users[user_id] for user_id in user_ids if user_id in users]})
 
     @action(detail=True, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def is_blocked(self, request, pk=None):
         """Check if current user is blocked by this profile."""
         profile = self.get_object()
-        is_blocked = Block.objects.filter(
-            blocker=profile.user, 
-            blocked=request.user
-        ).exists()
-        
-        return Response({'is_blocked': is_blocked})
+        return Response({'is_blocked': profile.user_id in blocks.for_request(request).blocked_by})
 
     @action(detail=True, methods=['post'])
     def update_stats(self, request, pk=None):
@@ -398,6 +451,7 @@ class UserProfileViewSet(viewsets.ModelViewSet):
 @csrf_exempt
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([LoginRateThrottle, LoginAccountRateThrottle])
 def login_view(request):
     """User login endpoint."""
     # Add debugging
@@ -476,7 +530,12 @@ def login_view(request):
     except UserProfile.DoesNotExist:
         email_verified = False
     
+    # Signed tokens for API clients that don't keep the session cookie
+    tokens = issue_token_pair(user)
+    
     response_data = {
+        'token': tokens['access'],
+        'refresh': tokens['refresh'],
         'user': {
             'id': user.id,
             'username': user.username,
@@ -493,6 +552,7 @@ def login_view(request):
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([UserLookupRateThrottle])
 def check_user_exists(request):
     """Check if a username or email already exists."""
     # Add debugging
@@ -596,13 +656,7 @@ def register_view(request):
             'error': 'Failed to create user'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    # Create user profile
-    try:
-        UserProfile.objects.get_or_create(user=user)
-        print(f"User profile created successfully for {user.username}")
-    except Exception as e:
-        print(f"Failed to create user profile: {str(e)}")
-        # Continue anyway as profile is not critical for registration
+    # The user profile is created by the post_save signal in core.signals
 
     # Send email verification
     email_sent = True
@@ -640,10 +694,66 @@ def register_view(request):
 @permission_classes([permissions.IsAuthenticated])
 def logout_view(request):
     """User logout endpoint."""
-    # With session authentication, we don't need to delete tokens
+    # Revoke the access token used for this request and, if given, its refresh token
+    if request.auth is not None and hasattr(request.auth, 'payload'):
+        revoke_token(request.auth)
+    
+    refresh = request.data.get('refresh')
+    if refresh:
+        revoke_refresh_token(refresh)
+    
     return Response({'message': 'Logged out successfully'})
 
 
+@api_view(['POST'])
+@permission_classes([permissions.AllowAny])
+def obtain_token_pair(request):
+    """Exchange username and password for an access/refresh token pair."""
+    username = request.data.get('username')
+    password = request.data.get('password')
+    
+    if not username or not password:
+        return Response({
+            'error': 'Username and password are required'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    user = authenticate(username=username, password=password)
+    if user is None:
+        return Response({
+            'error': 'Invalid credentials'
+        }, status=status.HTTP_401_UNAUTHORIZED)
+    
+    try:
+        if not user.profile.email_verified:
+            return Response({
+                'error': 'Please verify your email address before logging in. Check your email for a verification link.',
+                'email_verification_required': True
+            }, status=status.HTTP_401_UNAUTHORIZED)
+    except UserProfile.DoesNotExist:
+        pass
+    
+    return Response(issue_token_pair(user))
+
+
+@api_view(['POST'])
+@permission_classes([permissions.AllowAny])
+def revoke_token_view(request):
+    """Revoke a refresh token so it can no longer be rotated."""
+    refresh = request.data.get('refresh')
+    
+    if not refresh:
+        return Response({
+            'error': 'Refresh token is required'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    if not revoke_refresh_token(refresh):
+        return Response({
+            'error': 'Invalid or expired refresh token'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({'message': 'Token revoked successfully'})
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def user_profile(request):
@@ -836,11 +946,12 @@ def verify_otp_login(request):
                 }, status=status.HTTP_400_BAD_REQUEST)
             is_backup_code = False
         
-        # Generate token
-        token, created = Token.objects.get_or_create(user=user)
+        # Generate tokens
+        tokens = issue_token_pair(user)
         
         return Response({
-            'token': token.key,
+            'token': tokens['access'],
+            'refresh': tokens['refresh'],
             'user': {
                 'id': user.id,
                 'username': user.username,
@@ -942,6 +1053,7 @@ def verify_email(request, token):
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@rate_limit('email_send')
 def resend_verification_email_view(request):
     """Resend email verification."""
     email = request.data.get('email')
@@ -965,6 +1077,7 @@ def resend_verification_email_view(request):
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@rate_limit('email_send')
 def request_password_reset(request):
     """Request password reset email."""
     email = request.data.get('email')
@@ -2,17 +2,19 @@
 Contact form API view for CalloutRacing Application
 """
 
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from django.core.mail import send_mail
 from django.conf import settings
 from core.models.marketplace import ContactSubmission
+from ..throttling import ContactRateThrottle
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([ContactRateThrottle])
 def contact_form(request):
     """
     Handle contact form submissions and send email notifications.
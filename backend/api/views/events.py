@@ -9,7 +9,9 @@ This module contains views for managing racing events:
 
 from rest_framework import viewsets, status, permissions, serializers
 from rest_framework.decorators import action
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.db.models import Q, Count, QuerySet
 from django.utils import timezone
@@ -21,12 +23,17 @@ if TYPE_CHECKING:
 else:
     from core.models.racing import Event, EventParticipant
 
+from core import event_calendar
+from core.event_registration import ALREADY_REGISTERED, EVENT_FULL, register, unregister
+
 
 # Basic serializers for now
 class EventSerializer(serializers.ModelSerializer):
+    participants_count = serializers.IntegerField(source='participant_count', read_only=True)
+
     class Meta:
         model = Event
-        fields = '__all__'
+        exclude = ['participant_count']
 
 
 class EventCreateSerializer(serializers.ModelSerializer):
@@ -37,11 +44,20 @@ class EventCreateSerializer(serializers.ModelSerializer):
 
 
 class EventParticipantSerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source='user.username', read_only=True)
+
     class Meta:
         model = EventParticipant
         fields = '__all__'
 
 
+class ParticipantPagination(PageNumberPagination):
+    """Pagination for event participant lists."""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
 class EventViewSet(viewsets.ModelViewSet):
     """ViewSet for managing racing events."""
     queryset = Event.objects.all()  # type: ignore
@@ -131,26 +147,18 @@ class EventViewSet(viewsets.ModelViewSet):
         event = self.get_object()
         user = request.user
         
-        # Check if user is already a participant
-        if EventParticipant.objects.filter(event=event, user=user).exists():
+        participant, error = register(event, user)
+        if error == ALREADY_REGISTERED:
             return Response(
                 {'detail': 'You are already registered for this event.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Check if event is full
-        if event.max_participants and event.participants.count() >= event.max_participants:
+        if error == EVENT_FULL:
             return Response(
                 {'detail': 'This event is full.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Create participation
-        participant = EventParticipant.objects.create(
-            event=event,
-            user=user
-        )
-        
         serializer = EventParticipantSerializer(participant)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
@@ -160,36 +168,29 @@ class EventViewSet(viewsets.ModelViewSet):
         event = self.get_object()
         user = request.user
         
-        try:
-            participant = EventParticipant.objects.get(event=event, user=user)
-            participant.delete()
+        if unregister(event, user):
             return Response({'detail': 'Successfully left the event.'})
-        except EventParticipant.DoesNotExist:
-            return Response(
-                {'detail': 'You are not registered for this event.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        return Response(
+            {'detail': 'You are not registered for this event.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
     @action(detail=True, methods=['get'])
     def participants(self, request, pk=None):
-        """Get list of event participants."""
+        """Get a page of event participants in registration order."""
         event = self.get_object()
-        participants = event.participants.all()
-        serializer = EventParticipantSerializer(participants, many=True)
-        return Response(serializer.data)
+        participants = event.participants.select_related('user').order_by('registration_date', 'id')
+        
+        paginator = ParticipantPagination()
+        page = paginator.paginate_queryset(participants, request, view=self)
+        serializer = EventParticipantSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """Get upcoming events."""
         try:
-            now = timezone.now()
-            upcoming_events = Event.objects.filter(  # type: ignore
-                start_date__gte=now,
-                is_active=True
-            ).order_by('start_date')[:10]
-            
-            serializer = self.get_serializer(upcoming_events, many=True)
-            return Response(serializer.data)
+            return Response(event_calendar.upcoming_events())
         except Exception as e:
             # Log the error for debugging
             print(f"Error in upcoming events: {e}")
@@ -198,15 +199,59 @@ class EventViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def my_events(self, request):
         """Get events organized by the current user."""
-        my_events = Event.objects.filter(organizer=request.user).order_by('-start_date')  # type: ignore
-        serializer = self.get_serializer(my_events, many=True)
-        return Response(serializer.data)
+        return Response(event_calendar.user_events(request.user.id, 'organizer'))
     
     @action(detail=False, methods=['get'])
     def participating(self, request):
         """Get events the current user is participating in."""
-        participating_events = Event.objects.filter(  # type: ignore
-            participants__user=request.user
-        ).order_by('-start_date')
-        serializer = self.get_serializer(participating_events, many=True)
-        return Response(serializer.data) 
\ No newline at end of file
+        return Response(event_calendar.user_events(request.user.id, 'participant'))
+    
+    def _calendar_scope(self, request):
+        if request.query_params.get('mine') == 'true':
+            if not request.user.is_authenticated:
+                return None
+            return f"user:{request.user.id}"
+        track_id = request.query_params.get('track_id')
+        if track_id and track_id.isdigit():
+            return f"track:{track_id}"
+        return 'all'
+    
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        Get events between ?start= and ?end= (ISO dates, end exclusive).
+        
+        Add ?track_id= for one track or ?mine=true for the current user's events.
+        """
+        scope = self._calendar_scope(request)
+        if scope is None:
+            return Response({'detail': 'Authentication required.'}, status=status.HTTP_401_UNAUTHORIZED)
+        date_range = event_calendar.parse_range(request.query_params.get('start'), request.query_params.get('end'))
+        if date_range is None:
+            return Response({'detail': 'start and end must be ISO dates.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        start, end = date_range
+        return Response({
+            'start': start,
+            'end': end,
+            'events': event_calendar.events_between(scope, start, end),
+        })
+    
+    @action(detail=False, methods=['get'])
+    def ical(self, request):
+        """iCalendar feed of the same events as calendar(); defaults to the next 90 days."""
+        scope = self._calendar_scope(request)
+        if scope is None:
+            return Response({'detail': 'Authentication required.'}, status=status.HTTP_401_UNAUTHORIZED)
+        date_range = event_calendar.parse_range(
+            request.query_params.get('start'), request.query_params.get('end'),
+            default_days=event_calendar.UPCOMING_DAYS
+        )
+        if date_range is None:
+            return Response({'detail': 'start and end must be ISO dates.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        response = StreamingHttpResponse(
+            event_calendar.ical_feed(scope, *date_range), content_type='text/calendar; charset=utf-8'
+        )
+        response['Content-Disposition'] = 'inline; filename="calloutracing-events.ics"'
+        return response
@@ -13,7 +13,7 @@ from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Avg
+from django.db.models import Q, Avg, Count
 from django.utils import timezone
 from datetime import datetime, timedelta
 import logging
@@ -21,21 +21,31 @@ import stripe
 from django.conf import settings
 
 from core.models.marketplace import Marketplace, MarketplaceOrder, MarketplaceReview
-from api.serializers import MarketplaceListingSerializer
+from api.serializers import MarketplaceListingSerializer, MarketplaceSerializer
 from core.secret_store import get_stripe_webhook_secret
+from core.marketplace_search import filter_listings, listing_facets
+from core.view_counter import record_view, viewer_key
+from core import stripe_cache
 
 # Configure Stripe
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
 logger = logging.getLogger(__name__)
 
-# Basic serializers for now
-class ListingSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Marketplace
-        fields = '__all__'
+def with_listing_details(queryset):
+    """
+    Load everything MarketplaceSerializer needs for a page of listings in a
+    fixed number of queries: seller (and profile) joined, images prefetched,
+    review count/average annotated.
+    """
+    return queryset.select_related('seller__profile').prefetch_related('images').annotate(
+        # Each order has at most one review, so both aggregates share one join
+        reviews_count=Count('orders__review'),
+        average_rating=Avg('orders__review__rating'),
+    )
 
 
+# Basic serializers for now
 class ListingCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Marketplace
@@ -58,73 +68,29 @@ class ReviewSerializer(serializers.ModelSerializer):
 class ListingViewSet(viewsets.ModelViewSet):
     """ViewSet for managing marketplace listings."""
     queryset = Marketplace.objects.all()
-    serializer_class = ListingSerializer
+    serializer_class = MarketplaceSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     
     def get_serializer_class(self):
         if self.action == 'create':
             return ListingCreateSerializer
-        return ListingSerializer
+        return MarketplaceSerializer
     
     def get_queryset(self):
-        queryset = Marketplace.objects.all()
-        
-        # Filter by listing type
-        category = self.request.query_params.get('category', None)
-        if category:
-            queryset = queryset.filter(category=category)
-        
-        # Filter by price range
-        min_price = self.request.query_params.get('min_price', None)
-        if min_price:
-            try:
-                min_price = float(min_price)
-                queryset = queryset.filter(price__gte=min_price)
-            except ValueError:
-                pass
-        
-        max_price = self.request.query_params.get('max_price', None)
-        if max_price:
-            try:
-                max_price = float(max_price)
-                queryset = queryset.filter(price__lte=max_price)
-            except ValueError:
-                pass
-        
-        # Filter by condition
-        condition = self.request.query_params.get('condition', None)
-        if condition:
-            queryset = queryset.filter(condition=condition)
-        
-        # Filter by location
-        location = self.request.query_params.get('location', None)
-        if location:
-            queryset = queryset.filter(location__icontains=location)
-        
-        # Filter by negotiable status
-        is_negotiable = self.request.query_params.get('is_negotiable', None)
-        if is_negotiable is not None:
-            is_negotiable = is_negotiable.lower() == 'true'
-            queryset = queryset.filter(is_negotiable=is_negotiable)
-        
-        # Filter by seller
-        seller_id = self.request.query_params.get('seller_id', None)
-        if seller_id:
-            queryset = queryset.filter(seller_id=seller_id)
-        
-        # Search by title or description
-        search = self.request.query_params.get('search', None)
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(description__icontains=search)
-            )
-        
+        queryset = with_listing_details(Marketplace.objects.all())
+        queryset = filter_listings(queryset, self.request.query_params)
         return queryset.order_by('-created_at')
     
     def perform_create(self, serializer):
         serializer.save(seller=self.request.user)
     
+    def retrieve(self, request, *args, **kwargs):
+        """Return a listing and count the view (buffered, once per viewer per window)."""
+        instance = self.get_object()
+        record_view(instance, viewer_key(request))
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+    
     @action(detail=True, methods=['post'])
     def contact_seller(self, request, pk=None):
         """Contact the seller about a listing."""
@@ -180,10 +146,15 @@ class ListingViewSet(viewsets.ModelViewSet):
             'offer_amount': offer_amount
         })
     
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """Listing counts per category, condition and price range for the current filters."""
+        return Response(listing_facets(Marketplace.objects.all(), request.query_params))
+    
     @action(detail=False, methods=['get'])
     def my_listings(self, request):
         """Get listings created by the current user."""
-        my_listings = Marketplace.objects.filter(seller=request.user).order_by('-created_at')
+        my_listings = with_listing_details(Marketplace.objects.filter(seller=request.user)).order_by('-created_at')
         serializer = self.get_serializer(my_listings, many=True)
         return Response(serializer.data)
     
@@ -356,7 +327,7 @@ def get_connect_account_status(request):
                 'account_id': None
             })
         
-        account = stripe.Account.retrieve(request.user.stripe_connect_account_id)
+        account = stripe_cache.retrieve('account', request.user.stripe_connect_account_id)
         
         return Response({
             'has_account': True,
@@ -9,6 +9,8 @@ from rest_framework import viewsets
 from core.models.marketplace import MarketplaceListing, Order, OrderItem
 from api.serializers import MarketplaceListingSerializer
 from core.secret_store import get_stripe_webhook_secret
+from core import stripe_cache
+from core.webhook_inbox import record_event
 import logging
 
 # Configure Stripe
@@ -34,7 +36,12 @@ def marketplace_webhook(request):
         # Invalid signature
         return HttpResponse(status=400)
 
-    # Handle the event
+    # Acknowledge now; core.webhook_inbox processes the event in the background
+    record_event(event, 'marketplace')
+    return HttpResponse(status=200)
+
+def dispatch_event(event):
+    """Route a stored Stripe event to its handler (called by the webhook worker)."""
     if event['type'] == 'checkout.session.completed':
         session = event['data']['object']
         handle_checkout_session_completed(session)
@@ -51,9 +58,7 @@ def marketplace_webhook(request):
         payment_intent = event['data']['object']
         handle_payment_intent_failed(payment_intent)
     else:
-        print(f'Unhandled event type {event["type"]}')
-
-    return HttpResponse(status=200)
+        logger.info(f"Unhandled event type: {event['type']}")
 
 def handle_checkout_session_completed(session):
     """Handle successful checkout session completion."""
@@ -85,6 +90,7 @@ def handle_checkout_session_completed(session):
 
     except Exception as e:
         logger.error(f"Error handling checkout session completed: {str(e)}")
+        raise
 
 def handle_checkout_session_failed(session):
     """Handle failed checkout session."""
@@ -101,6 +107,7 @@ def handle_checkout_session_failed(session):
 
     except Exception as e:
         logger.error(f"Error handling checkout session failed: {str(e)}")
+        raise
 
 def handle_payment_intent_succeeded(payment_intent):
     """Handle successful payment intent."""
@@ -113,6 +120,7 @@ def handle_payment_intent_succeeded(payment_intent):
 
     except Exception as e:
         logger.error(f"Error handling payment intent succeeded: {str(e)}")
+        raise
 
 def handle_payment_intent_failed(payment_intent):
     """Handle failed payment intent."""
@@ -125,6 +133,7 @@ def handle_payment_intent_failed(payment_intent):
 
     except Exception as e:
         logger.error(f"Error handling payment intent failed: {str(e)}")
+        raise
 
 class MarketplaceListingViewSet(viewsets.ModelViewSet):
     queryset = MarketplaceListing.objects.all()
@@ -308,7 +317,7 @@ class MarketplaceListingViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Session ID is required'}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            session = stripe.checkout.Session.retrieve(session_id)
+            session = stripe_cache.retrieve('checkout_session', session_id)
             return Response({
                 'status': session.status,
                 'payment_status': session.payment_status,
@@ -0,0 +1,110 @@
+"""
+Direct Messaging API Views for CalloutRacing Application
+
+This module provides endpoints for private messages between users:
+- Sending a message
+- Inbox listing with last message and unread counts (see core.messaging)
+- Conversation history, newest first, paginated with a `before` cursor
+- Marking a conversation read and the total unread count
+"""
+
+from rest_framework import serializers, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.shortcuts import get_object_or_404
+
+from core import messaging
+from core.models.auth import User
+from core.models.social import InboxEntry, Message
+
+
+# Basic serializers for now
+class DirectMessageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Message
+        fields = ['id', 'conversation', 'sender', 'recipient', 'content', 'is_read', 'created_at']
+
+
+class InboxEntrySerializer(serializers.ModelSerializer):
+    other_user = serializers.SerializerMethodField()
+    last_message = DirectMessageSerializer(read_only=True)
+
+    class Meta:
+        model = InboxEntry
+        fields = ['conversation', 'other_user', 'last_message', 'last_message_at', 'unread_count']
+
+    def get_other_user(self, obj):
+        return {'id': obj.other_user.id, 'username': obj.other_user.username}
+
+
+class SendMessageSerializer(serializers.Serializer):
+    recipient = serializers.IntegerField()
+    content = serializers.CharField(max_length=5000)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def send_message(request):
+    """Send a direct message to another user."""
+    serializer = SendMessageSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    recipient = get_object_or_404(User, pk=serializer.validated_data['recipient'], is_active=True)
+
+    try:
+        message = messaging.send_message(request.user, recipient, serializer.validated_data['content'])
+    except messaging.MessagingError as e:
+        return Response({'error': str(e)}, status=status.HTTP_403_FORBIDDEN)
+    return Response(DirectMessageSerializer(message).data, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def inbox(request):
+    """
+    The user's conversations, most recent first.
+
+    Pass the returned `next` value as `cursor` for the following page.
+    """
+    try:
+        entries, cursor = messaging.inbox(request.user, request.GET.get('cursor'), request.GET.get('limit'))
+    except ValueError:
+        return Response({'error': 'Invalid cursor or limit'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'results': InboxEntrySerializer(entries, many=True).data, 'next': cursor})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def conversation_history(request, user_id):
+    """
+    Messages exchanged with another user, newest first.
+
+    Pass the returned `next` value as `before` for older messages.
+    """
+    other = get_object_or_404(User, pk=user_id)
+    conversation = messaging.conversation_between(request.user, other)
+    if conversation is None:
+        return Response({'results': [], 'next': None})
+
+    try:
+        messages, cursor = messaging.history(conversation, request.GET.get('before'), request.GET.get('limit'))
+    except ValueError:
+        return Response({'error': 'Invalid cursor or limit'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'results': DirectMessageSerializer(messages, many=True).data, 'next': cursor})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def mark_conversation_read(request, user_id):
+    """Mark every message from another user as read."""
+    other = get_object_or_404(User, pk=user_id)
+    conversation = messaging.conversation_between(request.user, other)
+    marked = messaging.mark_read(request.user, conversation) if conversation else 0
+    return Response({'marked_read': marked})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def unread_count(request):
+    """Total unread direct messages."""
+    return Response({'unread_count': messaging.unread_total(request.user)})
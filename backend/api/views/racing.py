@@ -20,6 +20,7 @@ from datetime import timedelta
 
 from core.models.racing import Callout, Track, RaceResult
 from core.models.auth import User
+from core import blocks
 from ..serializers import (
     CalloutSerializer, 
     TrackSerializer, 
@@ -140,6 +141,9 @@ class CalloutListView(generics.ListAPIView):
                     Q(challenger=user) | 
                     Q(challenged=user)
                 )
+                # Hide callouts from or to users on either side of a block
+                queryset = blocks.exclude_blocked(queryset, self.request, field='challenger')
+                queryset = blocks.exclude_blocked(queryset, self.request, field='challenged')
             
             # Filter out expired callouts unless completed/cancelled
             show_expired = self.request.query_params.get('show_expired', 'false').lower() == 'true'
@@ -305,7 +309,8 @@ def search_users_for_callout(request):
     
     users = User.objects.filter(
         Q(username__icontains=query) | Q(email__icontains=query)
-    ).exclude(id=request.user.id)[:10]
+    ).exclude(id=request.user.id)
+    users = blocks.exclude_blocked(users, request, field='id')[:10]
     
     results = [{'id': user.id, 'username': user.username, 'email': user.email} 
                for user in users]
@@ -3,14 +3,14 @@ SEO Views for CalloutRacing Application
 
 This module provides SEO optimization features including:
 - Dynamic meta tag generation
-- Structured data for events, tracks, and marketplace items
-- Sitemap generation
+- Structured data for events, tracks, and marketplace items (cached, see core.seo)
+- Serving pre-rendered sitemaps (see core.sitemaps)
 - SEO-friendly URLs
 """
 
-from django.http import JsonResponse, HttpResponse
-from django.views.decorators.http import require_http_methods
-from django.views.decorators.cache import cache_page
+from django.http import JsonResponse, HttpResponse, FileResponse, Http404
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_http_methods
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -23,332 +23,59 @@ import logging
 from core.models.racing import Track, Event, Callout
 from core.models.marketplace import MarketplaceListing
 from core.models.locations import HotSpot
+from core import counts, seo, sitemaps
+from core.sitemaps import site_url
 
 logger = logging.getLogger(__name__)
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
-def get_seo_meta_tags(request, content_type: str, content_id: int = None):
+def get_seo_meta_tags(request, content_type: str = None, content_id: int = None):
     """
     Get SEO meta tags for different content types.
     
+    Payloads are served from cache (see core.seo), so crawler bursts don't
+    reach the database.
+    
     Args:
-        content_type: Type of content (event, track, callout, listing)
+        content_type: Type of content (event, track, callout, listing, hotspot)
         content_id: ID of the specific content item
     
     Returns:
         JSON with meta tags and structured data
     """
+    if content_type not in seo.CONTENT_TYPES or not content_id:
+        return Response(seo.general_payload(site_url()))
     
-    base_url = request.build_absolute_uri('/').rstrip('/')
-    
-    if content_type == 'event' and content_id:
-        return get_event_seo(content_id, base_url)
-    elif content_type == 'track' and content_id:
-        return get_track_seo(content_id, base_url)
-    elif content_type == 'callout' and content_id:
-        return get_callout_seo(content_id, base_url)
-    elif content_type == 'listing' and content_id:
-        return get_listing_seo(content_id, base_url)
-    elif content_type == 'hotspot' and content_id:
-        return get_hotspot_seo(content_id, base_url)
-    else:
-        return get_general_seo(base_url)
-
-
-def get_event_seo(event_id: int, base_url: str) -> Response:
-    """Get SEO data for a specific event."""
-    try:
-        event = Event.objects.get(id=event_id)
-        
-        title = f"{event.title} - Racing Event | CalloutRacing"
-        description = f"Join {event.title} at {event.track.name if event.track else 'our racing venue'}. {event.description[:100]}..."
-        
-        structured_data = {
-            "@context": "https://schema.org",
-            "@type": "Event",
-            "name": event.title,
-            "description": event.description,
-            "startDate": event.start_time.isoformat() if event.start_time else None,
-            "endDate": event.end_time.isoformat() if event.end_time else None,
-            "location": {
-                "@type": "Place",
-                "name": event.track.name if event.track else "Racing Venue",
-                "address": {
-                    "@type": "PostalAddress",
-                    "addressLocality": event.track.location if event.track else "Racing Location"
-                }
-            } if event.track else None,
-            "organizer": {
-                "@type": "Organization",
-                "name": "CalloutRacing"
-            },
-            "url": f"{base_url}/events/{event.id}"
-        }
-        
-        return Response({
-            'title': title,
-            'description': description,
-            'keywords': f"racing event, {event.title}, drag racing, motorsports, racing competition",
-            'image': event.image.url if hasattr(event, 'image') and event.image else f"{base_url}/android-chrome-192x192.png",
-            'url': f"{base_url}/events/{event.id}",
-            'type': 'event',
-            'structured_data': structured_data
-        })
-        
-    except Event.DoesNotExist:
-        return Response({'error': 'Event not found'}, status=404)
-
-
-def get_track_seo(track_id: int, base_url: str) -> Response:
-    """Get SEO data for a specific track."""
-    try:
-        track = Track.objects.get(id=track_id)
-        
-        title = f"{track.name} - Race Track | CalloutRacing"
-        description = f"Discover {track.name} in {track.location}. {track.description[:100]}..."
-        
-        structured_data = {
-            "@context": "https://schema.org",
-            "@type": "SportsActivityLocation",
-            "name": track.name,
-            "description": track.description,
-            "address": {
-                "@type": "PostalAddress",
-                "addressLocality": track.location,
-                "addressCountry": "US"
-            },
-            "url": f"{base_url}/tracks/{track.id}",
-            "sport": "Racing",
-            "facilityType": track.track_type
-        }
-        
-        return Response({
-            'title': title,
-            'description': description,
-            'keywords': f"race track, {track.name}, {track.location}, drag racing, motorsports",
-            'image': track.image.url if hasattr(track, 'image') and track.image else f"{base_url}/android-chrome-192x192.png",
-            'url': f"{base_url}/tracks/{track.id}",
-            'type': 'website',
-            'structured_data': structured_data
-        })
-        
-    except Track.DoesNotExist:
-        return Response({'error': 'Track not found'}, status=404)
+    payload = seo.get_payload(content_type, content_id)
+    if payload is None:
+        return Response({'error': f'{content_type.capitalize()} not found'}, status=404)
+    return Response(payload)
 
 
-def get_callout_seo(callout_id: int, base_url: str) -> Response:
-    """Get SEO data for a specific callout."""
-    try:
-        callout = Callout.objects.get(id=callout_id)
-        
-        title = f"Racing Callout - {callout.message[:50]}... | CalloutRacing"
-        description = f"Racing callout: {callout.message[:150]}..."
-        
-        structured_data = {
-            "@context": "https://schema.org",
-            "@type": "SportsEvent",
-            "name": f"Racing Callout",
-            "description": callout.message,
-            "sport": "Racing",
-            "url": f"{base_url}/callouts/{callout.id}"
-        }
-        
-        return Response({
-            'title': title,
-            'description': description,
-            'keywords': f"racing callout, drag racing challenge, racing competition, motorsports",
-            'image': f"{base_url}/android-chrome-192x192.png",
-            'url': f"{base_url}/callouts/{callout.id}",
-            'type': 'website',
-            'structured_data': structured_data
-        })
-        
-    except Callout.DoesNotExist:
-        return Response({'error': 'Callout not found'}, status=404)
+def _sitemap_last_modified(request, filename=sitemaps.INDEX_FILE):
+    return sitemaps.sitemap_modified_time(filename)
 
 
-def get_listing_seo(listing_id: int, base_url: str) -> Response:
-    """Get SEO data for a specific marketplace listing."""
-    try:
-        listing = MarketplaceListing.objects.get(id=listing_id)
-        
-        title = f"{listing.title} - Racing Marketplace | CalloutRacing"
-        description = f"Buy {listing.title} in the racing marketplace. {listing.description[:100]}..."
-        
-        structured_data = {
-            "@context": "https://schema.org",
-            "@type": "Product",
-            "name": listing.title,
-            "description": listing.description,
-            "category": listing.category.name if listing.category else "Racing Equipment",
-            "url": f"{base_url}/marketplace/{listing.id}",
-            "offers": {
-                "@type": "Offer",
-                "price": str(listing.price),
-                "priceCurrency": "USD",
-                "availability": "https://schema.org/InStock" if listing.is_active else "https://schema.org/OutOfStock"
-            }
-        }
-        
-        return Response({
-            'title': title,
-            'description': description,
-            'keywords': f"racing marketplace, {listing.title}, racing equipment, automotive parts",
-            'image': listing.image.url if hasattr(listing, 'image') and listing.image else f"{base_url}/android-chrome-192x192.png",
-            'url': f"{base_url}/marketplace/{listing.id}",
-            'type': 'website',
-            'structured_data': structured_data
-        })
-        
-    except MarketplaceListing.DoesNotExist:
-        return Response({'error': 'Listing not found'}, status=404)
-
-
-def get_hotspot_seo(hotspot_id: int, base_url: str) -> Response:
-    """Get SEO data for a specific hotspot."""
-    try:
-        hotspot = HotSpot.objects.get(id=hotspot_id)
-        
-        title = f"{hotspot.name} - Racing Hotspot | CalloutRacing"
-        description = f"Discover {hotspot.name} in {hotspot.city}, {hotspot.state}. {hotspot.description[:100]}..."
-        
-        structured_data = {
-            "@context": "https://schema.org",
-            "@type": "Place",
-            "name": hotspot.name,
-            "description": hotspot.description,
-            "address": {
-                "@type": "PostalAddress",
-                "streetAddress": hotspot.address,
-                "addressLocality": hotspot.city,
-                "addressRegion": hotspot.state,
-                "postalCode": hotspot.zip_code
-            },
-            "url": f"{base_url}/hotspots/{hotspot.id}"
-        }
-        
-        return Response({
-            'title': title,
-            'description': description,
-            'keywords': f"racing hotspot, {hotspot.name}, {hotspot.city}, car meets, racing location",
-            'image': f"{base_url}/android-chrome-192x192.png",
-            'url': f"{base_url}/hotspots/{hotspot.id}",
-            'type': 'website',
-            'structured_data': structured_data
-        })
-        
-    except HotSpot.DoesNotExist:
-        return Response({'error': 'Hotspot not found'}, status=404)
-
-
-def get_general_seo(base_url: str) -> Response:
-    """Get general SEO data for the website."""
-    return Response({
-        'title': 'CalloutRacing - Ultimate Racing Community Platform | Find Events, Challenge Racers',
-        'description': 'Join the ultimate racing community! Find drag racing events, challenge other racers, discover tracks and hotspots, buy/sell cars, and connect with car enthusiasts nationwide.',
-        'keywords': 'racing, drag racing, car community, racing events, car meets, race tracks, car enthusiasts, automotive, motorsports, racing platform, car marketplace, racing hotspots',
-        'image': f"{base_url}/android-chrome-192x192.png",
-        'url': base_url,
-        'type': 'website',
-        'structured_data': {
-            "@context": "https://schema.org",
-            "@type": "WebSite",
-            "name": "CalloutRacing",
-            "url": base_url,
-            "description": "Ultimate racing community platform for finding events, challenging racers, and connecting with car enthusiasts"
-        }
-    })
-
-
-@api_view(['GET'])
-@permission_classes([AllowAny])
-@cache_page(60 * 60 * 24)  # Cache for 24 hours
-def generate_sitemap(request):
-    """
-    Generate a dynamic sitemap for the website.
+@require_http_methods(["GET", "HEAD"])
+@condition(last_modified_func=_sitemap_last_modified)
+def serve_sitemap(request, filename=sitemaps.INDEX_FILE):
     """
-    base_url = request.build_absolute_uri('/').rstrip('/')
+    Serve a sitemap pre-rendered by `python manage.py build_sitemaps`.
     
-    # Get recent content
-    recent_events = Event.objects.filter(start_time__gte=timezone.now()).order_by('start_time')[:50]
-    active_tracks = Track.objects.filter(is_active=True)[:50]
-    recent_callouts = Callout.objects.filter(status='pending').order_by('-created_at')[:50]
-    active_listings = MarketplaceListing.objects.filter(is_active=True).order_by('-created_at')[:50]
-    hotspots = HotSpot.objects.all()[:50]
-    
-    sitemap_urls = []
-    
-    # Add static pages
-    static_pages = [
-        {'url': '/', 'priority': '1.0', 'changefreq': 'daily'},
-        {'url': '/about', 'priority': '0.8', 'changefreq': 'monthly'},
-        {'url': '/contact', 'priority': '0.7', 'changefreq': 'monthly'},
-        {'url': '/callouts', 'priority': '0.9', 'changefreq': 'hourly'},
-        {'url': '/events', 'priority': '0.9', 'changefreq': 'daily'},
-        {'url': '/tracks', 'priority': '0.8', 'changefreq': 'weekly'},
-        {'url': '/hotspots', 'priority': '0.8', 'changefreq': 'daily'},
-        {'url': '/marketplace', 'priority': '0.8', 'changefreq': 'daily'},
-        {'url': '/social', 'priority': '0.8', 'changefreq': 'hourly'},
-        {'url': '/login', 'priority': '0.6', 'changefreq': 'monthly'},
-        {'url': '/signup', 'priority': '0.6', 'changefreq': 'monthly'},
-    ]
-    
-    for page in static_pages:
-        sitemap_urls.append({
-            'loc': f"{base_url}{page['url']}",
-            'lastmod': timezone.now().strftime('%Y-%m-%d'),
-            'changefreq': page['changefreq'],
-            'priority': page['priority']
-        })
-    
-    # Add dynamic content
-    for event in recent_events:
-        sitemap_urls.append({
-            'loc': f"{base_url}/events/{event.id}",
-            'lastmod': event.updated_at.strftime('%Y-%m-%d') if hasattr(event, 'updated_at') else event.created_at.strftime('%Y-%m-%d'),
-            'changefreq': 'weekly',
-            'priority': '0.7'
-        })
-    
-    for track in active_tracks:
-        sitemap_urls.append({
-            'loc': f"{base_url}/tracks/{track.id}",
-            'lastmod': track.updated_at.strftime('%Y-%m-%d') if hasattr(track, 'updated_at') else track.created_at.strftime('%Y-%m-%d'),
-            'changefreq': 'monthly',
-            'priority': '0.6'
-        })
-    
-    for callout in recent_callouts:
-        sitemap_urls.append({
-            'loc': f"{base_url}/callouts/{callout.id}",
-            'lastmod': callout.updated_at.strftime('%Y-%m-%d') if hasattr(callout, 'updated_at') else callout.created_at.strftime('%Y-%m-%d'),
-            'changefreq': 'daily',
-            'priority': '0.6'
-        })
-    
-    for listing in active_listings:
-        sitemap_urls.append({
-            'loc': f"{base_url}/marketplace/{listing.id}",
-            'lastmod': listing.updated_at.strftime('%Y-%m-%d') if hasattr(listing, 'updated_at') else listing.created_at.strftime('%Y-%m-%d'),
-            'changefreq': 'weekly',
-            'priority': '0.6'
-        })
-    
-    for hotspot in hotspots:
-        sitemap_urls.append({
-            'loc': f"{base_url}/hotspots/{hotspot.id}",
-            'lastmod': hotspot.updated_at.strftime('%Y-%m-%d') if hasattr(hotspot, 'updated_at') else hotspot.created_at.strftime('%Y-%m-%d'),
-            'changefreq': 'monthly',
-            'priority': '0.5'
-        })
+    /sitemap.xml is the index; it links to the chunk files under /sitemaps/.
+    """
+    if not sitemaps.is_sitemap_file(filename):
+        raise Http404('Unknown sitemap')
+    try:
+        sitemap = sitemaps.open_sitemap(filename)
+    except FileNotFoundError:
+        raise Http404('Sitemap has not been built')
     
-    return Response({
-        'urls': sitemap_urls,
-        'total_urls': len(sitemap_urls),
-        'generated_at': timezone.now().isoformat()
-    })
+    response = FileResponse(sitemap, content_type='application/xml')
+    patch_cache_control(response, public=True, max_age=3600)
+    return response
 
 
 @api_view(['GET'])
@@ -359,15 +86,17 @@ def get_seo_analytics(request):
     """
     try:
         # Count content for SEO insights
-        total_events = Event.objects.count()
-        total_tracks = Track.objects.filter(is_active=True).count()
-        total_callouts = Callout.objects.filter(status='pending').count()
-        total_listings = MarketplaceListing.objects.filter(is_active=True).count()
-        total_hotspots = HotSpot.objects.count()
-        
-        # Get recent activity
-        recent_events = Event.objects.filter(start_time__gte=timezone.now()).count()
-        recent_callouts = Callout.objects.filter(created_at__gte=timezone.now() - timezone.timedelta(days=7)).count()
+        # Cached, and estimated on large PostgreSQL tables (see core.counts)
+        total_events = counts.count(Event.objects.all())
+        total_tracks = counts.count(Track.objects.filter(is_active=True))
+        total_callouts = counts.count(Callout.objects.filter(status='pending'))
+        total_listings = counts.count(MarketplaceListing.objects.filter(is_active=True))
+        total_hotspots = counts.count(HotSpot.objects.all())
+        
+        # Get recent activity; the cutoffs are rounded to the hour so the cached counts get reused
+        hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+        recent_events = counts.count(Event.objects.filter(start_date__gte=hour))
+        recent_callouts = counts.count(Callout.objects.filter(created_at__gte=hour - timezone.timedelta(days=7)))
         
         return Response({
             'content_counts': {
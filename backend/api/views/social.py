@@ -20,6 +20,7 @@ from core.models.auth import User
 
 from core.models.social import UserPost, PostComment, Follow, Notification
 from core.models.racing import Callout, Event
+from core import blocks
 from ..serializers import (
     UserPostSerializer, 
     PostCommentSerializer,
@@ -55,6 +56,7 @@ class GlobalFeedView(generics.ListAPIView):
         all_posts = UserPost.objects.filter(
             is_public=True
         ).select_related('author').prefetch_related('comments', 'likes')
+        all_posts = blocks.exclude_blocked(all_posts, request)
         
         # Apply filters
         post_type = request.query_params.get('post_type')
@@ -120,6 +122,7 @@ class LiveFeedView(generics.ListAPIView):
         combined_posts = (followed_posts | trending_posts).distinct().order_by(
             '-created_at'
         )
+        combined_posts = blocks.exclude_blocked(combined_posts, request)
         
         # Apply filters
         post_type = request.query_params.get('post_type')
@@ -372,10 +375,10 @@ def trending_posts(request):
     GET /api/social/trending/
     - Returns posts with high engagement in the last 7 days
     """
-    trending_posts = UserPost.objects.filter(
+    trending_posts = blocks.exclude_blocked(UserPost.objects.filter(
         is_public=True,
         created_at__gte=timezone.now() - timedelta(days=7)
-    ).annotate(
+    ), request).annotate(
         total_engagement=Count('comments') + Count('likes')
     ).filter(
         total_engagement__gte=3
@@ -10,6 +10,7 @@ This module handles Stripe subscription management including:
 
 import stripe
 import json
+from datetime import datetime, timezone as dt_timezone
 from django.conf import settings
 from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
@@ -21,6 +22,9 @@ from rest_framework import status
 from core.models import User
 from core.models.payments import Subscription, Payment, UserWallet, MarketplaceTransaction
 from core.models.marketplace import MarketplaceListing
+from core import stripe_cache
+from core.entitlements import for_request
+from core.webhook_inbox import record_event
 import logging
 
 logger = logging.getLogger(__name__)
@@ -51,24 +55,27 @@ def create_subscription_checkout_session(request):
             request.user.stripe_customer_id = customer
             request.user.save()
 
-        # Create checkout session
-        checkout_session = stripe.checkout.Session.create(
-            customer=customer,
-            line_items=[
-                {
-                    'price': price_id,
-                    'quantity': 1,
+        # Create checkout session, reusing the user's open one for this price
+        checkout_session = stripe_cache.reusable_checkout_session(
+            f"subscription:{request.user.id}:{price_id}",
+            lambda: stripe.checkout.Session.create(
+                customer=customer,
+                line_items=[
+                    {
+                        'price': price_id,
+                        'quantity': 1,
+                    },
+                ],
+                mode='subscription',
+                success_url=f"{settings.FRONTEND_URL}/subscription/success?session_id={{CHECKOUT_SESSION_ID}}",
+                cancel_url=f"{settings.FRONTEND_URL}/subscription/cancel",
+                metadata={
+                    'user_id': request.user.id,
+                    'price_id': price_id
                 },
-            ],
-            mode='subscription',
-            success_url=f"{settings.FRONTEND_URL}/subscription/success?session_id={{CHECKOUT_SESSION_ID}}",
-            cancel_url=f"{settings.FRONTEND_URL}/subscription/cancel",
-            metadata={
-                'user_id': request.user.id,
-                'price_id': price_id
-            },
-            allow_promotion_codes=True,
-            billing_address_collection='required',
+                allow_promotion_codes=True,
+                billing_address_collection='required',
+            )
         )
 
         return Response({
@@ -112,20 +119,14 @@ def create_customer_portal_session(request):
 def get_subscription_status(request):
     """Get current user's subscription status."""
     try:
-        subscription = Subscription.objects.filter(
-            user=request.user,
-            status__in=['active', 'trialing']
-        ).first()
+        entitlements = for_request(request)
 
-        if subscription:
+        if entitlements.subscription:
             return Response({
                 'has_active_subscription': True,
-                'subscription': {
-                    'id': subscription.id,
-                    'status': subscription.status,
-                    'current_period_end': subscription.current_period_end,
-                    'cancel_at_period_end': subscription.cancel_at_period_end,
-                }
+                'plan': entitlements.plan,
+                'features': sorted(entitlements.features),
+                'subscription': entitlements.subscription,
             }, status=status.HTTP_200_OK)
         else:
             return Response({
@@ -210,7 +211,13 @@ def stripe_webhook(request):
         logger.error(f"Invalid signature: {e}")
         return HttpResponse(status=400)
 
-    # Handle the event
+    # Acknowledge now; core.webhook_inbox processes the event in the background
+    record_event(event, 'subscriptions')
+    return HttpResponse(status=200)
+
+
+def dispatch_event(event):
+    """Route a stored Stripe event to its handler (called by the webhook worker)."""
     if event['type'] == 'checkout.session.completed':
         handle_checkout_session_completed(event['data']['object'])
     elif event['type'] == 'payment_intent.succeeded':
@@ -228,7 +235,12 @@ def stripe_webhook(request):
     else:
         logger.info(f"Unhandled event type: {event['type']}")
 
-    return HttpResponse(status=200)
+
+def _from_timestamp(value):
+    """Stripe sends times as unix seconds; the models store datetimes."""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, tz=dt_timezone.utc)
 
 
 def handle_checkout_session_completed(session):
@@ -266,6 +278,7 @@ def handle_checkout_session_completed(session):
             
     except Exception as e:
         logger.error(f"Error handling checkout session completed: {e}")
+        raise
 
 
 def handle_payment_intent_succeeded(payment_intent):
@@ -282,15 +295,17 @@ def handle_payment_intent_succeeded(payment_intent):
             seller_amount_cents = payment_intent.metadata.get('seller_amount_cents', 0)
             
             # Create marketplace transaction record
-            transaction = MarketplaceTransaction.objects.create(
-                buyer_id=buyer_id,
-                seller_id=seller_id,
-                item_id=item_id,
+            transaction, _ = MarketplaceTransaction.objects.get_or_create(
                 stripe_payment_intent_id=payment_intent.id,
-                amount=payment_intent.amount / 100,
-                seller_amount=seller_amount_cents / 100,
-                platform_commission=commission_cents / 100,
-                status='completed'
+                defaults={
+                    'buyer_id': buyer_id,
+                    'seller_id': seller_id,
+                    'item_id': item_id,
+                    'amount': payment_intent.amount / 100,
+                    'seller_amount': int(seller_amount_cents) / 100,
+                    'platform_commission': int(commission_cents) / 100,
+                    'status': 'completed',
+                }
             )
             
             # Mark item as sold
@@ -303,19 +318,23 @@ def handle_payment_intent_succeeded(payment_intent):
         # Create payment record
         user_id = payment_intent.metadata.get('buyer_id')
         if user_id:
-            Payment.objects.create(
-                user_id=user_id,
+            # One row per PaymentIntent; a retried failed payment updates it
+            Payment.objects.update_or_create(
                 stripe_payment_intent_id=payment_intent.id,
-                amount=payment_intent.amount / 100,
-                currency=payment_intent.currency,
-                status='succeeded',
-                payment_type='marketplace' if transaction_type == 'marketplace' else 'one_time',
-                description=f"Payment for {transaction_type}",
-                metadata=payment_intent.metadata
+                defaults={
+                    'user_id': user_id,
+                    'amount': payment_intent.amount / 100,
+                    'currency': payment_intent.currency,
+                    'status': 'succeeded',
+                    'payment_type': 'marketplace' if transaction_type == 'marketplace' else 'one_time',
+                    'description': f"Payment for {transaction_type}",
+                    'metadata': payment_intent.metadata,
+                }
             )
             
     except Exception as e:
         logger.error(f"Error handling payment intent succeeded: {e}")
+        raise
 
 
 def handle_payment_intent_failed(payment_intent):
@@ -323,19 +342,22 @@ def handle_payment_intent_failed(payment_intent):
     try:
         user_id = payment_intent.metadata.get('buyer_id')
         if user_id:
-            Payment.objects.create(
-                user_id=user_id,
+            Payment.objects.update_or_create(
                 stripe_payment_intent_id=payment_intent.id,
-                amount=payment_intent.amount / 100,
-                currency=payment_intent.currency,
-                status='failed',
-                payment_type='marketplace',
-                description="Failed payment",
-                metadata=payment_intent.metadata
+                defaults={
+                    'user_id': user_id,
+                    'amount': payment_intent.amount / 100,
+                    'currency': payment_intent.currency,
+                    'status': 'failed',
+                    'payment_type': 'marketplace',
+                    'description': "Failed payment",
+                    'metadata': payment_intent.metadata,
+                }
             )
             
     except Exception as e:
         logger.error(f"Error handling payment intent failed: {e}")
+        raise
 
 
 def handle_invoice_payment_succeeded(invoice):
@@ -347,12 +369,13 @@ def handle_invoice_payment_succeeded(invoice):
         ).first()
         
         if subscription:
-            subscription.current_period_start = invoice.period_start
-            subscription.current_period_end = invoice.period_end
+            subscription.current_period_start = _from_timestamp(invoice.period_start)
+            subscription.current_period_end = _from_timestamp(invoice.period_end)
             subscription.save()
             
     except Exception as e:
         logger.error(f"Error handling invoice payment succeeded: {e}")
+        raise
 
 
 def handle_invoice_payment_failed(invoice):
@@ -368,6 +391,7 @@ def handle_invoice_payment_failed(invoice):
             
     except Exception as e:
         logger.error(f"Error handling invoice payment failed: {e}")
+        raise
 
 
 def handle_subscription_updated(subscription):
@@ -379,13 +403,14 @@ def handle_subscription_updated(subscription):
         
         if db_subscription:
             db_subscription.status = subscription.status
-            db_subscription.current_period_start = subscription.current_period_start
-            db_subscription.current_period_end = subscription.current_period_end
+            db_subscription.current_period_start = _from_timestamp(subscription.current_period_start)
+            db_subscription.current_period_end = _from_timestamp(subscription.current_period_end)
             db_subscription.cancel_at_period_end = subscription.cancel_at_period_end
             db_subscription.save()
             
     except Exception as e:
         logger.error(f"Error handling subscription updated: {e}")
+        raise
 
 
 def handle_subscription_deleted(subscription):
@@ -401,6 +426,7 @@ def handle_subscription_deleted(subscription):
             
     except Exception as e:
         logger.error(f"Error handling subscription deleted: {e}")
+        raise
 
 
 @api_view(['GET'])
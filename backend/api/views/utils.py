@@ -13,10 +13,10 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth import authenticate
 from django.conf import settings
-from rest_framework.authtoken.models import Token
 import requests
 
 from core.models.auth import User, UserProfile
+from core.token_service import issue_token_pair
 
 
 @api_view(['POST'])
@@ -62,9 +62,11 @@ def google_sso(request):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Check if user already exists
+        is_new_user = False
         try:
             user = User.objects.get(email=email)
         except User.DoesNotExist:
+            is_new_user = True
             # Create new user
             username = email.split('@')[0]  # Use email prefix as username
             base_username = username
@@ -80,27 +82,28 @@ def google_sso(request):
                 email=email,
                 first_name=first_name,
                 last_name=last_name,
-                password=None,  # No password for SSO users
-                email_verified=True  # Google emails are verified
+                password=None  # No password for SSO users
             )
             
-            # Create user profile
-            UserProfile.objects.create(user=user)
+            # The profile is created by the post_save signal; Google emails are verified
+            user.profile.email_verified = True
+            user.profile.save(update_fields=['email_verified', 'updated_at'])
         
-        # Generate or get token
-        token, created = Token.objects.get_or_create(user=user)
+        # Generate tokens
+        tokens = issue_token_pair(user)
         
         return Response({
-            'token': token.key,
+            'token': tokens['access'],
+            'refresh': tokens['refresh'],
             'user': {
                 'id': user.id,
                 'username': user.username,
                 'email': user.email,
                 'first_name': user.first_name,
                 'last_name': user.last_name,
-                'email_verified': user.email_verified
+                'email_verified': user.profile.email_verified
             },
-            'is_new_user': created
+            'is_new_user': is_new_user
         })
         
     except requests.RequestException as e:
@@ -159,9 +162,11 @@ def facebook_sso(request):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Check if user already exists
+        is_new_user = False
         try:
             user = User.objects.get(email=email)
         except User.DoesNotExist:
+            is_new_user = True
             # Create new user
             username = email.split('@')[0]  # Use email prefix as username
             base_username = username
@@ -177,27 +182,28 @@ def facebook_sso(request):
                 email=email,
                 first_name=first_name,
                 last_name=last_name,
-                password=None,  # No password for SSO users
-                email_verified=True  # Facebook emails are verified
+                password=None  # No password for SSO users
             )
             
-            # Create user profile
-            UserProfile.objects.create(user=user)
+            # The profile is created by the post_save signal; Facebook emails are verified
+            user.profile.email_verified = True
+            user.profile.save(update_fields=['email_verified', 'updated_at'])
         
-        # Generate or get token
-        token, created = Token.objects.get_or_create(user=user)
+        # Generate tokens
+        tokens = issue_token_pair(user)
         
         return Response({
-            'token': token.key,
+            'token': tokens['access'],
+            'refresh': tokens['refresh'],
             'user': {
                 'id': user.id,
                 'username': user.username,
                 'email': user.email,
                 'first_name': user.first_name,
                 'last_name': user.last_name,
-                'email_verified': user.email_verified
+                'email_verified': user.profile.email_verified
             },
-            'is_new_user': created
+            'is_new_user': is_new_user
         })
         
     except requests.RequestException as e:
@@ -265,7 +271,8 @@ def global_search(request):
         })
     
     # For now, just return empty results
-    # TODO: Implement actual search functionality
+    # TODO: Implement actual search functionality; user and callout results
+    # must go through core.blocks.exclude_blocked like search_users_for_callout
     return Response({
         'results': [],
         'query': query
@@ -3,6 +3,7 @@ Django settings for calloutracing project.
 """
 
 import os
+from datetime import timedelta
 from pathlib import Path
 from decouple import config
 
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
     
     # Third party apps
     'rest_framework',
+    'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
     'drf_yasg',
     'django_filters',
@@ -65,6 +67,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.profiling.RequestProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'calloutracing.urls'
@@ -149,10 +152,32 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Use custom User model
 AUTH_USER_MODEL = 'core.User'
 
+# Cache configuration
+# Token revocation and rate limiting state must be shared between workers,
+# so REDIS_URL is required outside DEBUG (enforced by core.checks). Without it
+# the cache is per-process memory, which is only fine for local development.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        # Session stays first so unauthenticated browser requests keep getting 403, not 401
         'rest_framework.authentication.SessionAuthentication',
+        # Stateless signed tokens for mobile/API clients (no session, CSRF or DB lookup)
+        'api.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',  # Changed to AllowAny by default
@@ -164,6 +189,31 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    # Scopes used by api.throttling (sliding window, shared through CACHES)
+    'DEFAULT_THROTTLE_RATES': {
+        'login': config('THROTTLE_LOGIN_RATE', default='20/min'),
+        'login_account': config('THROTTLE_LOGIN_ACCOUNT_RATE', default='10/min'),
+        'user_lookup': config('THROTTLE_USER_LOOKUP_RATE', default='30/min'),
+        'contact': config('THROTTLE_CONTACT_RATE', default='5/hour'),
+        'email_send': config('THROTTLE_EMAIL_SEND_RATE', default='5/hour'),
+    },
+    # Reverse proxies in front of the app (one on Railway). Client IPs for
+    # throttles and view counts are read from X-Forwarded-For this many hops
+    # from the end; 0 ignores the header and uses REMOTE_ADDR. Never leave it
+    # unset: DRF would then key on the whole client-supplied header.
+    'NUM_PROXIES': config('NUM_PROXIES', default=1, cast=int),
+}
+
+# JWT settings
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=config('JWT_ACCESS_TOKEN_MINUTES', default=15, cast=int)),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=config('JWT_REFRESH_TOKEN_DAYS', default=14, cast=int)),
+    'ROTATE_REFRESH_TOKENS': True,
+    'BLACKLIST_AFTER_ROTATION': True,
+    'UPDATE_LAST_LOGIN': False,
+    # 'Token' is accepted for clients that already send the key minted by OTP/SSO login
+    'AUTH_HEADER_TYPES': ('Bearer', 'Token'),
+    'TOKEN_REFRESH_SERIALIZER': 'api.authentication.RevocationAwareTokenRefreshSerializer',
 }
 
 # CORS settings
@@ -268,6 +318,32 @@ EMAIL_USE_SSL = config('EMAIL_USE_SSL', default=False, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@calloutracing.com')
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=10, cast=int)
+
+# Background delivery of queued email/SMS: 'thread' (in-process worker),
+# 'inline' (deliver on commit, for tests/dev) or 'external' (run
+# `python manage.py process_email_queue --loop` / `process_sms_queue --loop` /
+# `process_webhooks --loop` as separate workers)
+BACKGROUND_WORKER_MODE = config('BACKGROUND_WORKER_MODE', default='thread')
+EMAIL_QUEUE_BATCH_SIZE = config('EMAIL_QUEUE_BATCH_SIZE', default=50, cast=int)
+EMAIL_QUEUE_MAX_ATTEMPTS = config('EMAIL_QUEUE_MAX_ATTEMPTS', default=5, cast=int)
+WEBHOOK_QUEUE_BATCH_SIZE = config('WEBHOOK_QUEUE_BATCH_SIZE', default=50, cast=int)
+WEBHOOK_QUEUE_MAX_ATTEMPTS = config('WEBHOOK_QUEUE_MAX_ATTEMPTS', default=8, cast=int)
+# Sent/failed outbox rows hold reset links and OTPs; `purge_outbox` deletes them after this long
+OUTBOX_RETENTION_HOURS = config('OUTBOX_RETENTION_HOURS', default=24, cast=int)
+
+# Buffered view counters (core.view_counter)
+VIEW_COUNT_FLUSH_INTERVAL = config('VIEW_COUNT_FLUSH_INTERVAL', default=30, cast=int)
+VIEW_COUNT_DEDUP_SECONDS = config('VIEW_COUNT_DEDUP_SECONDS', default=1800, cast=int)
+
+# Per-request query/SQL/serializer profiling (core.profiling): 'off', 'all' (development)
+# or 'sample' (production: profiles a fraction of requests, Server-Timing only for staff)
+REQUEST_PROFILING = config('REQUEST_PROFILING', default='off')
+REQUEST_PROFILING_SAMPLE_RATE = config('REQUEST_PROFILING_SAMPLE_RATE', default=0.01, cast=float)
+REQUEST_PROFILING_DUPLICATE_THRESHOLD = config('REQUEST_PROFILING_DUPLICATE_THRESHOLD', default=5, cast=int)
+
+# Cached event calendar buckets (core.event_calendar); event changes invalidate them
+CALENDAR_CACHE_TIMEOUT = config('CALENDAR_CACHE_TIMEOUT', default=21600, cast=int)
 
 # Frontend URL for email verification links
 FRONTEND_URL = config('FRONTEND_URL', default='https://calloutracing.up.railway.app')
@@ -305,10 +381,31 @@ CSRF_TRUSTED_ORIGINS = [
 STRIPE_SECRET_KEY = config('STRIPE_SECRET_KEY', default='')
 STRIPE_WEBHOOK_SECRET = config('STRIPE_WEBHOOK_SECRET', default='')
 STRIPE_PUBLISHABLE_KEY = config('STRIPE_PUBLISHABLE_KEY', default='')
+# Cached Stripe objects (core.stripe_cache) expire after this; webhooks invalidate them sooner
+STRIPE_CACHE_TIMEOUT = config('STRIPE_CACHE_TIMEOUT', default=3600, cast=int)
 
 # Frontend URL for Stripe redirects
 FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:5173')
 
+# Sitemaps (core.sitemaps): page URLs are built on SITEMAP_SITE_URL; the index links
+# to the chunk files at SITEMAP_FILES_URL (default: <SITEMAP_SITE_URL>/sitemaps)
+SITEMAP_SITE_URL = config('SITEMAP_SITE_URL', default=FRONTEND_URL)
+SITEMAP_FILES_URL = config('SITEMAP_FILES_URL', default='')
+
+# Cached SEO meta tags / JSON-LD (core.seo); object changes invalidate them
+SEO_CACHE_TIMEOUT = config('SEO_CACHE_TIMEOUT', default=86400, cast=int)
+
+# Cached row counts (core.counts); PostgreSQL estimates below the threshold are counted exactly
+COUNT_CACHE_TIMEOUT = config('COUNT_CACHE_TIMEOUT', default=60, cast=int)
+APPROXIMATE_COUNT_THRESHOLD = config('APPROXIMATE_COUNT_THRESHOLD', default=10000, cast=int)
+
+# Cached follower counts and follow sets (core.follow_graph); larger sets are queried instead of cached
+FOLLOW_GRAPH_CACHE_TIMEOUT = config('FOLLOW_GRAPH_CACHE_TIMEOUT', default=3600, cast=int)
+FOLLOW_GRAPH_MAX_SET_SIZE = config('FOLLOW_GRAPH_MAX_SET_SIZE', default=5000, cast=int)
+
+# Cached per-user block sets (core.blocks) that feeds and search exclude; blocking invalidates them
+BLOCK_CACHE_TIMEOUT = config('BLOCK_CACHE_TIMEOUT', default=3600, cast=int)
+
 # Marketplace commission percentage
 MARKETPLACE_COMMISSION_PERCENTAGE = config('MARKETPLACE_COMMISSION_PERCENTAGE', default=0.05, cast=float)  # 5% default 
 
@@ -325,10 +422,23 @@ AWS_REGION = config('AWS_REGION', default='us-east-1')
 # Vonage (Nexmo) SMS
 VONAGE_API_KEY = config('VONAGE_API_KEY', default='')
 VONAGE_API_SECRET = config('VONAGE_API_SECRET', default='')
+VONAGE_FROM_NUMBER = config('VONAGE_FROM_NUMBER', default='')
+
+# SMS delivery: providers are tried in this order and skipped when unconfigured.
+# Add 'console' for local development; with DEBUG on it logs each message (and
+# so the OTP code) and counts it as sent.
+SMS_PROVIDERS = [name.strip() for name in config('SMS_PROVIDERS', default='twilio,vonage,sns').split(',') if name.strip()]  # type: ignore
+SMS_PROVIDER_COOLDOWN_SECONDS = config('SMS_PROVIDER_COOLDOWN_SECONDS', default=60, cast=int)
+SMS_HTTP_TIMEOUT = config('SMS_HTTP_TIMEOUT', default=10, cast=int)
+SMS_HTTP_POOL_SIZE = config('SMS_HTTP_POOL_SIZE', default=10, cast=int)
+SMS_QUEUE_BATCH_SIZE = config('SMS_QUEUE_BATCH_SIZE', default=50, cast=int)
+SMS_QUEUE_MAX_ATTEMPTS = config('SMS_QUEUE_MAX_ATTEMPTS', default=3, cast=int)
 
 # OTP Settings
 OTP_EXPIRY_MINUTES = config('OTP_EXPIRY_MINUTES', default=10, cast=int)
 OTP_LENGTH = config('OTP_LENGTH', default=6, cast=int)
+# Expired/used codes are kept this long for auditing before `purge_otps` deletes them
+OTP_RETENTION_HOURS = config('OTP_RETENTION_HOURS', default=24, cast=int)
 
 # Initialize Stripe
 import stripe
@@ -342,6 +452,9 @@ else:
 STRIPE_CONNECT_CLIENT_ID = config('STRIPE_CONNECT_CLIENT_ID', default='')
 STRIPE_CONNECT_REDIRECT_URI = config('STRIPE_CONNECT_REDIRECT_URI', default='')
 
+# Cached per-user plan/features (core.entitlements); subscription changes invalidate it
+ENTITLEMENT_CACHE_TIMEOUT = config('ENTITLEMENT_CACHE_TIMEOUT', default=3600, cast=int)
+
 # Subscription settings
 SUBSCRIPTION_PLANS = {
     'basic': {
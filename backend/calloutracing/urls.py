@@ -9,6 +9,7 @@ from django.http import JsonResponse
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from api.views.seo import serve_sitemap
 
 schema_view = get_schema_view(
    openapi.Info(
@@ -49,6 +50,8 @@ urlpatterns = [
     path('api/health/', health_check, name='health'),
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
+    path('sitemap.xml', serve_sitemap, name='sitemap-index'),
+    path('sitemaps/<str:filename>', serve_sitemap, name='sitemap-file'),
     path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 ]
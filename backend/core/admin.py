@@ -14,14 +14,22 @@ from .models.social import (
 )
 from .models.cars import CarProfile
 from .models.marketplace import Marketplace
-from .models.payments import Subscription, Payment, UserWallet
+from .models.payments import Subscription, Payment, UserWallet, StripeWebhookEvent
 from .models.locations import HotSpot
+from .models.outbox import OutboundEmail, OutboundSMS
+from .counts import ApproximateCountPaginator
 
 
 # User model is now Django's built-in User model, no need to register it here
 # Django automatically registers the built-in User model with UserAdmin
 
 
+class ApproximateCountAdmin(admin.ModelAdmin):
+    """Changelist totals come from core.counts, for tables that grow without bound."""
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'location', 'car_make', 'car_model', 'wins', 'losses', 'total_races']
@@ -31,7 +39,7 @@ class UserProfileAdmin(admin.ModelAdmin):
 
 
 @admin.register(Track)
-class TrackAdmin(admin.ModelAdmin):
+class TrackAdmin(ApproximateCountAdmin):
     list_display = ['name', 'location', 'track_type', 'surface_type', 'is_active']
     list_filter = ['track_type', 'surface_type', 'is_active']
     search_fields = ['name', 'location', 'description']
@@ -39,7 +47,7 @@ class TrackAdmin(admin.ModelAdmin):
 
 
 @admin.register(Callout)
-class CalloutAdmin(admin.ModelAdmin):
+class CalloutAdmin(ApproximateCountAdmin):
     list_display = ['challenger', 'challenged', 'race_type', 'status', 'created_at']
     list_filter = ['status', 'race_type', 'location_type', 'experience_level']
     search_fields = ['challenger__username', 'challenged__username', 'message']
@@ -48,7 +56,7 @@ class CalloutAdmin(admin.ModelAdmin):
 
 
 @admin.register(RaceResult)
-class RaceResultAdmin(admin.ModelAdmin):
+class RaceResultAdmin(ApproximateCountAdmin):
     list_display = ['callout', 'challenger_time', 'challenged_time', 'is_verified', 'created_at']
     list_filter = ['is_verified', 'created_at']
     search_fields = ['callout__challenger__username', 'callout__challenged__username']
@@ -56,7 +64,7 @@ class RaceResultAdmin(admin.ModelAdmin):
 
 
 @admin.register(Follow)
-class FollowAdmin(admin.ModelAdmin):
+class FollowAdmin(ApproximateCountAdmin):
     list_display = ['follower', 'following', 'created_at']
     list_filter = ['created_at']
     search_fields = ['follower__username', 'following__username']
@@ -80,7 +88,7 @@ class FriendshipAdmin(admin.ModelAdmin):
 
 
 @admin.register(Message)
-class MessageAdmin(admin.ModelAdmin):
+class MessageAdmin(ApproximateCountAdmin):
     list_display = ['sender', 'recipient', 'is_read', 'created_at']
     list_filter = ['is_read', 'created_at']
     search_fields = ['sender__username', 'recipient__username', 'content']
@@ -88,7 +96,7 @@ class MessageAdmin(admin.ModelAdmin):
 
 
 @admin.register(UserPost)
-class UserPostAdmin(admin.ModelAdmin):
+class UserPostAdmin(ApproximateCountAdmin):
     list_display = ['author', 'post_type', 'likes_count', 'comments_count', 'is_public', 'created_at']
     list_filter = ['post_type', 'is_public', 'created_at']
     search_fields = ['author__username', 'content']
@@ -96,7 +104,7 @@ class UserPostAdmin(admin.ModelAdmin):
 
 
 @admin.register(PostComment)
-class PostCommentAdmin(admin.ModelAdmin):
+class PostCommentAdmin(ApproximateCountAdmin):
     list_display = ['author', 'post', 'likes_count', 'created_at']
     list_filter = ['created_at']
     search_fields = ['author__username', 'content', 'post__content']
@@ -104,7 +112,7 @@ class PostCommentAdmin(admin.ModelAdmin):
 
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(ApproximateCountAdmin):
     list_display = ['recipient', 'sender', 'notification_type', 'is_read', 'created_at']
     list_filter = ['notification_type', 'is_read', 'created_at']
     search_fields = ['recipient__username', 'sender__username', 'title', 'message']
@@ -112,7 +120,7 @@ class NotificationAdmin(admin.ModelAdmin):
 
 
 @admin.register(ReputationRating)
-class ReputationRatingAdmin(admin.ModelAdmin):
+class ReputationRatingAdmin(ApproximateCountAdmin):
     list_display = ['rater', 'rated_user', 'rating', 'created_at']
     list_filter = ['rating', 'created_at']
     search_fields = ['rater__username', 'rated_user__username', 'comment']
@@ -128,7 +136,7 @@ class CarProfileAdmin(admin.ModelAdmin):
 
 
 @admin.register(Marketplace)
-class MarketplaceAdmin(admin.ModelAdmin):
+class MarketplaceAdmin(ApproximateCountAdmin):
     list_display = ['seller', 'title', 'price', 'is_active', 'created_at']
     list_filter = ['is_active', 'created_at']
     search_fields = ['seller__username', 'title', 'description']
@@ -144,7 +152,7 @@ class SubscriptionAdmin(admin.ModelAdmin):
 
 
 @admin.register(Payment)
-class PaymentAdmin(admin.ModelAdmin):
+class PaymentAdmin(ApproximateCountAdmin):
     list_display = ['user', 'amount', 'status', 'payment_type', 'created_at']
     list_filter = ['status', 'payment_type', 'created_at']
     search_fields = ['user__username', 'transaction_id']
@@ -160,7 +168,7 @@ class UserWalletAdmin(admin.ModelAdmin):
 
 
 @admin.register(HotSpot)
-class HotSpotAdmin(admin.ModelAdmin):
+class HotSpotAdmin(ApproximateCountAdmin):
     list_display = ['name', 'city', 'state', 'is_verified', 'created_by', 'created_at']
     list_filter = ['is_verified', 'created_at']
     search_fields = ['name', 'city', 'state', 'created_by__username']
@@ -168,7 +176,7 @@ class HotSpotAdmin(admin.ModelAdmin):
 
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(ApproximateCountAdmin):
     list_display = ['title', 'event_type', 'organizer', 'start_date', 'end_date', 'is_active', 'is_public']
     list_filter = ['event_type', 'is_active', 'is_public', 'start_date']
     search_fields = ['title', 'description', 'organizer__username']
@@ -177,8 +185,31 @@ class EventAdmin(admin.ModelAdmin):
 
 
 @admin.register(EventParticipant)
-class EventParticipantAdmin(admin.ModelAdmin):
+class EventParticipantAdmin(ApproximateCountAdmin):
     list_display = ['event', 'user', 'is_confirmed', 'registration_date']
     list_filter = ['is_confirmed', 'registration_date']
     search_fields = ['event__title', 'user__username']
-    readonly_fields = ['registration_date'] 
\ No newline at end of file
+    readonly_fields = ['registration_date'] 
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(ApproximateCountAdmin):
+    list_display = ['subject', 'status', 'attempts', 'created_at', 'sent_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['subject', 'to']
+    readonly_fields = ['created_at', 'sent_at', 'lease_token']
+
+
+@admin.register(OutboundSMS)
+class OutboundSMSAdmin(ApproximateCountAdmin):
+    list_display = ['to', 'status', 'provider', 'attempts', 'created_at', 'sent_at']
+    list_filter = ['status', 'provider', 'created_at']
+    search_fields = ['to', 'provider_message_id']
+    readonly_fields = ['created_at', 'sent_at', 'lease_token']
+
+
+@admin.register(StripeWebhookEvent)
+class StripeWebhookEventAdmin(ApproximateCountAdmin):
+    list_display = ['event_id', 'event_type', 'endpoint', 'status', 'attempts', 'received_at', 'processed_at']
+    list_filter = ['status', 'endpoint', 'event_type']
+    search_fields = ['event_id', 'object_id']
+    readonly_fields = ['received_at', 'processed_at', 'lease_token']
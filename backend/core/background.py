@@ -0,0 +1,150 @@
+"""
+Background Workers for CalloutRacing Application
+
+This module provides a small in-process worker used to drain database-backed
+queues (outbound email, SMS, ...) off the request path.
+
+How queued work gets picked up is controlled by settings.BACKGROUND_WORKER_MODE:
+- 'thread': a daemon thread per process, woken when the enqueuing transaction commits
+- 'inline': drain synchronously when the enqueuing transaction commits (tests/dev)
+- 'external': nothing runs in-process; a `manage.py` worker command drains the queue
+"""
+
+import logging
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# A claimed row becomes eligible again if its worker dies mid-delivery
+LEASE_SECONDS = 300
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+
+
+def retry_delay(attempts):
+    """Exponential backoff for the given attempt number, capped at RETRY_MAX_SECONDS."""
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * (2 ** (attempts - 1)), RETRY_MAX_SECONDS))
+
+
+def claim_due(model, batch_size):
+    """
+    Lease up to batch_size due rows of an outbox model to this worker.
+
+    The model needs status, next_attempt_at and lease_token fields.
+
+    Returns:
+        list: The claimed rows, oldest first
+    """
+    now = timezone.now()
+    due_ids = list(
+        model.objects.filter(status='pending', next_attempt_at__lte=now)
+        .order_by('next_attempt_at')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    if not due_ids:
+        return []
+
+    # The next_attempt_at condition makes the claim atomic per row: a second
+    # worker racing for the same ids updates nothing
+    token = uuid.uuid4()
+    model.objects.filter(
+        id__in=due_ids, status='pending', next_attempt_at__lte=now
+    ).update(lease_token=token, next_attempt_at=now + timedelta(seconds=LEASE_SECONDS))
+    return list(model.objects.filter(lease_token=token).order_by('id'))
+
+
+class BackgroundWorker:
+    """Drain a queue in the background whenever new work is committed."""
+
+    def __init__(self, name, drain, poll_interval=30):
+        """
+        Args:
+            name: Thread name, used in logs
+            drain: Callable that processes all currently due work
+            poll_interval: Seconds between drains when nothing wakes the worker,
+                so retries scheduled for later are still picked up
+        """
+        self.name = name
+        self.drain = drain
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def notify(self):
+        """Schedule a drain once the current transaction commits."""
+        transaction.on_commit(self._dispatch)
+
+    def start(self):
+        """Run the worker thread on its poll interval, without waiting for notify()."""
+        self._ensure_thread()
+
+    def _dispatch(self):
+        mode = getattr(settings, 'BACKGROUND_WORKER_MODE', 'thread')
+        if mode == 'inline':
+            self._drain_safely()
+        elif mode == 'thread':
+            self._ensure_thread()
+            self._wakeup.set()
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            self._drain_safely()
+            # Threads don't go through the request cycle, so clean up connections here
+            close_old_connections()
+
+    def _drain_safely(self):
+        try:
+            self.drain()
+        except Exception as e:
+            logger.exception(f"{self.name} worker failed: {str(e)}")
+
+    def run_forever(self):
+        """Drain in a loop in the current process (used by worker commands)."""
+        while True:
+            self._drain_safely()
+            close_old_connections()
+            time.sleep(self.poll_interval)
+
+
+def purge_finished(model, retention_hours, batch_size=1000):
+    """
+    Bulk-delete sent and failed outbox rows queued more than retention_hours ago.
+
+    Outbox bodies hold password reset links and OTP codes, so finished rows
+    aren't kept around. Deleting in batches keeps each statement's lock short.
+
+    Args:
+        model: Outbox model with status and created_at fields
+        retention_hours: How long finished rows are kept
+        batch_size: Rows deleted per statement
+
+    Returns:
+        int: Number of rows deleted
+    """
+    cutoff = timezone.now() - timedelta(hours=retention_hours)
+    finished = model.objects.filter(status__in=['sent', 'failed'], created_at__lt=cutoff).order_by()
+
+    deleted = 0
+    while True:
+        ids = list(finished.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        count, _ = model.objects.filter(id__in=ids).delete()
+        deleted += count
+    return deleted
@@ -0,0 +1,152 @@
+"""
+API Benchmark Suite for CalloutRacing Application
+
+Drives the hot read endpoints in-process through the Django test client
+and compares the results with a stored baseline:
+- Each endpoint is requested `warmup` times (filling caches), then
+  `iterations` times while recording latency, query count and response
+  size
+- Results hold p50/p95 latency in milliseconds, queries per request and
+  bytes per request
+- `compare` reports every metric that got worse than the baseline by
+  more than the allowed fraction; query counts are deterministic, so any
+  increase counts
+
+Run with `python manage.py benchmark_api`, which seeds a dataset with
+core.seeding first.
+"""
+
+import json
+import math
+import time
+from collections import namedtuple
+
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+Endpoint = namedtuple('Endpoint', ['name', 'path', 'params', 'authenticated'])
+
+ENDPOINTS = [
+    Endpoint('feed', '/api/social/feed/', {}, True),
+    Endpoint('global', '/api/social/global/', {}, True),
+    Endpoint('trending', '/api/social/trending/', {}, True),
+    Endpoint('callouts', '/api/racing/callouts/', {}, True),
+    Endpoint('marketplace', '/api/marketplace/', {}, False),
+    Endpoint('hotspots-nearby', '/api/hotspots/nearby/', {'lat': '34.05', 'lng': '-118.24', 'radius': '25'}, False),
+    Endpoint('callout-stats', '/api/racing/stats/', {}, True),
+]
+
+# Metrics compared against the baseline; query counts are exact
+TIMED_METRICS = ('p50_ms', 'p95_ms', 'bytes')
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def _response_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def measure(client, endpoint, iterations, warmup):
+    """
+    Benchmark one endpoint.
+
+    Returns:
+        dict: p50_ms, p95_ms, queries, bytes and status of the last response
+    """
+    for _ in range(warmup):
+        client.get(endpoint.path, endpoint.params)
+
+    timings, queries, sizes = [], [], []
+    status = None
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(endpoint.path, endpoint.params)
+            size = _response_size(response)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured))
+        sizes.append(size)
+        status = response.status_code
+
+    return {
+        'p50_ms': round(percentile(timings, 0.5), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'queries': round(sum(queries) / iterations, 2),
+        'bytes': round(sum(sizes) / iterations),
+        'status': status,
+    }
+
+
+def run_suite(user, iterations=50, warmup=5, endpoints=None):
+    """
+    Benchmark the endpoints, authenticated endpoints as `user`.
+
+    Args:
+        user: User to log in as for endpoints that need authentication
+        iterations: Measured requests per endpoint
+        warmup: Unmeasured requests per endpoint made first
+        endpoints: Endpoint names to run (default: all)
+
+    Returns:
+        dict: Endpoint name -> measure() result
+    """
+    # Server errors are recorded as their status instead of aborting the run
+    anonymous = Client(raise_request_exception=False)
+    authenticated = Client(raise_request_exception=False)
+    authenticated.force_login(user)
+
+    results = {}
+    # The test client's host isn't in ALLOWED_HOSTS outside the test runner
+    with override_settings(ALLOWED_HOSTS=['testserver']):
+        for endpoint in ENDPOINTS:
+            if endpoints and endpoint.name not in endpoints:
+                continue
+            client = authenticated if endpoint.authenticated else anonymous
+            results[endpoint.name] = measure(client, endpoint, iterations, warmup)
+    return results
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Regressions of results against a baseline.
+
+    Args:
+        results: run_suite() output
+        baseline: run_suite() output recorded earlier
+        threshold: Allowed relative slowdown/growth, e.g. 0.2 for 20%
+
+    Returns:
+        list: Human-readable regressions; empty when nothing regressed
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if current['status'] != previous['status']:
+            regressions.append(f"{name}: status {previous['status']} -> {current['status']}")
+        if current['queries'] > previous['queries']:
+            regressions.append(f"{name}: queries {previous['queries']} -> {current['queries']}")
+        for metric in TIMED_METRICS:
+            if previous[metric] and current[metric] > previous[metric] * (1 + threshold):
+                change = current[metric] / previous[metric] - 1
+                regressions.append(f"{name}: {metric} {previous[metric]} -> {current[metric]} (+{change:.0%})")
+    return regressions
+
+
+def load_baseline(path):
+    with open(path) as baseline:
+        return json.load(baseline)['results']
+
+
+def save_baseline(path, results, **meta):
+    with open(path, 'w') as baseline:
+        json.dump({**meta, 'results': results}, baseline, indent=2, sort_keys=True)
+        baseline.write('\n')
@@ -0,0 +1,114 @@
+"""
+Block Lists for CalloutRacing Application
+
+Who a user must not see, read from a cached per-user block set:
+- One cache entry per user holds both directions: the ids the user
+  blocked and the ids that blocked the user, loaded with one query
+- Feed, search and callout querysets apply the union with
+  `exclude_blocked`, a single NOT IN on the author (or user) column
+  instead of a Block subquery per request
+- Within one request the sets are memoized on the request
+- Blocking and unblocking drop both users' entries; see core.signals
+"""
+
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from .models.social import Block
+
+
+class BlockSet(namedtuple('BlockSet', ['blocking', 'blocked_by'])):
+    """Ids a user blocked and ids that blocked the user."""
+    __slots__ = ()
+
+    @property
+    def hidden(self):
+        """Everyone on either side of a block with the user."""
+        return self.blocking | self.blocked_by
+
+
+EMPTY = BlockSet(blocking=frozenset(), blocked_by=frozenset())
+
+
+def _cache_key(user_id):
+    return f"blocks:{user_id}"
+
+
+def _load(user_id):
+    blocking, blocked_by = set(), set()
+    rows = Block.objects.filter(Q(blocker_id=user_id) | Q(blocked_id=user_id)).values_list('blocker_id', 'blocked_id')
+    for blocker_id, blocked_id in rows:
+        if blocker_id == user_id:
+            blocking.add(blocked_id)
+        else:
+            blocked_by.add(blocker_id)
+    return BlockSet(blocking=frozenset(blocking), blocked_by=frozenset(blocked_by))
+
+
+def block_set(user_id):
+    """
+    A user's block set, cached.
+
+    Args:
+        user_id: User id (None for anonymous users, who get EMPTY)
+
+    Returns:
+        BlockSet: Ids blocked by the user and ids blocking the user
+    """
+    if user_id is None:
+        return EMPTY
+    key = _cache_key(user_id)
+    blocks = cache.get(key)
+    if blocks is None:
+        blocks = _load(user_id)
+        cache.set(key, blocks, getattr(settings, 'BLOCK_CACHE_TIMEOUT', 3600))
+    return blocks
+
+
+def for_request(request):
+    """block_set() for request.user, memoized on the request."""
+    blocks = getattr(request, '_block_set', None)
+    if blocks is None:
+        user = getattr(request, 'user', None)
+        blocks = block_set(user.pk if user is not None and user.is_authenticated else None)
+        request._block_set = blocks
+    return blocks
+
+
+def is_blocked(user_a_id, user_b_id):
+    """Whether either user has blocked the other."""
+    return user_b_id in block_set(user_a_id).hidden
+
+
+def exclude_blocked(queryset, request, field='author'):
+    """
+    Drop rows whose `field` user is on either side of a block with request.user.
+
+    Args:
+        queryset: Queryset to filter
+        request: Current request (anonymous users see everything)
+        field: Lookup path of the user column, e.g. 'author', 'challenger' or 'id'
+
+    Returns:
+        QuerySet: The filtered queryset (unchanged when nothing is blocked)
+    """
+    hidden = for_request(request).hidden
+    if not hidden:
+        return queryset
+    return queryset.exclude(**{f'{field}__in': sorted(hidden)})
+
+
+def invalidate(blocker_id, blocked_id):
+    """
+    Drop both users' cached block sets.
+
+    Deletes now and again after the surrounding transaction commits, so a
+    request that reads the old rows in between can't re-cache stale data.
+    """
+    keys = [_cache_key(blocker_id), _cache_key(blocked_id)]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,38 @@
+"""
+System Checks for CalloutRacing Application
+
+This module registers Django system checks for deployment settings:
+- The default cache must be shared between workers outside DEBUG, since
+  token revocation and rate limiting state live there
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+# Cache backends whose contents are private to a single process
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Refuse a process-local default cache outside DEBUG.
+
+    A token revoked (logout, password reset, deactivation) in one worker
+    would otherwise stay valid in every other worker.
+
+    Returns:
+        list: Check messages, empty when the cache is shared
+    """
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+
+    message = 'The default cache is process-local, so token revocation and rate limits are not shared between workers.'
+    hint = 'Set REDIS_URL to a Redis instance reachable by every worker.'
+    if settings.DEBUG:
+        return [Warning(message, hint=hint, id='core.W001')]
+    return [Error(message, hint=hint, id='core.E001')]
@@ -0,0 +1,120 @@
+"""
+Row Counts for CalloutRacing Application
+
+Fast, cached row counts for dashboards, analytics and admin changelists:
+- On PostgreSQL an unfiltered count reads the planner's estimate from
+  pg_class.reltuples, and a filtered count reads the row estimate from
+  EXPLAIN, instead of running COUNT(*) over the table
+- Estimates below APPROXIMATE_COUNT_THRESHOLD are replaced by an exact
+  COUNT(*), which is cheap at that size and avoids showing "about 3"
+  for small tables
+- Other databases (SQLite locally) always count exactly
+- Every result is cached for COUNT_CACHE_TIMEOUT seconds
+
+Use `count()` in views and `ApproximateCountPaginator` in ModelAdmins.
+"""
+
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+
+def _threshold():
+    return getattr(settings, 'APPROXIMATE_COUNT_THRESHOLD', 10000)
+
+
+def _cache_key(queryset):
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.md5(f"{queryset.db}:{sql}:{params!r}".encode('utf-8')).hexdigest()
+    return f"counts:{queryset.model._meta.db_table}:{digest}"
+
+
+def _table_estimate(queryset):
+    """Planner's row estimate for the whole table, or None when it has none yet."""
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 (PostgreSQL 14+) or 0 for a table never analyzed
+    return row[0] if row and row[0] > 0 else None
+
+
+def _plan_estimate(queryset):
+    """Row estimate of the query's plan."""
+    plan = json.loads(queryset.explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimate(queryset):
+    """
+    Planner row estimate for a queryset.
+
+    Args:
+        queryset: Any queryset
+
+    Returns:
+        int or None: The estimate, or None when the database can't provide one
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    try:
+        if not queryset.query.where and not queryset.query.is_sliced and not queryset.query.distinct:
+            return _table_estimate(queryset)
+        return _plan_estimate(queryset)
+    except (DatabaseError, KeyError, IndexError, ValueError):
+        logger.warning(f"Row estimate failed for {queryset.model._meta.label}; counting exactly")
+        return None
+
+
+def count(queryset, exact=False):
+    """
+    Cached row count of a queryset, approximate for large PostgreSQL tables.
+
+    Args:
+        queryset: The queryset to count (a model's manager also works)
+        exact: Always run COUNT(*); the result is still cached
+
+    Returns:
+        int: The row count
+    """
+    queryset = queryset.all()
+    try:
+        key = _cache_key(queryset) + (':exact' if exact else '')
+    except EmptyResultSet:
+        # .none() or an empty __in list: there's no SQL to key on, and it matches nothing
+        return 0
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    value = None if exact else estimate(queryset)
+    if value is None or value < _threshold():
+        value = queryset.count()
+    cache.set(key, value, getattr(settings, 'COUNT_CACHE_TIMEOUT', 60))
+    return value
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Paginator whose total comes from count(), for admin changelists on large tables.
+
+    Pair it with `show_full_result_count = False` so the changelist doesn't
+    run a second, unfiltered COUNT(*).
+    """
+
+    @cached_property
+    def count(self):
+        if hasattr(self.object_list, 'query'):
+            return count(self.object_list)
+        return super().count
@@ -0,0 +1,213 @@
+"""
+Outbound Email Queue for CalloutRacing Application
+
+Emails are rendered once, stored as OutboundEmail rows and delivered by a
+background worker instead of inside the request:
+- Batches of due emails are claimed with a lease so several workers never
+  send the same email twice
+- Each drain reuses one SMTP connection for every email it sends
+- Failed deliveries are retried with exponential backoff
+- queue_stats() reports queue depth and delivery latency
+- Sent and failed emails (reset and verification links) are deleted after
+  settings.OUTBOX_RETENTION_HOURS by `python manage.py purge_outbox`
+
+Run a dedicated worker with `python manage.py process_email_queue --loop`
+when BACKGROUND_WORKER_MODE is 'external'.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import Count
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .background import BackgroundWorker, claim_due, purge_finished, retry_delay
+from .models.outbox import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+def enqueue_email(subject, recipient_list, message, html_message='', from_email=None):
+    """
+    Queue an already rendered email for background delivery.
+
+    Args:
+        subject: Email subject
+        recipient_list: List of recipient addresses
+        message: Plain text body
+        html_message: Optional HTML alternative
+        from_email: Sender, defaults to settings.DEFAULT_FROM_EMAIL
+
+    Returns:
+        OutboundEmail: The queued email
+    """
+    email = OutboundEmail.objects.create(
+        subject=subject,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(recipient_list),
+        body=message,
+        html_body=html_message or '',
+    )
+    email_worker.notify()
+    return email
+
+
+def enqueue_templated_email(subject, recipient_list, template_name, context):
+    """
+    Render `<template_name>.txt` and `<template_name>.html` once and queue them.
+
+    Args:
+        subject: Email subject
+        recipient_list: List of recipient addresses
+        template_name: Template path without extension, e.g. 'emails/welcome_email'
+        context: Template context
+
+    Returns:
+        OutboundEmail: The queued email
+    """
+    return enqueue_email(
+        subject=subject,
+        recipient_list=recipient_list,
+        message=render_to_string(f'{template_name}.txt', context),
+        html_message=render_to_string(f'{template_name}.html', context),
+    )
+
+
+def _send(connection, email):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.to,
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+    message.send(fail_silently=False)
+
+
+def deliver_pending_emails(batch_size=None):
+    """
+    Deliver every due email over a single reused connection.
+
+    Args:
+        batch_size: Emails claimed per round trip, defaults to settings.EMAIL_QUEUE_BATCH_SIZE
+
+    Returns:
+        dict: {'sent': int, 'retried': int, 'failed': int}
+    """
+    batch_size = batch_size or getattr(settings, 'EMAIL_QUEUE_BATCH_SIZE', 50)
+    max_attempts = getattr(settings, 'EMAIL_QUEUE_MAX_ATTEMPTS', 5)
+    results = {'sent': 0, 'retried': 0, 'failed': 0}
+    connection = None
+    start = time.perf_counter()
+
+    try:
+        while True:
+            batch = claim_due(OutboundEmail, batch_size)
+            if not batch:
+                break
+
+            for email in batch:
+                email.attempts += 1
+                try:
+                    if connection is None:
+                        connection = get_connection(fail_silently=False)
+                        connection.open()
+                    _send(connection, email)
+                except Exception as e:
+                    # Start from a fresh connection for the next email
+                    if connection is not None:
+                        try:
+                            connection.close()
+                        except Exception:
+                            pass
+                        connection = None
+
+                    email.last_error = str(e)
+                    if email.attempts >= max_attempts:
+                        email.status = 'failed'
+                        results['failed'] += 1
+                        logger.error(f"Giving up on email {email.id} after {email.attempts} attempts: {str(e)}")
+                    else:
+                        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+                        results['retried'] += 1
+                        logger.warning(f"Email {email.id} delivery failed (attempt {email.attempts}), retrying: {str(e)}")
+                else:
+                    email.status = 'sent'
+                    email.sent_at = timezone.now()
+                    email.last_error = ''
+                    results['sent'] += 1
+
+                email.lease_token = None
+                email.save(update_fields=[
+                    'attempts', 'status', 'sent_at', 'last_error', 'next_attempt_at', 'lease_token',
+                ])
+    finally:
+        if connection is not None:
+            connection.close()
+
+    if any(results.values()):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"Email queue drained in {elapsed_ms:.0f} ms: "
+            f"{results['sent']} sent, {results['retried']} retried, {results['failed']} failed"
+        )
+    return results
+
+
+def queue_stats(sample_size=1000):
+    """
+    Report queue depth and delivery latency.
+
+    Args:
+        sample_size: Number of most recently sent emails used for latency percentiles
+
+    Returns:
+        dict: Counts per status plus p50/p95/max queue-to-delivery latency in ms
+    """
+    stats = {status: 0 for status, _ in OutboundEmail.STATUS_CHOICES}
+    for row in OutboundEmail.objects.values('status').annotate(total=Count('id')):
+        stats[row['status']] = row['total']
+
+    recent = OutboundEmail.objects.filter(status='sent').only('created_at', 'sent_at').order_by('-sent_at')
+    latencies = sorted(
+        (email.sent_at - email.created_at).total_seconds() * 1000
+        for email in recent[:sample_size]
+    )
+
+    def percentile(p):
+        if not latencies:
+            return None
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 1)
+
+    stats.update({
+        'latency_p50_ms': percentile(0.50),
+        'latency_p95_ms': percentile(0.95),
+        'latency_max_ms': round(latencies[-1], 1) if latencies else None,
+    })
+    return stats
+
+
+def purge_finished_emails(retention_hours=None, batch_size=1000):
+    """
+    Delete sent and failed emails older than the retention window.
+
+    Args:
+        retention_hours: Defaults to settings.OUTBOX_RETENTION_HOURS
+        batch_size: Rows deleted per statement
+
+    Returns:
+        int: Number of emails deleted
+    """
+    if retention_hours is None:
+        retention_hours = getattr(settings, 'OUTBOX_RETENTION_HOURS', 24)
+    deleted = purge_finished(OutboundEmail, retention_hours, batch_size)
+    if deleted:
+        logger.info(f"Purged {deleted} finished emails")
+    return deleted
+
+
+email_worker = BackgroundWorker('email-queue', deliver_pending_emails)
@@ -6,11 +6,12 @@ This module handles sending various types of emails including:
 - Welcome emails
 - Password reset emails
 - Notification emails
+
+Emails are rendered here and handed to core.email_queue, so callers return
+without waiting on SMTP; "sent" below means queued for delivery.
 """
 
 import logging
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
 from django.utils import timezone
 from django.conf import settings
 from datetime import timedelta
@@ -21,6 +22,7 @@ logger = logging.getLogger(__name__)
 
 User = get_user_model()
 from core.models.auth import UserProfile
+from core.email_queue import enqueue_templated_email
 
 
 def send_email_verification(user):
@@ -41,31 +43,28 @@ def send_email_verification(user):
         profile.email_verification_token = uuid.uuid4()
         profile.email_verification_sent_at = timezone.now()
         profile.email_verification_expires_at = timezone.now() + timedelta(hours=24)
-        profile.save()
+        profile.save(update_fields=[
+            'email_verification_token', 'email_verification_sent_at',
+            'email_verification_expires_at', 'updated_at',
+        ])
         
         # Build verification URL
         verification_url = f"{settings.FRONTEND_URL}/verify-email/{profile.email_verification_token}"
         
-        # Render email template
+        # Render and queue email
         context = {
             'user': user,
             'verification_url': verification_url,
         }
         
-        html_message = render_to_string('emails/email_verification.html', context)
-        plain_message = render_to_string('emails/email_verification.txt', context)
-        
-        # Send email
-        send_mail(
+        enqueue_templated_email(
             subject='Verify Your Email - CalloutRacing',
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[user.email],
-            html_message=html_message,
-            fail_silently=False,
+            template_name='emails/email_verification',
+            context=context,
         )
         
-        logger.info(f"Email verification sent to {user.email}")
+        logger.info(f"Email verification queued for {user.email}")
         return True
         
     except Exception as e:
@@ -85,27 +84,21 @@ def send_welcome_email(user):
         app_url = f"{settings.FRONTEND_URL}/app"
         help_url = f"{settings.FRONTEND_URL}/help"
         
-        # Render email template
+        # Render and queue email
         context = {
             'user': user,
             'app_url': app_url,
             'help_url': help_url,
         }
         
-        html_message = render_to_string('emails/welcome_email.html', context)
-        plain_message = render_to_string('emails/welcome_email.txt', context)
-        
-        # Send email
-        send_mail(
+        enqueue_templated_email(
             subject='Welcome to CalloutRacing! 🏁',
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[user.email],
-            html_message=html_message,
-            fail_silently=False,
+            template_name='emails/welcome_email',
+            context=context,
         )
         
-        logger.info(f"Welcome email sent to {user.email}")
+        logger.info(f"Welcome email queued for {user.email}")
         return True
         
     except Exception as e:
@@ -137,7 +130,10 @@ def verify_email_token(token):
         profile.email_verification_token = None
         profile.email_verification_sent_at = None
         profile.email_verification_expires_at = None
-        profile.save()
+        profile.save(update_fields=[
+            'email_verified', 'email_verification_token', 'email_verification_sent_at',
+            'email_verification_expires_at', 'updated_at',
+        ])
         
         # Send welcome email
         send_welcome_email(user)
@@ -197,7 +193,7 @@ def send_password_reset_email(user):
         user: User instance to send password reset email to
         
     Returns:
-        bool: True if email sent successfully, False otherwise
+        bool: True if email queued successfully, False otherwise
     """
     try:
         profile = user.profile
@@ -206,31 +202,28 @@ def send_password_reset_email(user):
         profile.password_reset_token = uuid.uuid4()
         profile.password_reset_expires_at = timezone.now() + timedelta(hours=1)
         profile.password_reset_sent_at = timezone.now()
-        profile.save()
+        profile.save(update_fields=[
+            'password_reset_token', 'password_reset_expires_at',
+            'password_reset_sent_at', 'updated_at',
+        ])
         
         # Build reset URL
         reset_url = f"{settings.FRONTEND_URL}/reset-password/{profile.password_reset_token}"
         
-        # Render email template
+        # Render and queue email
         context = {
             'user': user,
             'reset_url': reset_url,
         }
         
-        html_message = render_to_string('emails/password_reset.html', context)
-        plain_message = render_to_string('emails/password_reset.txt', context)
-        
-        # Send email
-        send_mail(
+        enqueue_templated_email(
             subject='Reset Your Password - CalloutRacing',
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[user.email],
-            html_message=html_message,
-            fail_silently=False,
+            template_name='emails/password_reset',
+            context=context,
         )
         
-        logger.info(f"Password reset email sent to {user.email}")
+        logger.info(f"Password reset email queued for {user.email}")
         return True
         
     except Exception as e:
@@ -290,11 +283,18 @@ def reset_password_with_token(token, new_password):
         user.set_password(new_password)
         user.save()
         
+        # Tokens issued before the reset must stop working
+        from core.token_service import revoke_all_for_user
+        revoke_all_for_user(user)
+        
         # Clear reset token
         profile.password_reset_token = None
         profile.password_reset_expires_at = None
         profile.password_reset_sent_at = None
-        profile.save()
+        profile.save(update_fields=[
+            'password_reset_token', 'password_reset_expires_at',
+            'password_reset_sent_at', 'updated_at',
+        ])
         
         logger.info(f"Password reset successfully for user {user.email}")
         return True, user, "Password reset successfully. You can now log in with your new password."
@@ -0,0 +1,126 @@
+"""
+Subscription Entitlements for CalloutRacing Application
+
+Resolves which SUBSCRIPTION_PLANS plan a user is on and the features it
+includes:
+- The result is cached per user, so gating a request normally costs one
+  cache read and no queries
+- Within one request the result is memoized on the request, so several
+  permission checks share one lookup
+- Saving or deleting a Subscription (the Stripe webhook handlers, admin)
+  invalidates the user's entry; see core.signals
+
+Gate views with the permission classes in api.permissions.
+"""
+
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models.payments import Subscription
+
+# Subscription statuses that grant the plan's features
+ACTIVE_STATUSES = ('active', 'trialing')
+
+
+class Entitlements(namedtuple('Entitlements', ['plan', 'features', 'subscription'])):
+    """A user's plan key (None when free), its feature names and subscription summary."""
+    __slots__ = ()
+
+    @property
+    def is_subscribed(self):
+        return self.plan is not None
+
+    def has_feature(self, feature):
+        return feature in self.features
+
+    def includes_plan(self, plan):
+        """Whether the user's plan is `plan` or a higher tier (SUBSCRIPTION_PLANS order)."""
+        tiers = list(settings.SUBSCRIPTION_PLANS)
+        if self.plan not in tiers or plan not in tiers:
+            return False
+        return tiers.index(self.plan) >= tiers.index(plan)
+
+
+FREE = Entitlements(plan=None, features=frozenset(), subscription=None)
+
+
+def _cache_key(user_id):
+    return f"entitlements:{user_id}"
+
+
+def _plan_for_price(price_id):
+    for plan_key, plan in settings.SUBSCRIPTION_PLANS.items():
+        if plan.get('price_id') == price_id:
+            return plan_key
+    return None
+
+
+def _load(user_id):
+    subscription = (
+        Subscription.objects
+        .filter(user_id=user_id, status__in=ACTIVE_STATUSES)
+        .order_by('-created_at')
+        .values('id', 'status', 'stripe_price_id', 'current_period_end', 'cancel_at_period_end')
+        .first()
+    )
+    if subscription is None:
+        return FREE
+
+    plan = _plan_for_price(subscription.pop('stripe_price_id'))
+    features = settings.SUBSCRIPTION_PLANS.get(plan, {}).get('features', [])
+    return Entitlements(plan=plan, features=frozenset(features), subscription=subscription)
+
+
+def _timeout(entitlements):
+    timeout = getattr(settings, 'ENTITLEMENT_CACHE_TIMEOUT', 3600)
+    period_end = entitlements.subscription and entitlements.subscription['current_period_end']
+    if period_end:
+        # Re-check when the period ends in case the renewal webhook is late
+        timeout = max(1, min(timeout, int((period_end - timezone.now()).total_seconds())))
+    return timeout
+
+
+def get_entitlements(user):
+    """
+    Resolve a user's plan and features.
+
+    Args:
+        user: User instance (anonymous users get FREE)
+
+    Returns:
+        Entitlements: The user's entitlements
+    """
+    if not user or not user.is_authenticated:
+        return FREE
+
+    key = _cache_key(user.pk)
+    entitlements = cache.get(key)
+    if entitlements is None:
+        entitlements = _load(user.pk)
+        cache.set(key, entitlements, _timeout(entitlements))
+    return entitlements
+
+
+def for_request(request):
+    """get_entitlements() for request.user, memoized on the request."""
+    entitlements = getattr(request, '_entitlements', None)
+    if entitlements is None:
+        entitlements = get_entitlements(request.user)
+        request._entitlements = entitlements
+    return entitlements
+
+
+def invalidate(user_id):
+    """
+    Drop a user's cached entitlements.
+
+    Deletes now and again after the surrounding transaction commits, so a
+    request that reads the old row in between can't re-cache stale data.
+    """
+    key = _cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,329 @@
+"""
+Event Calendar for CalloutRacing Application
+
+Cached event calendars for the events API:
+- Events are bucketed by start date into per-day and per-ISO-week buckets
+  for each scope: 'all' (active events), 'track:<id>' and 'user:<id>'
+  (events a user organizes or has joined)
+- Range queries read whole weeks and the leftover days from the cache and
+  fill every missing bucket with one query
+- Creating, updating or deleting an event moves the calendar to a new
+  cache version; joining or leaving only moves that user's version
+- Buckets hold EventSerializer output with organizer and track as ids;
+  participants_count (which changes with every join) and the nested
+  organizer and track are filled in live by one primary-key query, so
+  the calendar isn't invalidated by joins or user/track edits
+- The iCalendar feed renders each event once per update and streams the
+  cached VEVENT blocks
+
+Warm the upcoming buckets with `python manage.py warm_event_calendar`.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models.racing import Event
+
+VERSION_KEY = 'calendar:version'
+MAX_RANGE_DAYS = 366
+UPCOMING_DAYS = 90
+
+
+# Scopes ---------------------------------------------------------------------
+
+def _scope_filter(scope):
+    if scope == 'all':
+        return Q(is_active=True)
+    kind, _, object_id = scope.partition(':')
+    if kind == 'track':
+        return Q(is_active=True, track_id=int(object_id))
+    if kind == 'user':
+        return Q(organizer_id=int(object_id)) | Q(participants__user_id=int(object_id))
+    raise ValueError(f"Unknown calendar scope: {scope}")
+
+
+def _scope_events(scope):
+    queryset = Event.objects.filter(_scope_filter(scope))
+    if scope.startswith('user:'):
+        # Joining participants can repeat an event the user also organizes
+        queryset = queryset.distinct()
+    return queryset
+
+
+def _user_version_key(user_id):
+    return f"calendar:user:{user_id}:version"
+
+
+def _versions(scope):
+    keys = [VERSION_KEY]
+    if scope.startswith('user:'):
+        keys.append(_user_version_key(scope.partition(':')[2]))
+    values = cache.get_many(keys)
+    return ':'.join(str(values.get(key, 0)) for key in keys)
+
+
+def _bump(key):
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def invalidate_calendar():
+    """Drop every cached bucket; called when an event is created, changed or deleted."""
+    _bump(VERSION_KEY)
+
+
+def invalidate_user_calendar(user_id):
+    """Drop one user's buckets; called when they join or leave an event."""
+    _bump(_user_version_key(user_id))
+
+
+# Buckets --------------------------------------------------------------------
+
+def event_summary(event):
+    """
+    Cacheable EventSerializer output for an event, with organizer and track as ids.
+
+    _with_live_fields() swaps the ids for the nested organizer and track
+    before the summaries are returned.
+    """
+    # api.serializers imports core services; import it when first used
+    from api.serializers import EventSummarySerializer
+    return dict(EventSummarySerializer(event).data)
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _split_range(start, end):
+    """(kind, first_day, days) buckets covering [start, end): whole ISO weeks where possible."""
+    buckets = []
+    day = start
+    while day < end:
+        if day.weekday() == 0 and day + timedelta(days=7) <= end:
+            buckets.append(('week', day, 7))
+            day += timedelta(days=7)
+        else:
+            buckets.append(('day', day, 1))
+            day += timedelta(days=1)
+    return buckets
+
+
+def _bucket_key(scope, version, kind, day):
+    return f"calendar:{version}:{scope}:{kind}:{day.isoformat()}"
+
+
+def _fill(scope, missing):
+    """Load every missing bucket with one query over their combined span."""
+    first = min(day for _, day, _ in missing.values())
+    last = max(day + timedelta(days=days) for _, day, days in missing.values())
+    events = (
+        _scope_events(scope)
+        .filter(start_date__gte=_day_start(first), start_date__lt=_day_start(last))
+        .order_by('start_date', 'id')
+    )
+
+    filled = {key: [] for key in missing}
+    for event in events:
+        event_day = timezone.localtime(event.start_date).date()
+        for key, (_, day, days) in missing.items():
+            if day <= event_day < day + timedelta(days=days):
+                filled[key].append(event_summary(event))
+    cache.set_many(filled, getattr(settings, 'CALENDAR_CACHE_TIMEOUT', 21600))
+    return filled
+
+
+def _with_live_fields(summaries):
+    """Add the live participant count and nested organizer/track, as EventSerializer returns them."""
+    if not summaries:
+        return []
+    from api.serializers import TrackSerializer, UserSerializer
+
+    events = Event.objects.select_related('organizer__profile', 'track').in_bulk([event['id'] for event in summaries])
+    live = []
+    for summary in summaries:
+        event = events.get(summary['id'])
+        if event is None:
+            # Deleted after the bucket was read
+            continue
+        live.append({
+            **summary,
+            'participants_count': event.participant_count,
+            'organizer': UserSerializer(event.organizer).data if event.organizer_id else None,
+            'track': TrackSerializer(event.track).data if event.track_id else None,
+        })
+    return live
+
+
+def events_between(scope, start, end, live_counts=True):
+    """
+    Events in a scope starting on or after `start` and before `end`.
+
+    Args:
+        scope: 'all', 'track:<id>' or 'user:<id>'
+        start: First date (inclusive)
+        end: Last date (exclusive); at most MAX_RANGE_DAYS after start
+        live_counts: Refresh participants_count and expand organizer/track from
+            the database; without it they stay ids
+
+    Returns:
+        list: Event summaries ordered by start date
+    """
+    if end <= start:
+        return []
+    end = min(end, start + timedelta(days=MAX_RANGE_DAYS))
+
+    version = _versions(scope)
+    buckets = {_bucket_key(scope, version, kind, day): (kind, day, days) for kind, day, days in _split_range(start, end)}
+    cached = cache.get_many(list(buckets))
+    missing = {key: bucket for key, bucket in buckets.items() if key not in cached}
+    if missing:
+        cached.update(_fill(scope, missing))
+
+    summaries = [event for key in buckets for event in cached[key]]
+    return _with_live_fields(summaries) if live_counts else summaries
+
+
+def upcoming_events(limit=10):
+    """The next `limit` active events, served from the calendar buckets."""
+    now = timezone.now()
+    today = timezone.localdate()
+    events = [
+        event for event in events_between('all', today, today + timedelta(days=UPCOMING_DAYS), live_counts=False)
+        if parse_datetime(event['start_date']) >= now
+    ]
+    if len(events) < limit:
+        # Quiet stretch: look past the cached window
+        later = (
+            Event.objects.filter(is_active=True, start_date__gte=_day_start(today + timedelta(days=UPCOMING_DAYS)))
+            .order_by('start_date')[:limit - len(events)]
+        )
+        events += [event_summary(event) for event in later]
+    return _with_live_fields(events[:limit])
+
+
+def user_events(user_id, role):
+    """
+    All of a user's events, newest first, cached until they or the calendar change.
+
+    Args:
+        user_id: User ID
+        role: 'organizer' or 'participant'
+    """
+    scope = f"user:{user_id}"
+    key = f"calendar:{_versions(scope)}:{scope}:{role}"
+    events = cache.get(key)
+    if events is None:
+        if role == 'organizer':
+            queryset = Event.objects.filter(organizer_id=user_id)
+        else:
+            queryset = Event.objects.filter(participants__user_id=user_id).distinct()
+        events = [event_summary(event) for event in queryset.order_by('-start_date')]
+        cache.set(key, events, getattr(settings, 'CALENDAR_CACHE_TIMEOUT', 21600))
+    return _with_live_fields(events)
+
+
+def warm(days=UPCOMING_DAYS, track_ids=()):
+    """
+    Precompute the buckets for the next `days` days.
+
+    Returns:
+        int: Number of events in the warmed range
+    """
+    today = timezone.localdate()
+    total = len(events_between('all', today, today + timedelta(days=days), live_counts=False))
+    for track_id in track_ids:
+        events_between(f'track:{track_id}', today, today + timedelta(days=days), live_counts=False)
+    return total
+
+
+# iCalendar ------------------------------------------------------------------
+
+def _ical_time(value):
+    return parse_datetime(value).astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _ical_text(value):
+    return (value or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def _fold(line):
+    # RFC 5545: lines longer than 75 octets continue on the next line after a space
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(encoded))
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _render_vevent(event):
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:event-{event['id']}@calloutracing",
+        f"DTSTAMP:{_ical_time(event['updated_at'])}",
+        f"DTSTART:{_ical_time(event['start_date'])}",
+        f"DTEND:{_ical_time(event['end_date'])}",
+        f"SUMMARY:{_ical_text(event['title'])}",
+        f"DESCRIPTION:{_ical_text(event['description'])}",
+        f"URL:{settings.FRONTEND_URL}/events/{event['id']}",
+        'END:VEVENT',
+    ]
+    return ''.join(_fold(line) for line in lines)
+
+
+def vevent(event):
+    """VEVENT block for an event summary, rendered once per event update."""
+    key = f"calendar:vevent:{event['id']}:{parse_datetime(event['updated_at']).timestamp()}"
+    block = cache.get(key)
+    if block is None:
+        block = _render_vevent(event)
+        cache.set(key, block, getattr(settings, 'CALENDAR_CACHE_TIMEOUT', 21600))
+    return block
+
+
+def ical_feed(scope, start, end, name='CalloutRacing Events'):
+    """
+    Stream an iCalendar feed for a scope and date range.
+
+    Yields:
+        str: Calendar header, one VEVENT block per event, then the footer
+    """
+    yield ''.join(_fold(line) for line in (
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//CalloutRacing//Events//EN',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{_ical_text(name)}',
+    ))
+    for event in events_between(scope, start, end, live_counts=False):
+        yield vevent(event)
+    yield 'END:VCALENDAR\r\n'
+
+
+def parse_range(start, end, default_days=31):
+    """
+    Parse ?start=&end= ISO dates, defaulting to the next `default_days` days.
+
+    Returns:
+        tuple: (start date, end date), or None if either value is invalid
+    """
+    try:
+        start = date.fromisoformat(start) if start else timezone.localdate()
+        end = date.fromisoformat(end) if end else start + timedelta(days=default_days)
+    except ValueError:
+        return None
+    return start, end
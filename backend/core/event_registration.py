@@ -0,0 +1,85 @@
+"""
+Event Registration for CalloutRacing Application
+
+Race-safe registration for capped events:
+- A join first reserves a place with one conditional UPDATE
+  (participant_count + 1 where participant_count < max_participants), so
+  concurrent joins can't all pass the same capacity check; a full event
+  rejects the join without inserting anything
+- A user who is already registered is told so before the capacity check,
+  so rejoining a full event isn't reported as "full"; the (event, user)
+  unique constraint turns a racing duplicate join into IntegrityError,
+  which releases the reservation
+- Participants created or deleted any other way keep participant_count in
+  step through the signals in core.signals
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+
+from .models.racing import Event, EventParticipant
+
+ALREADY_REGISTERED = 'already_registered'
+EVENT_FULL = 'full'
+
+
+class _Rejected(Exception):
+    def __init__(self, reason):
+        self.reason = reason
+
+
+def has_capacity():
+    """Condition on Event rows with a free place (no limit counts as free)."""
+    return (
+        Q(max_participants__isnull=True) | Q(max_participants=0)
+        | Q(participant_count__lt=F('max_participants'))
+    )
+
+
+def register(event, user):
+    """
+    Register a user for an event unless it's full.
+
+    Args:
+        event: Event to join
+        user: User joining
+
+    Returns:
+        tuple: (EventParticipant or None, None or ALREADY_REGISTERED / EVENT_FULL)
+    """
+    # Read outside the reservation transaction so it still starts with its
+    # write; a duplicate join racing past this check hits the unique constraint
+    if EventParticipant.objects.filter(event=event, user=user).exists():
+        return None, ALREADY_REGISTERED
+
+    try:
+        with transaction.atomic():
+            reserved = Event.objects.filter(has_capacity(), pk=event.pk).update(
+                participant_count=F('participant_count') + 1
+            )
+            if not reserved:
+                raise _Rejected(EVENT_FULL)
+
+            participant = EventParticipant(event=event, user=user)
+            # The place is already counted; tells the post_save signal not to count it again
+            participant._counted = True
+            try:
+                with transaction.atomic():
+                    participant.save()
+            except IntegrityError:
+                raise _Rejected(ALREADY_REGISTERED)
+    except _Rejected as rejected:
+        return None, rejected.reason
+
+    return participant, None
+
+
+def unregister(event, user):
+    """
+    Remove a user's registration.
+
+    Returns:
+        bool: False if the user wasn't registered
+    """
+    deleted, _ = EventParticipant.objects.filter(event=event, user=user).delete()
+    return deleted > 0
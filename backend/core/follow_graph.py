@@ -0,0 +1,215 @@
+"""
+Follow Graph for CalloutRacing Application
+
+Cached reads of who follows whom:
+- Follower and following counts per user, cached together and loaded for
+  a whole page of users at once
+- Adjacency sets (the ids a user follows, and the ids following them),
+  cached for users with at most FOLLOW_GRAPH_MAX_SET_SIZE edges, so
+  "is following" checks are set lookups and mutual follows, followers you
+  know and suggestions are set intersections
+- Users with larger sets are answered with queries instead of caching
+  huge sets
+- Following, unfollowing and blocking (which removes follows) drop the
+  affected entries; see core.signals
+"""
+
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from .models.social import Follow
+
+FOLLOWING = 'following'
+FOLLOWERS = 'followers'
+
+# Cached in place of a set that has too many members to cache
+TOO_LARGE = 'too-large'
+
+# Followed users whose own follows are considered for suggestions
+SUGGESTION_FANOUT = 100
+
+
+def _timeout():
+    return getattr(settings, 'FOLLOW_GRAPH_CACHE_TIMEOUT', 3600)
+
+
+def _max_set_size():
+    return getattr(settings, 'FOLLOW_GRAPH_MAX_SET_SIZE', 5000)
+
+
+def _counts_key(user_id):
+    return f"follows:counts:{user_id}"
+
+
+def _set_key(kind, user_id):
+    return f"follows:{kind}:{user_id}"
+
+
+def _edges(kind, user_ids):
+    """(owner id, neighbour id) pairs for the users' following or followers."""
+    if kind == FOLLOWING:
+        return Follow.objects.filter(follower_id__in=user_ids).values_list('follower_id', 'following_id')
+    return Follow.objects.filter(following_id__in=user_ids).values_list('following_id', 'follower_id')
+
+
+def counts_for(user_ids):
+    """
+    Follower and following counts for several users.
+
+    Cached users cost nothing; the rest are counted with two grouped queries.
+
+    Args:
+        user_ids: Iterable of user ids
+
+    Returns:
+        dict: user id -> {'followers': int, 'following': int}
+    """
+    user_ids = set(user_ids)
+    cached = cache.get_many([_counts_key(user_id) for user_id in user_ids])
+    result = {}
+    missing = []
+    for user_id in user_ids:
+        value = cached.get(_counts_key(user_id))
+        if value is None:
+            missing.append(user_id)
+        else:
+            result[user_id] = {'followers': value[0], 'following': value[1]}
+
+    if missing:
+        loaded = {user_id: [0, 0] for user_id in missing}
+        followed = Follow.objects.filter(following_id__in=missing).values_list('following_id')
+        for user_id, total in followed.annotate(total=Count('id')).order_by():
+            loaded[user_id][0] = total
+        following = Follow.objects.filter(follower_id__in=missing).values_list('follower_id')
+        for user_id, total in following.annotate(total=Count('id')).order_by():
+            loaded[user_id][1] = total
+        cache.set_many({_counts_key(user_id): tuple(value) for user_id, value in loaded.items()}, _timeout())
+        result.update({user_id: {'followers': value[0], 'following': value[1]} for user_id, value in loaded.items()})
+    return result
+
+
+def counts(user_id):
+    """Follower and following counts of one user: {'followers': int, 'following': int}."""
+    return counts_for([user_id])[user_id]
+
+
+def _adjacency_many(kind, user_ids):
+    """user id -> frozenset of neighbour ids, or None when the set is too large to cache."""
+    keys = {user_id: _set_key(kind, user_id) for user_id in user_ids}
+    cached = cache.get_many(list(keys.values()))
+    sets = {}
+    missing = []
+    for user_id, key in keys.items():
+        if key in cached:
+            value = cached[key]
+            sets[user_id] = None if value == TOO_LARGE else value
+        else:
+            missing.append(user_id)
+
+    if missing:
+        loaded = {user_id: set() for user_id in missing}
+        for user_id, neighbour_id in _edges(kind, missing).iterator():
+            loaded[user_id].add(neighbour_id)
+        to_cache = {}
+        for user_id, neighbours in loaded.items():
+            if len(neighbours) > _max_set_size():
+                sets[user_id] = None
+                to_cache[keys[user_id]] = TOO_LARGE
+            else:
+                sets[user_id] = to_cache[keys[user_id]] = frozenset(neighbours)
+        cache.set_many(to_cache, _timeout())
+    return sets
+
+
+def following_ids(user_id):
+    """Ids the user follows, or None for users following too many to cache."""
+    return _adjacency_many(FOLLOWING, [user_id])[user_id]
+
+
+def follower_ids(user_id):
+    """Ids following the user, or None for users with too many followers to cache."""
+    return _adjacency_many(FOLLOWERS, [user_id])[user_id]
+
+
+def is_following(follower_id, following_id):
+    """Whether one user follows another."""
+    following = following_ids(follower_id)
+    if following is not None:
+        return following_id in following
+    return Follow.objects.filter(follower_id=follower_id, following_id=following_id).exists()
+
+
+def mutual_follows(user_id):
+    """Ids of users who follow the user and are followed back."""
+    following, followers = following_ids(user_id), follower_ids(user_id)
+    if following is not None and followers is not None:
+        return following & followers
+    followed_back = Follow.objects.filter(following_id=user_id).values('follower_id')
+    return set(
+        Follow.objects.filter(follower_id=user_id, following_id__in=followed_back).values_list('following_id', flat=True)
+    )
+
+
+def followers_you_follow(viewer_id, user_id):
+    """Ids of the user's followers that the viewer follows ("mutual friends")."""
+    following, followers = following_ids(viewer_id), follower_ids(user_id)
+    if following is not None and followers is not None:
+        return following & followers
+    viewer_follows = Follow.objects.filter(follower_id=viewer_id).values('following_id')
+    return set(
+        Follow.objects.filter(following_id=user_id, follower_id__in=viewer_follows).values_list('follower_id', flat=True)
+    )
+
+
+def suggestions(user_id, limit=10, exclude=()):
+    """
+    Users to follow: those followed by the most people the user follows.
+
+    Args:
+        user_id: User to suggest for
+        limit: Number of suggestions
+        exclude: Further ids never to suggest
+
+    Returns:
+        list: User ids, best first
+    """
+    following = following_ids(user_id)
+    skip = {user_id, *exclude}
+
+    if following is None:
+        rows = (
+            Follow.objects.filter(follower_id__in=Follow.objects.filter(follower_id=user_id).values('following_id'))
+            .exclude(following_id__in=Follow.objects.filter(follower_id=user_id).values('following_id'))
+            .exclude(following_id__in=skip)
+            .values_list('following_id').annotate(total=Count('id'))
+            .order_by('-total', 'following_id')[:limit]
+        )
+        return [candidate for candidate, _ in rows]
+
+    skip |= following
+    scores = Counter()
+    for neighbours in _adjacency_many(FOLLOWING, sorted(following)[:SUGGESTION_FANOUT]).values():
+        scores.update(candidate for candidate in neighbours or () if candidate not in skip)
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return [candidate for candidate, _ in ranked[:limit]]
+
+
+def invalidate(follower_id, following_id):
+    """
+    Drop cached entries touched by a follow between two users.
+
+    Deletes now and again after the surrounding transaction commits, so a
+    request that reads the old rows in between can't re-cache stale data.
+    """
+    keys = [
+        _counts_key(follower_id),
+        _counts_key(following_id),
+        _set_key(FOLLOWING, follower_id),
+        _set_key(FOLLOWERS, following_id),
+    ]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,86 @@
+"""
+Django management command to benchmark the hot API endpoints.
+
+Seeds a deterministic dataset (core.seeding), drives the feed, trending,
+callout, marketplace, hotspot and stats endpoints in-process, and prints
+p50/p95 latency, queries and bytes per request. Everything it seeds is
+rolled back at the end.
+
+With --baseline the results are compared against a stored JSON baseline
+and the command fails when any metric regressed by more than
+--threshold; --save writes the results as the new baseline.
+
+Usage:
+    python manage.py benchmark_api
+    python manage.py benchmark_api --scale 10 --iterations 100 --save --baseline bench/api.json
+    python manage.py benchmark_api --scale 10 --baseline bench/api.json --threshold 0.25
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core import benchmarks, seeding
+
+
+class Command(BaseCommand):
+    help = 'Benchmark hot API endpoints against a seeded dataset and an optional baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1, help='Dataset size passed to core.seeding')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the dataset')
+        parser.add_argument('--iterations', type=int, default=50, help='Measured requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests per endpoint first')
+        parser.add_argument(
+            '--endpoints',
+            nargs='+',
+            choices=[endpoint.name for endpoint in benchmarks.ENDPOINTS],
+            help='Endpoints to run (default: all)',
+        )
+        parser.add_argument('--baseline', help='Path of the JSON baseline to compare with or save to')
+        parser.add_argument('--save', action='store_true', help='Write the results to --baseline')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.2,
+            help='Allowed relative regression per metric (0.2 = 20%%)',
+        )
+
+    def handle(self, *args, **options):
+        if options['save'] and not options['baseline']:
+            raise CommandError('--save needs --baseline')
+        if options['iterations'] <= 0:
+            raise CommandError('--iterations must be positive')
+
+        # Everything seeded here is rolled back at the end
+        with transaction.atomic():
+            self.stdout.write(f"🌱 Seeding at scale {options['scale']}...")
+            seeding.seed(options['scale'], options['seed'])
+            user = seeding.seeded_users().order_by('id').first()
+
+            results = benchmarks.run_suite(user, options['iterations'], options['warmup'], options['endpoints'])
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"⏱️  API benchmark (scale {options['scale']}, {options['iterations']} requests each)"
+        ))
+        for name, result in results.items():
+            self.stdout.write(
+                f"   {name:<16} p50 {result['p50_ms']:>8.2f} ms   p95 {result['p95_ms']:>8.2f} ms   "
+                f"{result['queries']:>6.1f} queries   {result['bytes']:>8} bytes   HTTP {result['status']}"
+            )
+
+        baseline = options['baseline']
+        if options['save']:
+            benchmarks.save_baseline(baseline, results, scale=options['scale'], seed=options['seed'])
+            self.stdout.write(self.style.SUCCESS(f"💾 Baseline saved to {baseline}"))
+        elif baseline:
+            if not os.path.exists(baseline):
+                raise CommandError(f'Baseline {baseline} does not exist; create it with --save')
+            regressions = benchmarks.compare(results, benchmarks.load_baseline(baseline), options['threshold'])
+            if regressions:
+                for regression in regressions:
+                    self.stdout.write(self.style.ERROR(f"   ❌ {regression}"))
+                raise CommandError(f'{len(regressions)} regression(s) beyond {options["threshold"]:.0%}')
+            self.stdout.write(self.style.SUCCESS('✅ No regressions against the baseline'))
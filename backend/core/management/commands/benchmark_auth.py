@@ -0,0 +1,99 @@
+"""
+Django management command to benchmark per-request authentication overhead.
+
+Compares session authentication (session row + user row loaded per request)
+with stateless JWT authentication (signature check + one cache lookup).
+
+Usage:
+    python manage.py benchmark_auth
+    python manage.py benchmark_auth --iterations 5000
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.request import Request
+
+from api.authentication import StatelessJWTAuthentication
+from core.models.auth import User
+from core.token_service import issue_token_pair
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-request authentication overhead (session vs JWT)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=1000,
+            help='Number of authenticated requests to simulate per mode',
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        factory = RequestFactory()
+
+        # Everything created here is rolled back at the end
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username='benchmark_auth_user',
+                email='benchmark_auth_user@example.com',
+                password='benchmark-password',
+            )
+
+            session_key = self._create_session(factory, user)
+            access = issue_token_pair(user)['access']
+
+            def session_request():
+                request = factory.get('/')
+                request.COOKIES[settings.SESSION_COOKIE_NAME] = session_key
+                SessionMiddleware(lambda r: None).process_request(request)
+                AuthenticationMiddleware(lambda r: None).process_request(request)
+                return Request(request, authenticators=[SessionAuthentication()])
+
+            def jwt_request():
+                request = factory.get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+                return Request(request, authenticators=[StatelessJWTAuthentication()])
+
+            results = [
+                ('session', self._run(session_request, iterations)),
+                ('jwt', self._run(jwt_request, iterations)),
+            ]
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS(f'🔐 Authentication overhead ({iterations} requests each)'))
+        for mode, (per_request_us, queries_per_request) in results:
+            self.stdout.write(
+                f"   {mode:<8} {per_request_us:>9.1f} µs/request   {queries_per_request:.2f} queries/request"
+            )
+
+    def _create_session(self, factory, user):
+        request = factory.get('/')
+        SessionMiddleware(lambda r: None).process_request(request)
+        request.session[SESSION_KEY] = str(user.pk)
+        request.session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        request.session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        request.session.save()
+        return request.session.session_key
+
+    def _run(self, build_request, iterations):
+        """Authenticate `iterations` requests; return (µs per request, queries per request)."""
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                request = build_request()
+                user = request.user
+                assert user.is_authenticated
+            elapsed = time.perf_counter() - start
+
+        return (elapsed / iterations) * 1_000_000, len(queries) / iterations
@@ -0,0 +1,103 @@
+"""
+Django management command to load-test event registration.
+
+Creates a throwaway capped event and users, has many threads join it at
+once through core.event_registration, reports joins per second and checks
+that the event wasn't oversold. Everything it creates is deleted afterwards.
+Run it against PostgreSQL for meaningful numbers; SQLite serializes writers.
+
+Usage:
+    python manage.py benchmark_event_joins
+    python manage.py benchmark_event_joins --joins 5000 --capacity 500 --threads 32
+"""
+
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+from django.utils import timezone
+
+from core.event_registration import EVENT_FULL, register
+from core.models.racing import Event, Track
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Load-test concurrent event joins and check capacity is never exceeded'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--joins',
+            type=int,
+            default=2000,
+            help='Number of users joining',
+        )
+        parser.add_argument(
+            '--capacity',
+            type=int,
+            default=100,
+            help='max_participants of the test event',
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=16,
+            help='Concurrent joins',
+        )
+
+    def handle(self, *args, **options):
+        joins = options['joins']
+        capacity = options['capacity']
+        threads = options['threads']
+        run_id = uuid.uuid4().hex[:8]
+
+        users = User.objects.bulk_create([
+            User(username=f'bench-{run_id}-{i}', email=f'bench-{run_id}-{i}@example.invalid')
+            for i in range(joins)
+        ])
+        track = Track.objects.create(name=f'Benchmark {run_id}', location='Benchmark', description='Benchmark')
+        event = Event.objects.create(
+            title=f'Benchmark {run_id}', description='Benchmark', event_type='race',
+            start_date=timezone.now() + timedelta(days=1), end_date=timezone.now() + timedelta(days=1, hours=1),
+            max_participants=capacity, organizer=users[0], track=track,
+        )
+
+        def join(user):
+            try:
+                while True:
+                    try:
+                        return register(event, user)[1]
+                    except OperationalError:
+                        # SQLite reports a locked database instead of waiting
+                        continue
+            finally:
+                connection.close()
+
+        try:
+            self.stdout.write(self.style.SUCCESS(
+                f'🏁 {joins} joins for {capacity} places across {threads} threads ({connection.vendor})'
+            ))
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                results = list(pool.map(join, users))
+            elapsed = time.perf_counter() - start
+
+            event.refresh_from_db()
+            registered = event.participants.count()
+            self.stdout.write(f"   {joins / elapsed:>10.0f} joins/s ({elapsed:.2f}s)")
+            self.stdout.write(f"   accepted {results.count(None)}, rejected as full {results.count(EVENT_FULL)}")
+
+            oversold = registered > capacity or event.participant_count != registered
+            style = self.style.ERROR if oversold else self.style.SUCCESS
+            self.stdout.write(style(
+                f"   {registered} registered, participant_count {event.participant_count}, capacity {capacity}"
+            ))
+        finally:
+            event.delete()
+            track.delete()
+            User.objects.filter(username__startswith=f'bench-{run_id}-').delete()
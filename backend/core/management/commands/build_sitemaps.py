@@ -0,0 +1,52 @@
+"""
+Django management command to pre-render the XML sitemaps.
+
+Only sitemap files whose content changed since the last build are
+rewritten. Run it periodically (e.g. hourly from cron or a scheduler), or
+keep it running with --loop.
+
+Usage:
+    python manage.py build_sitemaps
+    python manage.py build_sitemaps --full
+    python manage.py build_sitemaps --loop --interval 3600
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.background import BackgroundWorker
+from core.sitemaps import build_sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Pre-render chunked XML sitemaps and the sitemap index to storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rewrite every sitemap file, not just the changed ones',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and rebuild every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=3600,
+            help='Seconds between builds when running with --loop',
+        )
+
+    def handle(self, *args, **options):
+        if options['loop']:
+            self.stdout.write(self.style.SUCCESS(
+                f"🗺️  Rebuilding sitemaps every {options['interval']}s (Ctrl+C to stop)"
+            ))
+            BackgroundWorker('sitemaps', build_sitemaps, poll_interval=options['interval']).run_forever()
+            return
+
+        result = build_sitemaps(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f"🗺️  Sitemaps up to date: {result['urls']} URLs, {result['files_written']} files written"
+        ))
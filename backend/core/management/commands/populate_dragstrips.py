@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from core.models.racing import Track
+from core.seeding import upsert_by
 from django.utils import timezone
 
 
@@ -492,24 +493,14 @@ class Command(BaseCommand):
             }
         ]
 
-        created_count = 0
-        updated_count = 0
-
-        for track_data in dragstrips_data:
-            track, created = Track.objects.get_or_create(
-                name=track_data['name'],
-                defaults=track_data
-            )
-            if created:
-                created_count += 1
-                self.stdout.write(f"Created: {track_data['name']}")
-            else:
-                # Update existing track with new data
-                for key, value in track_data.items():
-                    setattr(track, key, value)
-                track.save()
-                updated_count += 1
-                self.stdout.write(f"Updated: {track_data['name']}")
+        # One lookup for every existing name, then bulk create/update
+        created, updated = upsert_by(Track, 'name', dragstrips_data)
+        for track in created:
+            self.stdout.write(f"Created: {track.name}")
+        for track in updated:
+            self.stdout.write(f"Updated: {track.name}")
+        created_count = len(created)
+        updated_count = len(updated)
 
         self.stdout.write(f"\nCreated {created_count} new dragstrips")
         self.stdout.write(f"Updated {updated_count} existing dragstrips")
@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
 from core.models import Track, Event, Callout, HotSpot, MarketplaceListing
+from core.seeding import upsert_by
 from django.utils import timezone
 from datetime import timedelta
 
@@ -94,15 +95,9 @@ class Command(BaseCommand):
             }
         ]
         
-        created_tracks = []
-        for track_data in tracks_data:
-            track, created = Track.objects.get_or_create(
-                name=track_data['name'],
-                defaults=track_data
-            )
-            if created:
-                created_tracks.append(track)
-                self.stdout.write(f"   ✅ Created: {track.name}")
+        created_tracks, _ = upsert_by(Track, 'name', tracks_data, update=False)
+        for track in created_tracks:
+            self.stdout.write(f"   ✅ Created: {track.name}")
         
         self.stdout.write(f"✅ Created {len(created_tracks)} tracks")
         
@@ -135,20 +130,13 @@ class Command(BaseCommand):
         ]
         
         created_events = []
-        for event_info in event_data:
-            track = Track.objects.first()  # Use first available track
-            if track:
-                event, created = Event.objects.get_or_create(
-                    title=event_info['title'],
-                    defaults={
-                        **event_info,
-                        'track': track,
-                        'organizer': admin_user
-                    }
-                )
-                if created:
-                    created_events.append(event)
-                    self.stdout.write(f"   ✅ Created: {event.title}")
+        track = Track.objects.first()  # Use first available track
+        if track:
+            created_events, _ = upsert_by(
+                Event, 'title', event_data, update=False, track=track, organizer=admin_user
+            )
+            for event in created_events:
+                self.stdout.write(f"   ✅ Created: {event.title}")
         
         self.stdout.write(f"✅ Created {len(created_events)} events")
         
@@ -175,21 +163,13 @@ class Command(BaseCommand):
         ]
         
         created_callouts = []
-        for callout_info in callout_data:
-            track = Track.objects.first()
-            if track:
-                callout, created = Callout.objects.get_or_create(
-                    message=callout_info['message'][:50],  # Use first 50 chars as unique identifier
-                    defaults={
-                        **callout_info,
-                        'track': track,
-                        'challenger': admin_user,
-                        'challenged': admin_user  # Self-challenge for demo
-                    }
-                )
-                if created:
-                    created_callouts.append(callout)
-                    self.stdout.write(f"   ✅ Created: {callout.message[:30]}...")
+        if track:
+            created_callouts, _ = upsert_by(
+                Callout, 'message', callout_data, update=False,
+                track=track, challenger=admin_user, challenged=admin_user  # Self-challenge for demo
+            )
+            for callout in created_callouts:
+                self.stdout.write(f"   ✅ Created: {callout.message[:30]}...")
         
         self.stdout.write(f"✅ Created {len(created_callouts)} callouts")
         
@@ -225,18 +205,9 @@ class Command(BaseCommand):
             }
         ]
         
-        created_hotspots = []
-        for hotspot_info in hotspot_data:
-            hotspot, created = HotSpot.objects.get_or_create(
-                name=hotspot_info['name'],
-                defaults={
-                    **hotspot_info,
-                    'created_by': admin_user
-                }
-            )
-            if created:
-                created_hotspots.append(hotspot)
-                self.stdout.write(f"   ✅ Created: {hotspot.name}")
+        created_hotspots, _ = upsert_by(HotSpot, 'name', hotspot_data, update=False, created_by=admin_user)
+        for hotspot in created_hotspots:
+            self.stdout.write(f"   ✅ Created: {hotspot.name}")
         
         self.stdout.write(f"✅ Created {len(created_hotspots)} hotspots")
         
@@ -9,6 +9,8 @@ import os
 import uuid
 from typing import List
 from core.models.marketplace import ListingCategory
+from core import event_calendar
+from core.seeding import bulk_insert
 
 
 class Command(BaseCommand):
@@ -244,10 +246,8 @@ class Command(BaseCommand):
         # Clear existing tracks and create new ones
         Track.objects.all().delete()  # type: ignore
         
-        created_tracks = []
-        for track_data in tracks_data:
-            track = Track.objects.create(**track_data)  # type: ignore
-            created_tracks.append(track)
+        created_tracks = [Track(**track_data) for track_data in tracks_data]
+        bulk_insert(Track, created_tracks)
         
         self.stdout.write(f'Created {len(created_tracks)} tracks')
 
@@ -394,7 +394,7 @@ class Command(BaseCommand):
             'Car Meet & Cruise'
         ]
         
-        events_created = 0
+        events = []
         
         for i in range(15):
             organizer = random.choice(users)
@@ -406,7 +406,7 @@ class Command(BaseCommand):
             start_date = timezone.now() + timedelta(days=random.randint(1, 60))
             end_date = start_date + timedelta(hours=random.randint(2, 12))
             
-            event = Event.objects.create(  # type: ignore
+            events.append(Event(
                 title=f"{title} #{i+1}",
                 description=f"Join us for an exciting {event_type} event at {track.name}! This is a sample event for testing purposes.",
                 event_type=event_type,
@@ -418,9 +418,11 @@ class Command(BaseCommand):
                 entry_fee=random.choice([0, 25, 50, 75, 100, 150]),
                 is_public=True,
                 is_active=True
-            )
-            events_created += 1
+            ))
             
+        events_created = bulk_insert(Event, events)
+        # Bulk inserts skip the signal that drops cached calendar buckets
+        event_calendar.invalidate_calendar()
         self.stdout.write(f'Created {events_created} sample events')
 
     def create_sample_callouts(self):
@@ -435,7 +437,7 @@ class Command(BaseCommand):
         race_types = ['quarter_mile', 'eighth_mile', 'roll_race', 'dig_race']
         experience_levels = ['beginner', 'intermediate', 'experienced', 'pro']
         
-        callouts_created = 0
+        callouts = []
         
         for i in range(min(20, len(users) * (len(users) - 1))):
             challenger = random.choice(users)
@@ -463,7 +465,7 @@ class Command(BaseCommand):
                 "Let's see if you can back up that talk!"
             ]
             
-            callout = Callout.objects.create(  # type: ignore
+            callouts.append(Callout(
                 challenger=challenger,
                 challenged=challenged,
                 race_type=race_type,
@@ -476,9 +478,9 @@ class Command(BaseCommand):
                 experience_level=experience_level,
                 status='pending',
                 wager_amount=random.choice([0, 50, 100, 200, 500])
-            )
-            callouts_created += 1
+            ))
             
+        callouts_created = bulk_insert(Callout, callouts)
         self.stdout.write(f'Created {callouts_created} sample callouts')
 
     def create_sample_hotspots(self):
@@ -534,15 +536,9 @@ class Command(BaseCommand):
             }
         ]
         
-        hotspots_created = 0
-        for hotspot_data in hotspots_data:
-            creator = random.choice(users)
-            
-            hotspot = HotSpot.objects.create(  # type: ignore
-                created_by=creator,
-                **hotspot_data
-            )
-            hotspots_created += 1
+        hotspots_created = bulk_insert(HotSpot, (
+            HotSpot(created_by=random.choice(users), **hotspot_data) for hotspot_data in hotspots_data
+        ))
             
         self.stdout.write(f'Created {hotspots_created} sample hotspots')
 
@@ -599,18 +595,16 @@ class Command(BaseCommand):
             obj, _ = ListingCategory.objects.get_or_create(name=name.capitalize())  # type: ignore
             category_objs[name] = obj
         
-        listings_created = 0
-        for listing_data in listings_data:
-            seller = random.choice(users)
-            category_obj = category_objs[listing_data['category']]
-            listing = MarketplaceListing.objects.create(  # type: ignore
-                seller=seller,
+        listings_created = bulk_insert(MarketplaceListing, (
+            MarketplaceListing(
+                seller=random.choice(users),
                 title=listing_data['title'],
                 description=listing_data['description'],
                 price=listing_data['price'],
-                category=category_obj,
+                category=category_objs[listing_data['category']],
                 condition=listing_data['condition']
             )
-            listings_created += 1
+            for listing_data in listings_data
+        ))
         
         self.stdout.write(f'Created {listings_created} sample marketplace listings') 
\ No newline at end of file
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from core.models import Track
 from django.db import transaction
+from core.seeding import bulk_insert
 
 
 class Command(BaseCommand):
@@ -451,11 +452,9 @@ class Command(BaseCommand):
             # Clear existing tracks
             Track.objects.all().delete()  # type: ignore
             
-            # Create new tracks
-            created_tracks = []
-            for track_data in tracks_data:
-                track = Track.objects.create(**track_data)  # type: ignore
-                created_tracks.append(track)
+            # Create new tracks in one bulk insert
+            created_tracks = [Track(**track_data) for track_data in tracks_data]
+            bulk_insert(Track, created_tracks)
                 
             self.stdout.write(
                 self.style.SUCCESS(  # type: ignore
@@ -0,0 +1,54 @@
+"""
+Django management command to deliver queued outbound email.
+
+Usage:
+    python manage.py process_email_queue
+    python manage.py process_email_queue --loop
+    python manage.py process_email_queue --stats
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.email_queue import deliver_pending_emails, email_worker, queue_stats
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbound email'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and drain the queue every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=5,
+            help='Seconds between drains when running with --loop',
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Only print queue depth and delivery latency',
+        )
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.stdout.write(self.style.SUCCESS('📬 Email queue'))
+            for key, value in queue_stats().items():
+                self.stdout.write(f"   {key}: {value}")
+            return
+
+        if options['loop']:
+            self.stdout.write(self.style.SUCCESS(
+                f"📬 Delivering queued email every {options['interval']}s (Ctrl+C to stop)"
+            ))
+            email_worker.poll_interval = options['interval']
+            email_worker.run_forever()
+            return
+
+        results = deliver_pending_emails()
+        self.stdout.write(self.style.SUCCESS(
+            f"📬 {results['sent']} sent, {results['retried']} retried, {results['failed']} failed"
+        ))
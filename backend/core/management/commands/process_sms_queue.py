@@ -0,0 +1,42 @@
+"""
+Django management command to deliver queued text messages.
+
+Usage:
+    python manage.py process_sms_queue
+    python manage.py process_sms_queue --loop
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.sms_queue import deliver_pending_sms, sms_worker
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued text messages'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and drain the queue every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=5,
+            help='Seconds between drains when running with --loop',
+        )
+
+    def handle(self, *args, **options):
+        if options['loop']:
+            self.stdout.write(self.style.SUCCESS(
+                f"📱 Delivering queued SMS every {options['interval']}s (Ctrl+C to stop)"
+            ))
+            sms_worker.poll_interval = options['interval']
+            sms_worker.run_forever()
+            return
+
+        results = deliver_pending_sms()
+        self.stdout.write(self.style.SUCCESS(
+            f"📱 {results['sent']} sent, {results['retried']} retried, {results['failed']} failed"
+        ))
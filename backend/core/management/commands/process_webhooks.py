@@ -0,0 +1,43 @@
+"""
+Django management command to process queued Stripe webhook events.
+
+Usage:
+    python manage.py process_webhooks
+    python manage.py process_webhooks --loop
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.webhook_inbox import process_webhook_events, webhook_worker
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued Stripe webhook events'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and drain the queue every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=5,
+            help='Seconds between drains when running with --loop',
+        )
+
+    def handle(self, *args, **options):
+        if options['loop']:
+            self.stdout.write(self.style.SUCCESS(
+                f"🪝 Processing Stripe webhook events every {options['interval']}s (Ctrl+C to stop)"
+            ))
+            webhook_worker.poll_interval = options['interval']
+            webhook_worker.run_forever()
+            return
+
+        results = process_webhook_events()
+        self.stdout.write(self.style.SUCCESS(
+            f"🪝 {results['processed']} processed, {results['deferred']} deferred, "
+            f"{results['retried']} retried, {results['failed']} failed"
+        ))
@@ -0,0 +1,59 @@
+"""
+Django management command to delete expired and used OTP codes.
+
+Run it periodically (e.g. hourly from cron or a scheduler), or keep it
+running with --loop.
+
+Usage:
+    python manage.py purge_otps
+    python manage.py purge_otps --retention-hours 0
+    python manage.py purge_otps --loop --interval 3600
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.background import BackgroundWorker
+from core.otp_service import OTPService
+
+
+class Command(BaseCommand):
+    help = 'Delete expired and used OTP codes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-hours',
+            type=int,
+            default=None,
+            help='Keep codes that expired less than this many hours ago (default: OTP_RETENTION_HOURS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows deleted per statement',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and purge every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=3600,
+            help='Seconds between purges when running with --loop',
+        )
+
+    def handle(self, *args, **options):
+        def purge():
+            return OTPService.purge_stale_otps(options['retention_hours'], options['batch_size'])
+
+        if options['loop']:
+            self.stdout.write(self.style.SUCCESS(
+                f"🧹 Purging stale OTPs every {options['interval']}s (Ctrl+C to stop)"
+            ))
+            BackgroundWorker('otp-sweeper', purge, poll_interval=options['interval']).run_forever()
+            return
+
+        deleted = purge()
+        self.stdout.write(self.style.SUCCESS(f"🧹 Deleted {deleted} stale OTPs"))
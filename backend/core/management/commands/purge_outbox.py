@@ -0,0 +1,65 @@
+"""
+Django management command to delete sent and failed outbound email and SMS.
+
+Queued messages carry password reset links, verification links and OTP
+codes, so finished rows are only kept for OUTBOX_RETENTION_HOURS. Run it
+periodically (e.g. hourly from cron or a scheduler), or keep it running
+with --loop.
+
+Usage:
+    python manage.py purge_outbox
+    python manage.py purge_outbox --retention-hours 0
+    python manage.py purge_outbox --loop --interval 3600
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.background import BackgroundWorker
+from core.email_queue import purge_finished_emails
+from core.sms_queue import purge_finished_sms
+
+
+class Command(BaseCommand):
+    help = 'Delete sent and failed outbound email and SMS'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-hours',
+            type=int,
+            default=None,
+            help='Keep messages queued less than this many hours ago (default: OUTBOX_RETENTION_HOURS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows deleted per statement',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and purge every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=3600,
+            help='Seconds between purges when running with --loop',
+        )
+
+    def handle(self, *args, **options):
+        def purge():
+            return (
+                purge_finished_emails(options['retention_hours'], options['batch_size']),
+                purge_finished_sms(options['retention_hours'], options['batch_size']),
+            )
+
+        if options['loop']:
+            self.stdout.write(self.style.SUCCESS(
+                f"🧹 Purging finished outbound messages every {options['interval']}s (Ctrl+C to stop)"
+            ))
+            BackgroundWorker('outbox-sweeper', purge, poll_interval=options['interval']).run_forever()
+            return
+
+        emails, sms = purge()
+        self.stdout.write(self.style.SUCCESS(f"🧹 Deleted {emails} emails and {sms} text messages"))
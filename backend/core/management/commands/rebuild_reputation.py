@@ -0,0 +1,26 @@
+"""
+Django management command to recompute reputation summaries.
+
+Reputation summaries are kept in step with ratings by signals; ratings
+changed with queryset.update() or raw SQL bypass them. This recomputes
+the summaries from the ratings themselves.
+
+Usage:
+    python manage.py rebuild_reputation
+    python manage.py rebuild_reputation --users 12 34
+"""
+
+from django.core.management.base import BaseCommand
+
+from core import reputation
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-user reputation summaries from the ratings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', nargs='+', type=int, help='User ids to rebuild (default: everyone)')
+
+    def handle(self, *args, **options):
+        total = reputation.rebuild(options['users'])
+        self.stdout.write(self.style.SUCCESS(f"⭐ Rebuilt reputation summaries for {total} users"))
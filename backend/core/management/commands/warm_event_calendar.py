@@ -0,0 +1,48 @@
+"""
+Django management command to precompute the cached event calendar.
+
+Fills the per-day and per-week buckets for the coming days, so the first
+calendar and "upcoming" requests after a deploy or an event change are
+served from cache. Run it after deploys or periodically.
+
+Usage:
+    python manage.py warm_event_calendar
+    python manage.py warm_event_calendar --days 180 --tracks
+"""
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core import event_calendar
+from core.models.racing import Event
+
+
+class Command(BaseCommand):
+    help = 'Precompute cached event calendar buckets'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=event_calendar.UPCOMING_DAYS,
+            help='Number of days ahead to precompute',
+        )
+        parser.add_argument(
+            '--tracks',
+            action='store_true',
+            help='Also precompute the calendar of every track with upcoming events',
+        )
+
+    def handle(self, *args, **options):
+        track_ids = []
+        if options['tracks']:
+            track_ids = list(
+                Event.objects.filter(is_active=True, start_date__gte=timezone.now())
+                .order_by().values_list('track_id', flat=True).distinct()
+            )
+
+        total = event_calendar.warm(options['days'], track_ids)
+        self.stdout.write(self.style.SUCCESS(
+            f"📅 Cached {total} events over the next {options['days']} days"
+            + (f" and {len(track_ids)} track calendars" if track_ids else '')
+        ))
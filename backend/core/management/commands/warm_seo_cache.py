@@ -0,0 +1,38 @@
+"""
+Django management command to precompute the cached SEO payloads.
+
+Caches the meta tags and JSON-LD of every event, track, callout, listing
+and hotspot, so crawler bursts after a deploy or a cache flush are served
+without database reads. Payloads already cached for an object's current
+version are kept.
+
+Usage:
+    python manage.py warm_seo_cache
+    python manage.py warm_seo_cache --types event track
+"""
+
+from django.core.management.base import BaseCommand
+
+from core import seo
+
+
+class Command(BaseCommand):
+    help = 'Precompute cached SEO meta tags and structured data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--types',
+            nargs='+',
+            choices=list(seo.CONTENT_TYPES),
+            help='Content types to warm (default: all)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows fetched from the database per query',
+        )
+
+    def handle(self, *args, **options):
+        total = seo.warm(options['types'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"🔎 Cached SEO payloads for {total} objects"))
@@ -0,0 +1,180 @@
+"""
+Marketplace Search for CalloutRacing Application
+
+Filtering, full-text search and facet counts for Marketplace listings:
+- filter_listings() applies the ListingViewSet query parameters
+- Text search uses PostgreSQL full-text search backed by a GIN index
+  (migration 0013); other databases fall back to icontains
+- listing_facets() counts listings per category, per condition and per
+  price bucket in one grouped query, cached per filter combination until
+  a listing changes
+"""
+
+import hashlib
+import json
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+
+# Filters that change the result set; anything else (page, ordering) is ignored for caching
+FILTER_PARAMS = ('category', 'condition', 'min_price', 'max_price', 'location', 'is_negotiable', 'seller_id', 'search')
+
+# Upper bounds of the price histogram buckets; the last bucket is open-ended
+PRICE_BUCKETS = [100, 500, 1000, 5000, 10000, 25000]
+
+SEARCH_CONFIG = 'english'
+FACET_CACHE_TIMEOUT = 300
+VERSION_KEY = 'marketplace_search:version'
+
+
+def _parse_price(value):
+    try:
+        return Decimal(str(value))
+    except (ArithmeticError, ValueError):
+        return None
+
+
+def normalize_params(params):
+    """Reduce query parameters to the filters that matter, with stable formatting."""
+    normalized = {}
+    for name in FILTER_PARAMS:
+        value = params.get(name)
+        if value is None or str(value).strip() == '':
+            continue
+        value = str(value).strip()
+        if name in ('location', 'search', 'is_negotiable'):
+            value = value.lower()
+        normalized[name] = value
+    return normalized
+
+
+def search_text(queryset, text):
+    """Full-text search on title and description."""
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchVector
+
+        # Must match the indexed expression in migration 0013 for the GIN index to be used
+        return queryset.annotate(
+            search_document=SearchVector('title', 'description', config=SEARCH_CONFIG)
+        ).filter(search_document=SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch'))
+
+    return queryset.filter(Q(title__icontains=text) | Q(description__icontains=text))
+
+
+def filter_listings(queryset, params):
+    """
+    Apply marketplace filters from request query parameters.
+
+    Args:
+        queryset: Marketplace queryset to filter
+        params: Mapping with any of FILTER_PARAMS
+
+    Returns:
+        QuerySet: The filtered queryset
+    """
+    params = normalize_params(params)
+
+    if 'category' in params:
+        queryset = queryset.filter(category=params['category'])
+
+    if 'condition' in params:
+        queryset = queryset.filter(condition=params['condition'])
+
+    min_price = _parse_price(params.get('min_price'))
+    if min_price is not None:
+        queryset = queryset.filter(price__gte=min_price)
+
+    max_price = _parse_price(params.get('max_price'))
+    if max_price is not None:
+        queryset = queryset.filter(price__lte=max_price)
+
+    if 'location' in params:
+        queryset = queryset.filter(location__icontains=params['location'])
+
+    if 'is_negotiable' in params:
+        queryset = queryset.filter(is_negotiable=params['is_negotiable'] == 'true')
+
+    if 'seller_id' in params:
+        queryset = queryset.filter(seller_id=params['seller_id'])
+
+    if 'search' in params:
+        queryset = search_text(queryset, params['search'])
+
+    return queryset
+
+
+def _price_bucket_labels():
+    labels = []
+    lower = 0
+    for upper in PRICE_BUCKETS:
+        labels.append({'min': lower, 'max': upper})
+        lower = upper
+    labels.append({'min': lower, 'max': None})
+    return labels
+
+
+def _price_bucket_expression():
+    return Case(
+        *[When(price__lt=upper, then=Value(index)) for index, upper in enumerate(PRICE_BUCKETS)],
+        default=Value(len(PRICE_BUCKETS)),
+        output_field=IntegerField(),
+    )
+
+
+def _cache_key(params):
+    version = cache.get(VERSION_KEY, 0)
+    digest = hashlib.md5(json.dumps(params, sort_keys=True).encode()).hexdigest()
+    return f"marketplace_search:facets:{version}:{digest}"
+
+
+def listing_facets(queryset, params):
+    """
+    Facet counts for the listings matching params.
+
+    Args:
+        queryset: Base Marketplace queryset (before filtering)
+        params: Request query parameters
+
+    Returns:
+        dict: {'total', 'category': {value: count}, 'condition': {value: count},
+               'price': [{'min', 'max', 'count'}, ...]}
+    """
+    normalized = normalize_params(params)
+    cache_key = _cache_key(normalized)
+    facets = cache.get(cache_key)
+    if facets is not None:
+        return facets
+
+    # One GROUP BY over (category, condition, price bucket); each facet is a
+    # marginal of that table
+    rows = (
+        filter_listings(queryset, normalized)
+        .order_by()
+        .annotate(price_bucket=_price_bucket_expression())
+        .values('category', 'condition', 'price_bucket')
+        .annotate(total=Count('id'))
+    )
+
+    price = _price_bucket_labels()
+    for bucket in price:
+        bucket['count'] = 0
+    facets = {'total': 0, 'category': {}, 'condition': {}, 'price': price}
+    for row in rows:
+        facets['total'] += row['total']
+        facets['category'][row['category']] = facets['category'].get(row['category'], 0) + row['total']
+        facets['condition'][row['condition']] = facets['condition'].get(row['condition'], 0) + row['total']
+        price[row['price_bucket']]['count'] += row['total']
+
+    cache.set(cache_key, facets, FACET_CACHE_TIMEOUT)
+    return facets
+
+
+def invalidate_search_cache():
+    """Drop every cached facet set by moving to a new cache key version."""
+    if not cache.add(VERSION_KEY, 1, None):
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, 1, None)
@@ -0,0 +1,188 @@
+"""
+Direct Messaging for CalloutRacing Application
+
+Conversations between two users, with a per-user inbox summary:
+- Every pair of users shares one Conversation, stored with the lower user
+  id first so either participant finds the same row
+- Each participant has an InboxEntry holding the last message and their
+  unread count, updated in the same transaction as the send, so listing
+  an inbox is one indexed query with no aggregation over messages
+- Message history and inbox listings are keyset paginated (by message id,
+  and by last message time then entry id), so deep pages cost the same as
+  the first one
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import blocks
+from .models.social import Conversation, InboxEntry, Message
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class MessagingError(Exception):
+    """A message that can't be sent, e.g. to yourself or across a block."""
+
+
+def _pair(user_a, user_b):
+    low, high = sorted((user_a.pk, user_b.pk))
+    return {'user_low_id': low, 'user_high_id': high}
+
+
+def conversation_between(user_a, user_b, create=False):
+    """
+    The conversation of two users, in either order.
+
+    Args:
+        user_a: One participant
+        user_b: The other participant
+        create: Create the conversation and both inbox entries when missing
+
+    Returns:
+        Conversation or None: None when it doesn't exist and create is False
+    """
+    pair = _pair(user_a, user_b)
+    conversation = Conversation.objects.filter(**pair).first()
+    if conversation is not None or not create:
+        return conversation
+
+    try:
+        with transaction.atomic():
+            conversation = Conversation.objects.create(**pair)
+            now = timezone.now()
+            InboxEntry.objects.bulk_create([
+                InboxEntry(user=user_a, other_user=user_b, conversation=conversation, last_message_at=now),
+                InboxEntry(user=user_b, other_user=user_a, conversation=conversation, last_message_at=now),
+            ])
+    except IntegrityError:
+        # Created concurrently by the other participant
+        conversation = Conversation.objects.get(**pair)
+    return conversation
+
+
+def send_message(sender, recipient, content):
+    """
+    Send a direct message and update both inbox entries.
+
+    Args:
+        sender: User sending the message
+        recipient: User receiving it
+        content: Message text
+
+    Returns:
+        Message: The new message
+
+    Raises:
+        MessagingError: Messaging yourself, or a block in either direction
+    """
+    if sender.pk == recipient.pk:
+        raise MessagingError('You cannot message yourself')
+    if blocks.is_blocked(sender.pk, recipient.pk):
+        raise MessagingError('You cannot message this user')
+
+    with transaction.atomic():
+        conversation = conversation_between(sender, recipient, create=True)
+        message = Message.objects.create(
+            conversation=conversation, sender=sender, recipient=recipient, content=content
+        )
+        latest = {'last_message': message, 'last_message_at': message.created_at}
+        # Concurrent sends may commit out of order; only move forward
+        newer = Q(last_message__isnull=True) | Q(last_message_id__lt=message.pk)
+
+        Conversation.objects.filter(newer, pk=conversation.pk).update(**latest)
+        entries = InboxEntry.objects.filter(conversation=conversation)
+        entries.filter(user=recipient).update(unread_count=F('unread_count') + 1)
+        entries.filter(newer).update(**latest)
+    return message
+
+
+def mark_read(user, conversation):
+    """
+    Mark every message sent to `user` in a conversation as read.
+
+    Returns:
+        int: Number of messages marked read
+    """
+    with transaction.atomic():
+        marked = Message.objects.filter(conversation=conversation, recipient=user, is_read=False).update(is_read=True)
+        InboxEntry.objects.filter(conversation=conversation, user=user).update(unread_count=0)
+    return marked
+
+
+def unread_total(user):
+    """Unread messages across all of a user's conversations."""
+    return sum(InboxEntry.objects.filter(user=user, unread_count__gt=0).values_list('unread_count', flat=True))
+
+
+def _page_size(limit):
+    return max(1, min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+
+
+def history(conversation, before=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Messages of a conversation, newest first.
+
+    Args:
+        conversation: The conversation
+        before: Message id cursor; only older messages are returned
+        limit: Page size, capped at MAX_PAGE_SIZE
+
+    Returns:
+        tuple: (messages, cursor for the next page or None)
+    """
+    limit = _page_size(limit)
+    messages = conversation.messages.order_by('-id')
+    if before:
+        messages = messages.filter(id__lt=int(before))
+    page = list(messages[:limit + 1])
+    if len(page) > limit:
+        return page[:limit], page[limit - 1].pk
+    return page, None
+
+
+def _inbox_cursor(entry):
+    return f"{(entry.last_message_at - _EPOCH) // _MICROSECOND}.{entry.pk}"
+
+
+def _parse_inbox_cursor(cursor):
+    micros, entry_id = cursor.split('.')
+    return _EPOCH + int(micros) * _MICROSECOND, int(entry_id)
+
+
+def inbox(user, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    A user's conversations, most recent first.
+
+    Args:
+        user: Inbox owner
+        cursor: Opaque cursor from a previous page
+        limit: Page size, capped at MAX_PAGE_SIZE
+
+    Returns:
+        tuple: (InboxEntry list with other_user and last_message loaded,
+                cursor for the next page or None)
+
+    Raises:
+        ValueError: Malformed cursor
+    """
+    limit = _page_size(limit)
+    entries = (
+        InboxEntry.objects.filter(user=user, last_message__isnull=False)
+        .select_related('other_user', 'last_message')
+        .order_by('-last_message_at', '-id')
+    )
+    if cursor:
+        moment, entry_id = _parse_inbox_cursor(cursor)
+        entries = entries.filter(Q(last_message_at__lt=moment) | Q(last_message_at=moment, id__lt=entry_id))
+    page = list(entries[:limit + 1])
+    if len(page) > limit:
+        return page[:limit], _inbox_cursor(page[limit - 1])
+    return page, None
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.10 on 2026-10-19 07:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_outboundsms'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='otp',
+            name='core_otp_identif_21718b_idx',
+        ),
+        migrations.AddIndex(
+            model_name='otp',
+            index=models.Index(fields=['identifier', 'otp_type', 'purpose', 'is_used'], name='core_otp_identif_23855b_idx'),
+        ),
+    ]
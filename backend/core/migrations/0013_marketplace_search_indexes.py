@@ -0,0 +1,50 @@
+# Generated by Django 4.2.10 on 2026-10-19 07:29
+
+from django.db import migrations, models
+
+SEARCH_INDEX_NAME = 'core_marketplace_search_gin'
+
+
+def search_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    # Same expression as core.marketplace_search.search_text()
+    return GinIndex(SearchVector('title', 'description', config='english'), name=SEARCH_INDEX_NAME)
+
+
+def add_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_index(apps.get_model('core', 'Marketplace'), search_index())
+
+
+def remove_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.remove_index(apps.get_model('core', 'Marketplace'), search_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_otp_lookup_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='marketplace',
+            index=models.Index(fields=['category', 'condition', 'price'], name='core_market_categor_170d1a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketplace',
+            index=models.Index(fields=['condition', 'price'], name='core_market_conditi_43ab74_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketplace',
+            index=models.Index(fields=['price'], name='core_market_price_9799c1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketplace',
+            index=models.Index(fields=['-created_at'], name='core_market_created_461bcd_idx'),
+        ),
+        migrations.RunPython(add_search_index, remove_search_index),
+    ]
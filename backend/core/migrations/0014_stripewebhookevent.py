@@ -0,0 +1,37 @@
+# Generated by Django 4.2.10 on 2026-10-19 07:34
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_marketplace_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StripeWebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(help_text='Stripe event ID (evt_...)', max_length=255, unique=True)),
+                ('event_type', models.CharField(max_length=100)),
+                ('endpoint', models.CharField(choices=[('subscriptions', 'Subscriptions'), ('marketplace', 'Marketplace')], help_text='Webhook endpoint that received the event', max_length=20)),
+                ('object_id', models.CharField(blank=True, db_index=True, help_text='ID of the Stripe object the event is about', max_length=255)),
+                ('stripe_created', models.BigIntegerField(help_text='Event creation time reported by Stripe (unix seconds)')),
+                ('payload', models.JSONField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processed', 'Processed'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('lease_token', models.UUIDField(blank=True, null=True)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['stripe_created', 'id'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='core_stripe_status_f2bf3f_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.10 on 2026-10-19 07:44
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_participant_count(apps, schema_editor):
+    Event = apps.get_model('core', 'Event')
+    EventParticipant = apps.get_model('core', 'EventParticipant')
+    counts = (
+        EventParticipant.objects.filter(event=OuterRef('pk'))
+        .order_by().values('event').annotate(total=Count('id')).values('total')
+    )
+    Event.objects.update(participant_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_stripewebhookevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Registered participants (kept in step by core.event_registration)'),
+        ),
+        migrations.RunPython(backfill_participant_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,125 @@
+# Generated by Django 4.2.10 on 2026-10-19 08:14
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Q
+import django.db.models.deletion
+
+
+def backfill_conversations(apps, schema_editor):
+    Message = apps.get_model('core', 'Message')
+    Conversation = apps.get_model('core', 'Conversation')
+    InboxEntry = apps.get_model('core', 'InboxEntry')
+
+    threaded = Message.objects.exclude(sender=None).exclude(recipient=None).exclude(sender=F('recipient'))
+    pairs = {tuple(sorted(pair)) for pair in threaded.values_list('sender_id', 'recipient_id').distinct()}
+    for low, high in sorted(pairs):
+        messages = threaded.filter(Q(sender_id=low, recipient_id=high) | Q(sender_id=high, recipient_id=low))
+        last = messages.order_by('-id').first()
+        conversation = Conversation.objects.create(
+            user_low_id=low, user_high_id=high, last_message=last, last_message_at=last.created_at
+        )
+        messages.update(conversation=conversation)
+        InboxEntry.objects.bulk_create([
+            InboxEntry(
+                user_id=user_id, other_user_id=other_id, conversation=conversation, last_message=last,
+                last_message_at=last.created_at,
+                unread_count=messages.filter(recipient_id=user_id, is_read=False).count(),
+            )
+            for user_id, other_id in ((low, high), (high, low))
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_event_participant_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Conversation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_message_at', models.DateTimeField(blank=True, help_text='When the last message was sent', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Conversation',
+                'verbose_name_plural': 'Conversations',
+            },
+        ),
+        migrations.CreateModel(
+            name='InboxEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_message_at', models.DateTimeField(help_text='When the last message was sent')),
+                ('unread_count', models.PositiveIntegerField(default=0, help_text='Messages the owner has not read')),
+            ],
+            options={
+                'verbose_name': 'Inbox entry',
+                'verbose_name_plural': 'Inbox entries',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', '-id'], name='message_thread_idx'),
+        ),
+        migrations.AddField(
+            model_name='inboxentry',
+            name='conversation',
+            field=models.ForeignKey(help_text='Conversation this row summarizes', on_delete=django.db.models.deletion.CASCADE, related_name='inbox_entries', to='core.conversation'),
+        ),
+        migrations.AddField(
+            model_name='inboxentry',
+            name='last_message',
+            field=models.ForeignKey(blank=True, help_text='Most recent message', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.message'),
+        ),
+        migrations.AddField(
+            model_name='inboxentry',
+            name='other_user',
+            field=models.ForeignKey(help_text='The other participant', on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='inboxentry',
+            name='user',
+            field=models.ForeignKey(help_text='Inbox owner', on_delete=django.db.models.deletion.CASCADE, related_name='inbox_entries', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message',
+            field=models.ForeignKey(blank=True, help_text='Most recent message', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.message'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='user_high',
+            field=models.ForeignKey(help_text='Participant with the higher user id', on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='user_low',
+            field=models.ForeignKey(help_text='Participant with the lower user id', on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='message',
+            name='conversation',
+            field=models.ForeignKey(blank=True, help_text='Thread the message belongs to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='core.conversation'),
+        ),
+        migrations.AddIndex(
+            model_name='inboxentry',
+            index=models.Index(fields=['user', '-last_message_at', '-id'], name='inbox_listing_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='inboxentry',
+            constraint=models.UniqueConstraint(fields=('user', 'conversation'), name='unique_inbox_entry'),
+        ),
+        migrations.AddConstraint(
+            model_name='conversation',
+            constraint=models.UniqueConstraint(fields=('user_low', 'user_high'), name='unique_conversation_pair'),
+        ),
+        migrations.AddConstraint(
+            model_name='conversation',
+            constraint=models.CheckConstraint(check=models.Q(('user_low__lt', models.F('user_high'))), name='conversation_pair_ordered'),
+        ),
+        migrations.RunPython(backfill_conversations, migrations.RunPython.noop),
+    ]
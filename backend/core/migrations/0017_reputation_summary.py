@@ -0,0 +1,43 @@
+# Generated by Django 4.2.10 on 2026-10-19 08:19
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+
+
+def backfill_reputation_summaries(apps, schema_editor):
+    ReputationRating = apps.get_model('core', 'ReputationRating')
+    ReputationSummary = apps.get_model('core', 'ReputationSummary')
+    totals = (
+        ReputationRating.objects.filter(rated_user__isnull=False, rating__isnull=False)
+        .values('rated_user_id').annotate(total=Sum('rating'), count=Count('id')).order_by()
+    )
+    ReputationSummary.objects.bulk_create([
+        ReputationSummary(user_id=row['rated_user_id'], rating_sum=row['total'], rating_count=row['count'])
+        for row in totals
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_message_conversations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReputationSummary',
+            fields=[
+                ('user', models.OneToOneField(help_text='User the ratings were given to', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='reputation', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('rating_sum', models.PositiveIntegerField(default=0, help_text='Sum of all received ratings')),
+                ('rating_count', models.PositiveIntegerField(default=0, help_text='Number of received ratings')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Reputation Summary',
+                'verbose_name_plural': 'Reputation Summaries',
+            },
+        ),
+        migrations.RunPython(backfill_reputation_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.10 on 2026-10-19 08:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_follow_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stripewebhookevent',
+            name='event_id',
+            field=models.CharField(help_text='Stripe event ID (evt_...)', max_length=255),
+        ),
+        migrations.AddConstraint(
+            model_name='stripewebhookevent',
+            constraint=models.UniqueConstraint(fields=('endpoint', 'event_id'), name='unique_webhook_event_per_endpoint'),
+        ),
+    ]
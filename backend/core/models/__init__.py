@@ -9,6 +9,7 @@ This package contains all database models organized by domain:
 - cars: Car profiles, modifications, and build logs
 - payments: Subscriptions, payments, and wallets
 - locations: Hot spots, crews, and location broadcasting
+- outbox: Outbound messages delivered by background workers
 """
 
 # Import all models to maintain backward compatibility
@@ -21,8 +22,8 @@ from .marketplace import (
     Order, OrderItem, ShippingAddress
 )
 from .social import (
-    Follow, Block, Friendship, Message, UserPost, PostComment, 
-    Notification, ReputationRating, RacingCrew, CrewMembership
+    Follow, Block, Friendship, Conversation, Message, InboxEntry, UserPost, PostComment, 
+    Notification, ReputationRating, ReputationSummary, RacingCrew, CrewMembership
 )
 from .cars import (
     CarProfile, CarModification, CarImage, BuildLog, 
@@ -30,10 +31,11 @@ from .cars import (
     BuildWishlist, WishlistSuggestion, BuildRating, 
     BuildComment, BuildBadge, BuildBadgeAward
 )
-from .payments import UserWallet, Payment, MarketplaceTransaction
+from .payments import Subscription, UserWallet, Payment, MarketplaceTransaction, StripeWebhookEvent
 from .locations import (
     HotSpot, LocationBroadcast, OpenChallenge, ChallengeResponse
 )
+from .outbox import OutboundEmail, OutboundSMS
 
 __all__ = [
     # Auth models
@@ -49,8 +51,8 @@ __all__ = [
     'Order', 'OrderItem', 'ShippingAddress',
     
     # Social models
-    'Follow', 'Block', 'Friendship', 'Message', 'UserPost', 'PostComment', 
-    'Notification', 'ReputationRating', 'RacingCrew', 'CrewMembership',
+    'Follow', 'Block', 'Friendship', 'Conversation', 'Message', 'InboxEntry', 'UserPost', 'PostComment', 
+    'Notification', 'ReputationRating', 'ReputationSummary', 'RacingCrew', 'CrewMembership',
     
     # Car models
     'CarProfile', 'CarModification', 'CarImage', 'BuildLog', 
@@ -59,8 +61,11 @@ __all__ = [
     'BuildComment', 'BuildBadge', 'BuildBadgeAward',
     
     # Payment models
-    'Subscription', 'Payment', 'UserWallet', 'MarketplaceTransaction',
+    'Subscription', 'Payment', 'UserWallet', 'MarketplaceTransaction', 'StripeWebhookEvent',
     
     # Location models
     'HotSpot', 'LocationBroadcast', 'OpenChallenge', 'ChallengeResponse',
+    
+    # Outbox models
+    'OutboundEmail', 'OutboundSMS',
 ] 
\ No newline at end of file
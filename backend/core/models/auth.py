@@ -105,7 +105,9 @@ class OTP(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['identifier', 'code', 'is_used']),
+            # Covers invalidation in create_otp and the lookup in verify_otp
+            models.Index(fields=['identifier', 'otp_type', 'purpose', 'is_used']),
+            # Used by the expiry sweeper
             models.Index(fields=['expires_at']),
             models.Index(fields=['purpose']),
         ]
@@ -51,6 +51,14 @@ class Marketplace(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        # Full-text search on title/description uses a PostgreSQL GIN index
+        # created in migration 0013
+        indexes = [
+            models.Index(fields=['category', 'condition', 'price']),
+            models.Index(fields=['condition', 'price']),
+            models.Index(fields=['price']),
+            models.Index(fields=['-created_at']),
+        ]
 
 
 class MarketplaceImage(models.Model):
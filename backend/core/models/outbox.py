@@ -0,0 +1,85 @@
+"""
+Outbox Models
+
+This module contains models for outbound messages that are delivered
+asynchronously by background workers instead of inside the request.
+"""
+
+from django.db import models
+from django.utils import timezone
+
+
+class OutboundEmail(models.Model):
+    """Rendered email waiting for (or done with) background delivery."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list, help_text='Recipient addresses')
+    body = models.TextField(help_text='Plain text body')
+    html_body = models.TextField(blank=True, help_text='Optional HTML alternative')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text='Earliest time a worker may (re)try delivery')
+    lease_token = models.UUIDField(null=True, blank=True, help_text='Worker claim on this email while delivering')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.to)} ({self.status})"
+
+    @property
+    def queue_latency(self):
+        """Time between queueing and successful delivery."""
+        if self.sent_at:
+            return self.sent_at - self.created_at
+        return None
+
+
+class OutboundSMS(models.Model):
+    """Text message waiting for (or done with) background delivery."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    to = models.CharField(max_length=20, help_text='Recipient phone number in E.164 format')
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    provider = models.CharField(max_length=20, blank=True, help_text='Provider that accepted the message')
+    provider_message_id = models.CharField(max_length=100, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text='Earliest time a worker may (re)try delivery')
+    lease_token = models.UUIDField(null=True, blank=True, help_text='Worker claim on this message while delivering')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name_plural = 'Outbound SMS'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"SMS → {self.to} ({self.status})"
+
+    @property
+    def queue_latency(self):
+        """Time between queueing and successful delivery."""
+        if self.sent_at:
+            return self.sent_at - self.created_at
+        return None
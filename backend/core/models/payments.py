@@ -110,4 +110,51 @@ class MarketplaceTransaction(models.Model):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"{self.buyer.username} → {self.seller.username} - ${self.amount}" 
\ No newline at end of file
+        return f"{self.buyer.username} → {self.seller.username} - ${self.amount}"
+
+
+class StripeWebhookEvent(models.Model):
+    """
+    Inbox of received Stripe webhook events, keyed by Stripe event ID.
+    
+    Webhooks are acknowledged as soon as the event is stored; a background
+    worker processes them (see core.webhook_inbox). An event_id is unique per
+    endpoint, which makes Stripe's retries no-ops while an event sent to both
+    endpoints is still handled by each.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processed', 'Processed'),
+        ('failed', 'Failed'),
+    ]
+    ENDPOINT_CHOICES = [
+        ('subscriptions', 'Subscriptions'),
+        ('marketplace', 'Marketplace'),
+    ]
+    
+    event_id = models.CharField(max_length=255, help_text='Stripe event ID (evt_...)')
+    event_type = models.CharField(max_length=100)
+    endpoint = models.CharField(max_length=20, choices=ENDPOINT_CHOICES, help_text='Webhook endpoint that received the event')
+    object_id = models.CharField(max_length=255, blank=True, db_index=True, help_text='ID of the Stripe object the event is about')
+    stripe_created = models.BigIntegerField(help_text='Event creation time reported by Stripe (unix seconds)')
+    payload = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    lease_token = models.UUIDField(null=True, blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['stripe_created', 'id']
+        constraints = [
+            # Both endpoints subscribe to some of the same event types
+            models.UniqueConstraint(fields=['endpoint', 'event_id'], name='unique_webhook_event_per_endpoint'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_type} {self.event_id} ({self.status})"
@@ -76,6 +76,7 @@ class Event(models.Model):
     start_date = models.DateTimeField(help_text="Event start date and time")
     end_date = models.DateTimeField(help_text="Event end date and time")
     max_participants = models.IntegerField(blank=True, null=True, help_text="Maximum number of participants")
+    participant_count = models.PositiveIntegerField(default=0, editable=False, help_text="Registered participants (kept in step by core.event_registration)")
     entry_fee = models.DecimalField(max_digits=8, decimal_places=2, default=0, help_text="Entry fee")
     is_public = models.BooleanField(default=True, help_text="Whether event is public")
     is_active = models.BooleanField(default=True, help_text="Whether event is active")
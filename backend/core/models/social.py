@@ -4,14 +4,17 @@ Social Models for CalloutRacing Application
 This module contains models related to social features:
 - Friendship: Friend relationships between users
 - Follow: Follow relationships between users
+- Conversation: Two-party direct message thread
 - Message: Direct messages between users
+- InboxEntry: Per-user inbox row (last message, unread count) for a conversation
 - UserPost: User posts and content
 - PostComment: Comments on posts
 - Notification: User notifications
 - ReputationRating: User reputation and ratings
+- ReputationSummary: Per-user rating sum and count, kept in step with ratings
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
@@ -36,6 +39,11 @@ class Follow(models.Model):
     class Meta:
         unique_together = ('follower', 'following')
         ordering = ['-created_at']
+        indexes = [
+            # Paginated follower and following listings, newest first
+            models.Index(fields=['following', '-created_at'], name='follow_followers_idx'),
+            models.Index(fields=['follower', '-created_at'], name='follow_following_idx'),
+        ]
         verbose_name = "Follow"
         verbose_name_plural = "Follows"
     
@@ -133,8 +141,53 @@ class Friendship(models.Model):
         super().save(*args, **kwargs)
 
 
+class Conversation(models.Model):
+    """Direct message thread between two users, keyed by the pair (lower user id first)."""
+    user_low = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+        help_text='Participant with the lower user id'
+    )
+    user_high = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+        help_text='Participant with the higher user id'
+    )
+    last_message = models.ForeignKey(
+        'Message',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text='Most recent message'
+    )
+    last_message_at = models.DateTimeField(null=True, blank=True, help_text='When the last message was sent')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user_low', 'user_high'], name='unique_conversation_pair'),
+            models.CheckConstraint(check=models.Q(user_low__lt=models.F('user_high')), name='conversation_pair_ordered'),
+        ]
+        verbose_name = "Conversation"
+        verbose_name_plural = "Conversations"
+
+    def __str__(self):
+        return f"Conversation {self.user_low_id} <-> {self.user_high_id}"
+
+
 class Message(models.Model):
     """Direct message between users."""
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name='messages',
+        null=True,  # Messages from before conversations existed may lack a participant
+        blank=True,
+        help_text='Thread the message belongs to'
+    )
     sender = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
         on_delete=models.CASCADE, 
@@ -159,6 +212,10 @@ class Message(models.Model):
         ordering = ['-created_at']
         verbose_name = "Message"
         verbose_name_plural = "Messages"
+        indexes = [
+            # Keyset-paginated thread history (newest first)
+            models.Index(fields=['conversation', '-id'], name='message_thread_idx'),
+        ]
     
     def __str__(self):
         if self.sender and self.recipient:
@@ -166,6 +223,52 @@ class Message(models.Model):
         return f"Message {self.id}: {self.content[:50]}"
 
 
+class InboxEntry(models.Model):
+    """A user's inbox row for one conversation, updated on every message."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='inbox_entries',
+        help_text='Inbox owner'
+    )
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name='inbox_entries',
+        help_text='Conversation this row summarizes'
+    )
+    other_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+        help_text='The other participant'
+    )
+    last_message = models.ForeignKey(
+        Message,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text='Most recent message'
+    )
+    last_message_at = models.DateTimeField(help_text='When the last message was sent')
+    unread_count = models.PositiveIntegerField(default=0, help_text='Messages the owner has not read')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'conversation'], name='unique_inbox_entry'),
+        ]
+        indexes = [
+            # The inbox listing, newest conversation first
+            models.Index(fields=['user', '-last_message_at', '-id'], name='inbox_listing_idx'),
+        ]
+        verbose_name = "Inbox entry"
+        verbose_name_plural = "Inbox entries"
+
+    def __str__(self):
+        return f"{self.user_id}: {self.conversation} ({self.unread_count} unread)"
+
+
 class UserPost(models.Model):
     """User post/content."""
     POST_TYPES = [
@@ -428,7 +531,38 @@ class ReputationRating(models.Model):
         # Prevent self-rating
         if self.rater and self.rated_user and self.rater == self.rated_user:
             raise ValueError("Users cannot rate themselves")
-        super().save(*args, **kwargs)
+        # Signals lock the existing row, save it and adjust the rated user's
+        # ReputationSummary; keep all three in one transaction (deletes already
+        # run their signals inside the deletion's transaction)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class ReputationSummary(models.Model):
+    """Running total of a user's received ratings (see core.reputation)."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='reputation',
+        help_text='User the ratings were given to'
+    )
+    rating_sum = models.PositiveIntegerField(default=0, help_text='Sum of all received ratings')
+    rating_count = models.PositiveIntegerField(default=0, help_text='Number of received ratings')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Reputation Summary"
+        verbose_name_plural = "Reputation Summaries"
+
+    def __str__(self):
+        return f"Reputation of user {self.user_id}: {self.average}/5 from {self.rating_count}"
+
+    @property
+    def average(self):
+        if not self.rating_count:
+            return 0
+        return round(self.rating_sum / self.rating_count, 2)
 
 
 # Additional models for advanced social features
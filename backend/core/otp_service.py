@@ -15,16 +15,10 @@ from django.conf import settings
 from django.core.cache import cache
 from django.db import transaction
 from .models.auth import OTP, User
+from .sms_queue import enqueue_sms
+from . import rate_limit
 import logging
 
-# SMS Integration
-try:
-    from twilio.rest import Client
-    TWILIO_AVAILABLE = True
-except ImportError:
-    TWILIO_AVAILABLE = False
-    Client = None
-
 logger = logging.getLogger(__name__)
 
 
@@ -45,43 +39,34 @@ class OTPService:
     @staticmethod
     def check_rate_limit(identifier, action='send'):
         """Check rate limiting for OTP operations."""
-        cache_key = f"otp_rate_limit:{action}:{identifier}"
-        attempts = cache.get(cache_key, 0)
-        
-        if attempts >= OTPService.MAX_ATTEMPTS_PER_HOUR:
+        result = rate_limit.hit(f"otp_{action}", identifier, OTPService.MAX_ATTEMPTS_PER_HOUR, 3600)
+        if not result.allowed:
             return False, f"Too many {action} attempts. Please try again later."
-        
-        # Increment attempt counter
-        cache.set(cache_key, attempts + 1, 3600)  # 1 hour expiry
         return True, None
     
     @staticmethod
     def check_daily_limit(identifier):
         """Check daily rate limiting."""
-        cache_key = f"otp_daily_limit:{identifier}"
-        attempts = cache.get(cache_key, 0)
-        
-        if attempts >= OTPService.MAX_ATTEMPTS_PER_DAY:
+        result = rate_limit.hit('otp_daily', identifier, OTPService.MAX_ATTEMPTS_PER_DAY, 86400)
+        if not result.allowed:
             return False, "Daily OTP limit exceeded. Please try again tomorrow."
-        
-        # Increment daily counter
-        cache.set(cache_key, attempts + 1, 86400)  # 24 hours expiry
         return True, None
     
     @staticmethod
     def check_resend_cooldown(identifier):
         """Check if enough time has passed since last OTP send."""
-        cache_key = f"otp_resend_cooldown:{identifier}"
-        last_sent = cache.get(cache_key)
-        
-        if last_sent:
-            time_diff = timezone.now() - last_sent
-            if time_diff.total_seconds() < OTPService.RESEND_COOLDOWN_SECONDS:
-                remaining = OTPService.RESEND_COOLDOWN_SECONDS - int(time_diff.total_seconds())
-                return False, f"Please wait {remaining} seconds before requesting another OTP."
-        
+        remaining = OTPService.get_resend_cooldown_remaining(identifier)
+        if remaining > 0:
+            return False, f"Please wait {remaining} seconds before requesting another OTP."
         return True, None
     
+    @staticmethod
+    def start_resend_cooldown(identifier):
+        """Start the resend cooldown once an OTP has actually been handed off for delivery."""
+        cache_key = f"otp_resend_cooldown:{identifier}"
+        # add() keeps the first send time when concurrent requests both get here
+        return cache.add(cache_key, timezone.now(), OTPService.RESEND_COOLDOWN_SECONDS)
+    
     @staticmethod
     def create_otp(user, identifier, otp_type, purpose='login', expiry_minutes=10):
         """Create a new OTP with enhanced security."""
@@ -117,10 +102,6 @@ class OTPService:
                 purpose=purpose
             )
             
-            # Set resend cooldown
-            cache_key = f"otp_resend_cooldown:{identifier}"
-            cache.set(cache_key, timezone.now(), OTPService.RESEND_COOLDOWN_SECONDS)
-            
             # Log OTP creation (without exposing the code)
             masked_identifier = OTPService._mask_identifier(identifier)
             logger.info(f"OTP created for {masked_identifier} ({otp_type}) - User: {user.username}")
@@ -140,45 +121,23 @@ class OTPService:
     
     @staticmethod
     def send_phone_otp(phone_number, otp_code):
-        """Send OTP via SMS with enhanced error handling."""
-        if not TWILIO_AVAILABLE:
-            logger.warning("Twilio not available, logging OTP instead")
-            masked_phone = OTPService._mask_identifier(phone_number)
-            print(f"📱 SMS OTP sent to {masked_phone}: {otp_code}")
-            return True
-        
+        """
+        Queue OTP SMS for background delivery.
+
+        Providers (and failover between them) are handled by core.sms_queue,
+        so the request doesn't wait on the SMS gateway.
+        """
         try:
-            # Get Twilio credentials from settings
-            account_sid = getattr(settings, 'TWILIO_ACCOUNT_SID', None)
-            auth_token = getattr(settings, 'TWILIO_AUTH_TOKEN', None)
-            from_number = getattr(settings, 'TWILIO_FROM_NUMBER', None)
-            
-            if not all([account_sid, auth_token, from_number]):
-                logger.warning("Twilio credentials not configured, logging OTP instead")
-                masked_phone = OTPService._mask_identifier(phone_number)
-                print(f"📱 SMS OTP sent to {masked_phone}: {otp_code}")
-                return True
-            
-            # Send SMS via Twilio with clear message
-            client = Client(account_sid, auth_token)
             message_body = f"Your CalloutRacing verification code is: {otp_code}\n\nThis code will expire in 10 minutes. If you didn't request this code, please ignore this message."
-            
-            message = client.messages.create(
-                body=message_body,
-                from_=from_number,
-                to=phone_number
-            )
+            enqueue_sms(phone_number, message_body)
             
             masked_phone = OTPService._mask_identifier(phone_number)
-            logger.info(f"SMS OTP sent to {masked_phone} via Twilio: {message.sid}")
+            logger.info(f"SMS OTP queued for {masked_phone}")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to send SMS OTP: {str(e)}")
-            # Fallback to logging in development
-            masked_phone = OTPService._mask_identifier(phone_number)
-            print(f"📱 SMS OTP sent to {masked_phone}: {otp_code}")
-            return True
+            logger.error(f"Failed to queue SMS OTP: {str(e)}")
+            return False
     
     @staticmethod
     def send_email_otp(email, otp_code):
@@ -280,14 +239,13 @@ This is an automated message. Please do not reply to this email.
             otp.save()
             return False, "Failed to deliver OTP. Please try again."
         
+        OTPService.start_resend_cooldown(identifier)
         return True, otp
     
     @staticmethod
     def get_remaining_attempts(identifier):
         """Get remaining OTP attempts for rate limiting display."""
-        cache_key = f"otp_rate_limit:send:{identifier}"
-        attempts = cache.get(cache_key, 0)
-        return max(0, OTPService.MAX_ATTEMPTS_PER_HOUR - attempts)
+        return rate_limit.peek('otp_send', identifier, OTPService.MAX_ATTEMPTS_PER_HOUR, 3600).remaining
     
     @staticmethod
     def get_resend_cooldown_remaining(identifier):
@@ -300,4 +258,39 @@ This is an automated message. Please do not reply to this email.
             remaining = OTPService.RESEND_COOLDOWN_SECONDS - int(time_diff.total_seconds())
             return max(0, remaining)
         
-        return 0 
\ No newline at end of file
+        return 0
+    
+    @staticmethod
+    def purge_stale_otps(retention_hours=None, batch_size=1000):
+        """
+        Bulk-delete OTPs that expired more than retention_hours ago.
+        
+        Used codes are always past expiry soon after (codes live 10 minutes),
+        so filtering on expires_at alone covers both and uses its index.
+        Deleting in batches keeps each statement's lock short.
+        
+        Args:
+            retention_hours: How long to keep expired codes for auditing,
+                defaults to settings.OTP_RETENTION_HOURS
+            batch_size: Rows deleted per statement
+            
+        Returns:
+            int: Number of OTPs deleted
+        """
+        if retention_hours is None:
+            retention_hours = getattr(settings, 'OTP_RETENTION_HOURS', 24)
+        cutoff = timezone.now() - timedelta(hours=retention_hours)
+        stale = OTP.objects.filter(expires_at__lt=cutoff).order_by()
+        
+        deleted = 0
+        while True:
+            ids = list(stale.values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            # OTP has no dependents or signals, so this is a single DELETE
+            count, _ = OTP.objects.filter(id__in=ids).delete()
+            deleted += count
+        
+        if deleted:
+            logger.info(f"Purged {deleted} stale OTPs")
+        return deleted
@@ -0,0 +1,172 @@
+"""
+Request Profiling for CalloutRacing Application
+
+Opt-in middleware that measures what each request costs:
+- Number of SQL queries and total SQL time, across every database
+  connection, recorded with a connection execute wrapper (no DEBUG needed)
+- Duplicate queries: the same SQL statement run more than once in a
+  request, usually an N+1 in a serializer method field
+- Time spent producing DRF serializer .data
+- Results go to Server-Timing headers and a structured log line
+
+REQUEST_PROFILING selects the mode: 'off' (default), 'all' (every
+request, with headers; for development) or 'sample' (a
+REQUEST_PROFILING_SAMPLE_RATE fraction of requests, headers only for
+staff users; safe for production).
+"""
+
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+# The profile of the request being handled, if it is being profiled
+_current = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """Counters for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.statements = Counter()
+        self.serializer_seconds = 0.0
+        self.serializer_depth = 0
+        self.view = None
+
+    def __call__(self, execute, sql, params, many, context):
+        # Connection execute wrapper: times every query of the request
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - started
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def duplicates(self):
+        """Statements run more than once, most repeated first."""
+        return [(sql, count) for sql, count in self.statements.most_common() if count > 1]
+
+    def summary(self, request, response):
+        duplicates = self.duplicates()
+        return {
+            'method': request.method,
+            'path': request.path,
+            'view': self.view,
+            'status': response.status_code,
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'queries': self.queries,
+            'sql_ms': round(self.sql_seconds * 1000, 2),
+            'duplicate_queries': sum(count - 1 for _, count in duplicates),
+            'most_repeated': duplicates[0][1] if duplicates else 0,
+            'serializer_ms': round(self.serializer_seconds * 1000, 2),
+        }
+
+
+def _profiled_data(data_property):
+    """Wrap BaseSerializer.data to time the outermost serialization of a profiled request."""
+    getter = data_property.fget
+
+    def data(serializer):
+        profile = _current.get()
+        if profile is None:
+            return getter(serializer)
+        profile.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return getter(serializer)
+        finally:
+            profile.serializer_depth -= 1
+            if not profile.serializer_depth:
+                profile.serializer_seconds += time.perf_counter() - started
+
+    data._request_profiling = True
+    return property(data)
+
+
+if not getattr(BaseSerializer.data.fget, '_request_profiling', False):
+    BaseSerializer.data = _profiled_data(BaseSerializer.data)
+
+
+def _server_timing(summary):
+    return ', '.join([
+        f'total;dur={summary["total_ms"]}',
+        f'sql;dur={summary["sql_ms"]};desc="{summary["queries"]} queries, '
+        f'{summary["duplicate_queries"]} duplicate"',
+        f'serializer;dur={summary["serializer_ms"]}',
+    ])
+
+
+class RequestProfilingMiddleware:
+    """
+    Record query counts, SQL time, duplicate queries and serializer time.
+
+    Place it after AuthenticationMiddleware so sampled requests can tell
+    staff users apart.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _should_profile(self):
+        mode = getattr(settings, 'REQUEST_PROFILING', 'off')
+        if mode == 'all':
+            return True
+        if mode == 'sample':
+            return random.random() < getattr(settings, 'REQUEST_PROFILING_SAMPLE_RATE', 0.01)
+        return False
+
+    def __call__(self, request):
+        if not self._should_profile():
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        summary = profile.summary(request, response)
+        self._log(summary, profile)
+        if self._expose_headers(request):
+            response['Server-Timing'] = _server_timing(summary)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = _current.get()
+        if profile is not None:
+            view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+            target = view_class or view_func
+            profile.view = f"{target.__module__}.{target.__qualname__}"
+
+    def _expose_headers(self, request):
+        if getattr(settings, 'REQUEST_PROFILING', 'off') == 'all':
+            return True
+        user = getattr(request, 'user', None)
+        return bool(user is not None and user.is_staff)
+
+    def _log(self, summary, profile):
+        threshold = getattr(settings, 'REQUEST_PROFILING_DUPLICATE_THRESHOLD', 5)
+        if summary['most_repeated'] >= threshold:
+            sql, count = profile.duplicates()[0]
+            logger.warning(
+                f"Repeated query in {summary['view']}: ran {count} times: {sql[:300]}",
+                extra={'profile': summary},
+            )
+        logger.info(f"Request profile {json.dumps(summary, sort_keys=True)}", extra={'profile': summary})
@@ -0,0 +1,117 @@
+"""
+Rate Limiting for CalloutRacing Application
+
+Sliding-window rate limiter shared by the OTP service and the DRF throttles
+in api.throttling.
+
+Each (scope, identifier) pair keeps one counter per fixed window in the
+cache. A request is allowed while
+
+    previous_window_count * (1 - elapsed_fraction) + current_window_count <= limit
+
+which approximates a true sliding window without storing every timestamp.
+Counters are updated with cache.add/cache.incr, which are atomic on Redis
+(INCR) and on the per-process LocMemCache fallback, so concurrent requests
+can't all read the same count and slip past the limit.
+"""
+
+import time
+from collections import namedtuple
+
+from django.core.cache import cache
+
+RateLimitResult = namedtuple('RateLimitResult', ['allowed', 'limit', 'remaining', 'retry_after'])
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    Parse a DRF-style rate string.
+
+    Args:
+        rate: String such as '5/min', '20/hour' or '100/day'
+
+    Returns:
+        tuple: (limit, window in seconds)
+    """
+    limit, period = rate.split('/')
+    return int(limit), PERIODS[period[0]]
+
+
+def _window_keys(scope, identifier, window, now):
+    index = int(now // window)
+    prefix = f"rl:{scope}:{identifier}:{window}"
+    return f"{prefix}:{index}", f"{prefix}:{index - 1}", (now % window) / window
+
+
+def _estimate(previous, current, elapsed):
+    return previous * (1 - elapsed) + current
+
+
+def _retry_after(previous, current, elapsed, limit, window):
+    # The previous window's weight shrinks linearly, so if this window still
+    # has room, wait until enough of that weight has decayed; otherwise wait
+    # for the window to roll over
+    if previous and current < limit:
+        needed = 1 - (limit - current - 1) / previous
+        if needed > elapsed:
+            return max(1, int((needed - elapsed) * window))
+    return max(1, int((1 - elapsed) * window))
+
+
+def hit(scope, identifier, limit, window):
+    """
+    Count one request against a limit.
+
+    Args:
+        scope: Name of the limit, e.g. 'otp_send' or 'login'
+        identifier: Who is being limited (IP, user id, phone number, ...)
+        limit: Requests allowed per window
+        window: Window length in seconds
+
+    Returns:
+        RateLimitResult: Whether the request is allowed, how many remain,
+        and seconds to wait when it isn't
+    """
+    now = time.time()
+    current_key, previous_key, elapsed = _window_keys(scope, identifier, window, now)
+
+    # Keep each counter for two windows so it can still weight the next one
+    cache.add(current_key, 0, window * 2)
+    try:
+        current = cache.incr(current_key)
+    except ValueError:
+        # Expired between add and incr
+        cache.add(current_key, 1, window * 2)
+        current = 1
+    previous = cache.get(previous_key, 0)
+
+    estimate = _estimate(previous, current, elapsed)
+    if estimate > limit:
+        # Rejected requests don't use up capacity
+        cache.decr(current_key)
+        return RateLimitResult(False, limit, 0, _retry_after(previous, current - 1, elapsed, limit, window))
+
+    return RateLimitResult(True, limit, int(limit - estimate), 0)
+
+
+def peek(scope, identifier, limit, window):
+    """Like hit() but without counting a request."""
+    now = time.time()
+    current_key, previous_key, elapsed = _window_keys(scope, identifier, window, now)
+    counts = cache.get_many([current_key, previous_key])
+    current = counts.get(current_key, 0)
+    previous = counts.get(previous_key, 0)
+
+    remaining = limit - _estimate(previous, current, elapsed)
+    if remaining < 1:
+        return RateLimitResult(False, limit, 0, _retry_after(previous, current, elapsed, limit, window))
+    return RateLimitResult(True, limit, int(remaining), 0)
+
+
+def reset(scope, identifier, window):
+    """Clear the counters for an identifier (e.g. after a successful login)."""
+    now = time.time()
+    current_key, previous_key, _ = _window_keys(scope, identifier, window, now)
+    cache.delete_many([current_key, previous_key])
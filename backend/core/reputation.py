@@ -0,0 +1,138 @@
+"""
+Reputation for CalloutRacing Application
+
+Per-user reputation read from a maintained rollup instead of aggregating
+ratings on every request:
+- ReputationSummary holds the sum and count of each user's received
+  ratings and is adjusted with F() expressions when a rating is created,
+  changed or deleted (see core.signals). ReputationRating.save/delete run
+  the previous-value read, the write and the adjustment in one
+  transaction, and the read locks the rating row (SELECT ... FOR UPDATE),
+  so concurrent edits of one rating apply one after the other
+- `stats` reads one summary row, and falls back to a single aggregate
+  over the ratings when a user has no summary yet
+- `leaderboard` orders the summary table, one row per rated user
+- `rebuild` recomputes summaries from the ratings, for repairs after bulk
+  updates that bypass signals
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, FloatField, Sum
+from django.db.models.functions import Cast
+
+from .models.social import ReputationRating, ReputationSummary
+
+
+def _adjust(user_id, rating, sign):
+    if user_id is None or rating is None:
+        return
+    delta = {'rating_sum': F('rating_sum') + sign * rating, 'rating_count': F('rating_count') + sign}
+    if ReputationSummary.objects.filter(user_id=user_id).update(**delta) or sign < 0:
+        return
+    try:
+        with transaction.atomic():
+            ReputationSummary.objects.create(user_id=user_id, rating_sum=rating, rating_count=1)
+    except IntegrityError:
+        # Created by a concurrent rating of the same user
+        ReputationSummary.objects.filter(user_id=user_id).update(**delta)
+
+
+def record_change(previous, current):
+    """
+    Move a rating's contribution from its previous to its current state.
+
+    Args:
+        previous: (rated_user_id, rating) before the change, or None for a new rating
+        current: (rated_user_id, rating) after the change, or None for a deletion
+    """
+    if previous == current:
+        return
+    if previous:
+        _adjust(*previous, sign=-1)
+    if current:
+        _adjust(*current, sign=1)
+
+
+def _stats(total, count):
+    return {
+        'average_rating': round(total / count, 2) if count else 0,
+        'total_ratings': count,
+    }
+
+
+def stats(user_id):
+    """
+    Reputation of a user.
+
+    Args:
+        user_id: Id of the rated user
+
+    Returns:
+        dict: average_rating and total_ratings
+    """
+    summary = ReputationSummary.objects.filter(user_id=user_id).values_list('rating_sum', 'rating_count').first()
+    if summary is not None:
+        return _stats(*summary)
+
+    totals = ReputationRating.objects.filter(rated_user_id=user_id, rating__isnull=False).aggregate(
+        total=Sum('rating'), count=Count('id')
+    )
+    return _stats(totals['total'] or 0, totals['count'])
+
+
+def summary_stats(user):
+    """
+    Reputation from a user's summary loaded with select_related('reputation').
+
+    A user without a summary has never been rated, so no query is made.
+    """
+    try:
+        summary = user.reputation
+    except ReputationSummary.DoesNotExist:
+        return _stats(0, 0)
+    return _stats(summary.rating_sum, summary.rating_count)
+
+
+def leaderboard(limit=20, min_ratings=3):
+    """
+    Best-rated users.
+
+    Args:
+        limit: Number of users
+        min_ratings: Ratings a user needs to be listed
+
+    Returns:
+        QuerySet: ReputationSummary rows with `user` loaded and an `average_rating` annotation
+    """
+    return (
+        ReputationSummary.objects.filter(rating_count__gte=max(min_ratings, 1))
+        .select_related('user')
+        .annotate(average_rating=Cast('rating_sum', FloatField()) / F('rating_count'))
+        .order_by('-average_rating', '-rating_count', 'user_id')[:limit]
+    )
+
+
+def rebuild(user_ids=None):
+    """
+    Recompute summaries from the ratings.
+
+    Args:
+        user_ids: Users to rebuild (default: everyone)
+
+    Returns:
+        int: Number of summaries written
+    """
+    ratings = ReputationRating.objects.filter(rated_user__isnull=False, rating__isnull=False)
+    summaries = ReputationSummary.objects.all()
+    if user_ids is not None:
+        ratings = ratings.filter(rated_user_id__in=user_ids)
+        summaries = summaries.filter(user_id__in=user_ids)
+
+    totals = ratings.values('rated_user_id').annotate(total=Sum('rating'), count=Count('id')).order_by()
+    with transaction.atomic():
+        summaries.delete()
+        ReputationSummary.objects.bulk_create([
+            ReputationSummary(user_id=row['rated_user_id'], rating_sum=row['total'], rating_count=row['count'])
+            for row in totals
+        ])
+    return len(totals)
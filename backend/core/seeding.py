@@ -0,0 +1,305 @@
+"""
+Bulk Seeding for CalloutRacing Application
+
+Loads data with bulk_create instead of one INSERT per row:
+- `bulk_insert` writes any stream of unsaved objects in batches, one
+  transaction per batch, so memory stays flat however many rows there are
+- `upsert_by` creates or updates a small curated list (the populate_*
+  commands) with one lookup query instead of one get_or_create per row,
+  then sends post_save for each row so cached data is invalidated
+- `seed` generates a deterministic synthetic dataset for load testing:
+  users with profiles, follows, posts with like counts, callouts,
+  marketplace listings and hotspots.
+  The same scale and seed always produce the same rows
+
+bulk_insert skips model signals, so callers inserting events must
+invalidate the event calendar themselves (core.event_calendar).
+
+Seed a benchmark dataset with `python manage.py seed_data --scale 100`.
+"""
+
+import logging
+import random
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from .models.auth import UserProfile
+from .models.locations import HotSpot
+from .models.marketplace import Marketplace
+from .models.racing import Callout
+from .models.social import Follow, UserPost
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+DEFAULT_BATCH_SIZE = 2000
+
+# Rows generated per unit of --scale
+USERS_PER_SCALE = 1000
+FOLLOWS_PER_USER = 20
+POSTS_PER_USER = 5
+CALLOUTS_PER_USER = 2
+LISTINGS_PER_USER = 0.5
+HOTSPOTS_PER_SCALE = 50
+
+SEED_PASSWORD = 'seed-password'
+SEED_PREFIX = 'seed'
+
+CAR_MAKES = {
+    'Chevrolet': ['Camaro SS', 'Corvette Z06', 'Chevelle'],
+    'Ford': ['Mustang GT', 'Shelby GT500', 'F-150 Lightning'],
+    'Dodge': ['Challenger Hellcat', 'Charger Scat Pack', 'Viper'],
+    'Nissan': ['GT-R', '370Z', 'Skyline GT-R'],
+    'Toyota': ['Supra', 'GR86', 'Celica'],
+    'Honda': ['Civic Type R', 'S2000', 'NSX'],
+    'BMW': ['M3', 'M5', 'M2'],
+    'Subaru': ['WRX STI', 'BRZ'],
+}
+# (city, state, latitude, longitude)
+CITIES = [
+    ('Los Angeles', 'CA', 34.05, -118.24), ('Houston', 'TX', 29.76, -95.37), ('Phoenix', 'AZ', 33.45, -112.07),
+    ('Miami', 'FL', 25.76, -80.19), ('Atlanta', 'GA', 33.75, -84.39), ('Charlotte', 'NC', 35.23, -80.84),
+    ('Las Vegas', 'NV', 36.17, -115.14), ('Denver', 'CO', 39.74, -104.99), ('Chicago', 'IL', 41.88, -87.63),
+    ('Detroit', 'MI', 42.33, -83.05),
+]
+POST_TEMPLATES = [
+    'New personal best at the strip today: {et}s in the quarter.',
+    'Just bolted on a new {part} for the {make}. Dyno day next week.',
+    'Who is heading to the meet in {city} this weekend?',
+    'Looking for someone to run a {race} against my {make}.',
+    'Track day recap: traction was rough but the {make} pulled hard.',
+]
+PARTS = ['turbo', 'intake', 'exhaust', 'set of slicks', 'tune', 'intercooler']
+CALLOUT_STATUSES = ['pending'] * 6 + ['accepted'] * 2 + ['completed', 'declined', 'cancelled']
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def bulk_insert(model, objects, batch_size=DEFAULT_BATCH_SIZE, ignore_conflicts=False):
+    """
+    Insert a stream of unsaved objects with bulk_create.
+
+    Args:
+        model: Model class of the objects
+        objects: Any iterable of unsaved instances (a generator keeps memory flat)
+        batch_size: Rows per INSERT; each batch commits in its own transaction
+        ignore_conflicts: Skip rows violating unique constraints
+
+    Returns:
+        int: Number of objects passed in
+    """
+    total = 0
+    for batch in _batches(objects, batch_size):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=batch_size, ignore_conflicts=ignore_conflicts)
+        total += len(batch)
+    return total
+
+
+def upsert_by(model, key, rows, update=True, **defaults):
+    """
+    Create or update a small list of rows identified by one field.
+
+    Args:
+        model: Model class
+        key: Field identifying a row (e.g. 'name')
+        rows: List of field dicts, each including `key`
+        update: Overwrite existing rows with the given fields (otherwise leave them)
+        **defaults: Extra fields for every row (e.g. organizer=admin)
+
+    Returns:
+        tuple: (created objects, updated objects)
+    """
+    rows = [{**defaults, **row} for row in rows]
+    existing = {}
+    for obj in model.objects.filter(**{f"{key}__in": [row[key] for row in rows]}).order_by('pk'):
+        existing.setdefault(getattr(obj, key), obj)
+    created, updated = [], []
+    for row in rows:
+        obj = existing.get(row[key])
+        if obj is None:
+            created.append(model(**row))
+        elif update:
+            for field, value in row.items():
+                setattr(obj, field, value)
+            updated.append(obj)
+
+    with transaction.atomic():
+        model.objects.bulk_create(created)
+        if updated:
+            fields = {field for row in rows for field in row if field != key}
+            # bulk_update doesn't apply auto_now, which cache keys and sitemaps rely on
+            now = timezone.now()
+            for field in model._meta.concrete_fields:
+                if getattr(field, 'auto_now', False):
+                    fields.add(field.name)
+                    for obj in updated:
+                        setattr(obj, field.attname, now)
+            model.objects.bulk_update(updated, sorted(fields))
+
+    # The lists are small, so keep cache invalidation (core.signals) working
+    for obj in created + updated:
+        post_save.send(sender=model, instance=obj, created=obj in created, raw=False, using=obj._state.db, update_fields=None)
+    return created, updated
+
+
+# Synthetic dataset -------------------------------------------------------
+
+def _username(index):
+    return f"{SEED_PREFIX}_{index:08d}"
+
+
+def _users(count, start):
+    # Hashing is deliberately slow, so every seeded user shares one hash
+    password = make_password(SEED_PASSWORD)
+    for index in range(start, start + count):
+        yield User(
+            username=_username(index), email=f"{_username(index)}@seed.calloutracing.test", password=password,
+            first_name='Seed', last_name=f"Racer {index}",
+        )
+
+
+def _profiles(rng, user_ids):
+    for user_id in user_ids:
+        make = rng.choice(list(CAR_MAKES))
+        city, state, _, _ = rng.choice(CITIES)
+        wins, losses = rng.randint(0, 60), rng.randint(0, 60)
+        yield UserProfile(
+            user_id=user_id, location=f"{city}, {state}", car_make=make, car_model=rng.choice(CAR_MAKES[make]),
+            car_year=rng.randint(1990, 2025), wins=wins, losses=losses, total_races=wins + losses,
+            email_verified=True,
+        )
+
+
+def _follows(rng, user_ids, per_user):
+    count = len(user_ids)
+    per_user = min(per_user, count - 1)
+    for position, follower_id in enumerate(user_ids):
+        # Sample positions other than the follower's own
+        for target in rng.sample(range(count - 1), per_user):
+            if target >= position:
+                target += 1
+            yield Follow(follower_id=follower_id, following_id=user_ids[target])
+
+
+def _posts(rng, user_ids, per_user):
+    for author_id in user_ids:
+        for _ in range(per_user):
+            make = rng.choice(list(CAR_MAKES))
+            content = rng.choice(POST_TEMPLATES).format(
+                et=f"{rng.uniform(8.5, 15.0):.2f}", part=rng.choice(PARTS), make=make,
+                city=rng.choice(CITIES)[0], race=rng.choice(['roll race', 'dig race', 'quarter mile']),
+            )
+            # Heavy-tailed like counts: most posts get a few, some go viral
+            likes = min(int(rng.paretovariate(1.2)) - 1, len(user_ids))
+            yield UserPost(
+                author_id=author_id, content=content, post_type='text', likes_count=likes,
+                comments_count=0, is_public=rng.random() > 0.05,
+            )
+
+
+def _callouts(rng, user_ids, per_user):
+    race_types = [choice for choice, _ in Callout.RACE_TYPES]
+    levels = [choice for choice, _ in Callout.EXPERIENCE_LEVELS]
+    for challenger_id in user_ids:
+        for _ in range(per_user):
+            challenged_id = rng.choice(user_ids)
+            if challenged_id == challenger_id:
+                continue
+            city, state, _, _ = rng.choice(CITIES)
+            yield Callout(
+                challenger_id=challenger_id, challenged_id=challenged_id, location_type='street',
+                street_location=f"{rng.randint(100, 9999)} Industrial Pkwy", city=city, state=state,
+                race_type=rng.choice(race_types), experience_level=rng.choice(levels),
+                wager_amount=rng.choice([0, 0, 0, 50, 100, 500]), message='Seeded callout: run what you brung.',
+                is_private=rng.random() < 0.1, status=rng.choice(CALLOUT_STATUSES),
+            )
+
+
+def _listings(rng, user_ids, per_user):
+    categories = [choice for choice, _ in Marketplace._meta.get_field('category').choices]
+    conditions = [choice for choice, _ in Marketplace._meta.get_field('condition').choices]
+    for seller_id in user_ids:
+        if rng.random() >= per_user:
+            continue
+        make = rng.choice(list(CAR_MAKES))
+        city, state, _, _ = rng.choice(CITIES)
+        yield Marketplace(
+            seller_id=seller_id, title=f"{make} {rng.choice(PARTS)}", description=f"Pulled off my {make}, runs great.",
+            category=rng.choice(categories), condition=rng.choice(conditions),
+            price=rng.randint(50, 50000), location=f"{city}, {state}", is_active=rng.random() > 0.1,
+        )
+
+
+def _hotspots(rng, user_ids, count):
+    spot_types = [choice for choice, _ in HotSpot._meta.get_field('spot_type').choices]
+    for index in range(count):
+        city, state, latitude, longitude = rng.choice(CITIES)
+        yield HotSpot(
+            name=f"{city} Meet Spot {index}", description='Seeded meet spot', address=f"{rng.randint(100, 9999)} Main St",
+            city=city, state=state, zip_code=f"{rng.randint(10000, 99999)}",
+            latitude=round(latitude + rng.uniform(-0.3, 0.3), 6), longitude=round(longitude + rng.uniform(-0.3, 0.3), 6),
+            spot_type=rng.choice(spot_types), created_by_id=rng.choice(user_ids), is_verified=rng.random() < 0.3,
+        )
+
+
+def seeded_users():
+    """Queryset of every user created by seed()."""
+    return User.objects.filter(username__startswith=f"{SEED_PREFIX}_")
+
+
+def seed(scale=1, seed_value=0, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Generate the synthetic load-testing dataset.
+
+    Rows are appended after any users seeded earlier, so running it twice
+    doubles the dataset; delete seeded_users() to start over.
+
+    Args:
+        scale: Dataset size; 1 is USERS_PER_SCALE users, 1000 is a million
+        seed_value: Random seed; the same scale and seed give the same data
+        batch_size: Rows per INSERT
+        progress: Optional callable(table, rows, seconds) called after each table
+
+    Returns:
+        dict: Rows inserted per table
+    """
+    rng = random.Random(seed_value)
+    user_count = max(int(scale * USERS_PER_SCALE), 2)
+    start = seeded_users().count()
+    inserted = {}
+
+    def load(table, model, objects):
+        started = time.monotonic()
+        inserted[table] = bulk_insert(model, objects, batch_size)
+        elapsed = time.monotonic() - started
+        logger.info(f"Seeded {inserted[table]} {table} in {elapsed:.1f}s")
+        if progress:
+            progress(table, inserted[table], elapsed)
+
+    load('users', User, _users(user_count, start))
+    user_ids = list(
+        User.objects.filter(username__gte=_username(start), username__lte=_username(start + user_count - 1))
+        .order_by('id').values_list('id', flat=True)
+    )
+    load('profiles', UserProfile, _profiles(rng, user_ids))
+    load('follows', Follow, _follows(rng, user_ids, FOLLOWS_PER_USER))
+    load('posts', UserPost, _posts(rng, user_ids, POSTS_PER_USER))
+    load('callouts', Callout, _callouts(rng, user_ids, CALLOUTS_PER_USER))
+    load('listings', Marketplace, _listings(rng, user_ids, LISTINGS_PER_USER))
+    load('hotspots', HotSpot, _hotspots(rng, user_ids, max(int(scale * HOTSPOTS_PER_SCALE), 1)))
+    return inserted
@@ -0,0 +1,278 @@
+"""
+SEO Payloads for CalloutRacing Application
+
+Builds the meta tags and JSON-LD structured data served to crawlers for
+events, tracks, callouts, marketplace listings and hotspots, and caches
+them:
+- A payload is cached under the object's id and updated_at stamp, so an
+  edit can never serve an outdated payload
+- A small per-object pointer maps the id to its current stamp; with both
+  cached a request costs two cache reads and no queries
+- Unknown ids are remembered for a few minutes, so crawlers probing
+  deleted objects don't reach the database either
+- Saving or deleting an object drops its pointer (see core.signals)
+
+Warm the cache with `python manage.py warm_seo_cache`.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models.locations import HotSpot
+from .models.marketplace import MarketplaceListing
+from .models.racing import Callout, Event, Track
+from .sitemaps import site_url
+
+# Pointer value for ids with no object behind them
+MISSING = 'missing'
+MISSING_TIMEOUT = 300
+
+DEFAULT_IMAGE = '/android-chrome-192x192.png'
+
+
+def _image(obj, base_url):
+    image = getattr(obj, 'image', None)
+    return image.url if image else f"{base_url}{DEFAULT_IMAGE}"
+
+
+def event_payload(event, base_url):
+    track = event.track
+    return {
+        'title': f"{event.title} - Racing Event | CalloutRacing",
+        'description': f"Join {event.title} at {track.name if track else 'our racing venue'}. {event.description[:100]}...",
+        'keywords': f"racing event, {event.title}, drag racing, motorsports, racing competition",
+        'image': _image(event, base_url),
+        'url': f"{base_url}/events/{event.id}",
+        'type': 'event',
+        'structured_data': {
+            "@context": "https://schema.org",
+            "@type": "Event",
+            "name": event.title,
+            "description": event.description,
+            "startDate": event.start_date.isoformat() if event.start_date else None,
+            "endDate": event.end_date.isoformat() if event.end_date else None,
+            "location": {
+                "@type": "Place",
+                "name": track.name,
+                "address": {
+                    "@type": "PostalAddress",
+                    "addressLocality": track.location
+                }
+            } if track else None,
+            "organizer": {
+                "@type": "Organization",
+                "name": "CalloutRacing"
+            },
+            "url": f"{base_url}/events/{event.id}"
+        }
+    }
+
+
+def track_payload(track, base_url):
+    return {
+        'title': f"{track.name} - Race Track | CalloutRacing",
+        'description': f"Discover {track.name} in {track.location}. {track.description[:100]}...",
+        'keywords': f"race track, {track.name}, {track.location}, drag racing, motorsports",
+        'image': _image(track, base_url),
+        'url': f"{base_url}/tracks/{track.id}",
+        'type': 'website',
+        'structured_data': {
+            "@context": "https://schema.org",
+            "@type": "SportsActivityLocation",
+            "name": track.name,
+            "description": track.description,
+            "address": {
+                "@type": "PostalAddress",
+                "addressLocality": track.location,
+                "addressCountry": "US"
+            },
+            "url": f"{base_url}/tracks/{track.id}",
+            "sport": "Racing",
+            "facilityType": track.track_type
+        }
+    }
+
+
+def callout_payload(callout, base_url):
+    return {
+        'title': f"Racing Callout - {callout.message[:50]}... | CalloutRacing",
+        'description': f"Racing callout: {callout.message[:150]}...",
+        'keywords': "racing callout, drag racing challenge, racing competition, motorsports",
+        'image': f"{base_url}{DEFAULT_IMAGE}",
+        'url': f"{base_url}/callouts/{callout.id}",
+        'type': 'website',
+        'structured_data': {
+            "@context": "https://schema.org",
+            "@type": "SportsEvent",
+            "name": "Racing Callout",
+            "description": callout.message,
+            "sport": "Racing",
+            "url": f"{base_url}/callouts/{callout.id}"
+        }
+    }
+
+
+def listing_payload(listing, base_url):
+    return {
+        'title': f"{listing.title} - Racing Marketplace | CalloutRacing",
+        'description': f"Buy {listing.title} in the racing marketplace. {listing.description[:100]}...",
+        'keywords': f"racing marketplace, {listing.title}, racing equipment, automotive parts",
+        'image': _image(listing, base_url),
+        'url': f"{base_url}/marketplace/{listing.id}",
+        'type': 'website',
+        'structured_data': {
+            "@context": "https://schema.org",
+            "@type": "Product",
+            "name": listing.title,
+            "description": listing.description,
+            "category": listing.category.name if listing.category else "Racing Equipment",
+            "url": f"{base_url}/marketplace/{listing.id}",
+            "offers": {
+                "@type": "Offer",
+                "price": str(listing.price),
+                "priceCurrency": "USD",
+                "availability": "https://schema.org/InStock" if listing.is_active else "https://schema.org/OutOfStock"
+            }
+        }
+    }
+
+
+def hotspot_payload(hotspot, base_url):
+    return {
+        'title': f"{hotspot.name} - Racing Hotspot | CalloutRacing",
+        'description': f"Discover {hotspot.name} in {hotspot.city}, {hotspot.state}. {hotspot.description[:100]}...",
+        'keywords': f"racing hotspot, {hotspot.name}, {hotspot.city}, car meets, racing location",
+        'image': f"{base_url}{DEFAULT_IMAGE}",
+        'url': f"{base_url}/hotspots/{hotspot.id}",
+        'type': 'website',
+        'structured_data': {
+            "@context": "https://schema.org",
+            "@type": "Place",
+            "name": hotspot.name,
+            "description": hotspot.description,
+            "address": {
+                "@type": "PostalAddress",
+                "streetAddress": hotspot.address,
+                "addressLocality": hotspot.city,
+                "addressRegion": hotspot.state,
+                "postalCode": hotspot.zip_code
+            },
+            "url": f"{base_url}/hotspots/{hotspot.id}"
+        }
+    }
+
+
+def general_payload(base_url):
+    return {
+        'title': 'CalloutRacing - Ultimate Racing Community Platform | Find Events, Challenge Racers',
+        'description': 'Join the ultimate racing community! Find drag racing events, challenge other racers, discover tracks and hotspots, buy/sell cars, and connect with car enthusiasts nationwide.',
+        'keywords': 'racing, drag racing, car community, racing events, car meets, race tracks, car enthusiasts, automotive, motorsports, racing platform, car marketplace, racing hotspots',
+        'image': f"{base_url}{DEFAULT_IMAGE}",
+        'url': base_url,
+        'type': 'website',
+        'structured_data': {
+            "@context": "https://schema.org",
+            "@type": "WebSite",
+            "name": "CalloutRacing",
+            "url": base_url,
+            "description": "Ultimate racing community platform for finding events, challenging racers, and connecting with car enthusiasts"
+        }
+    }
+
+
+# content type -> (queryset factory, payload builder, stamp)
+# The stamp covers every row the payload reads, so an edit to any of them
+# yields a new payload key
+CONTENT_TYPES = {
+    'event': (
+        lambda: Event.objects.select_related('track'), event_payload,
+        lambda event: f"{event.updated_at.timestamp()}-{event.track.updated_at.timestamp()}",
+    ),
+    'track': (lambda: Track.objects.all(), track_payload, lambda track: f"{track.updated_at.timestamp()}"),
+    'callout': (lambda: Callout.objects.all(), callout_payload, lambda callout: f"{callout.updated_at.timestamp()}"),
+    'listing': (
+        lambda: MarketplaceListing.objects.select_related('category'), listing_payload,
+        # ListingCategory has no updated_at; its name stands in for it
+        lambda listing: f"{listing.updated_at.timestamp()}-{listing.category.name}",
+    ),
+    'hotspot': (lambda: HotSpot.objects.all(), hotspot_payload, lambda hotspot: f"{hotspot.updated_at.timestamp()}"),
+}
+
+
+def _timeout():
+    return getattr(settings, 'SEO_CACHE_TIMEOUT', 86400)
+
+
+def _pointer_key(content_type, object_id):
+    return f"seo:{content_type}:{object_id}"
+
+
+def _payload_key(content_type, object_id, stamp):
+    stamp = hashlib.md5(stamp.encode('utf-8')).hexdigest()
+    return f"seo:{content_type}:{object_id}:{stamp}"
+
+
+def _store(content_type, obj):
+    """Cache obj's payload (unless this version already is) and point its id at it."""
+    _, build, stamp_for = CONTENT_TYPES[content_type]
+    key = _payload_key(content_type, obj.id, stamp_for(obj))
+    payload = cache.get(key)
+    if payload is None:
+        payload = build(obj, site_url())
+        cache.set(key, payload, _timeout())
+    cache.set(_pointer_key(content_type, obj.id), key, _timeout())
+    return payload
+
+
+def get_payload(content_type, object_id):
+    """
+    Cached SEO payload for one object.
+
+    Args:
+        content_type: A CONTENT_TYPES key
+        object_id: Primary key of the object
+
+    Returns:
+        dict or None: The payload, or None when the object doesn't exist
+    """
+    pointer = cache.get(_pointer_key(content_type, object_id))
+    if pointer == MISSING:
+        return None
+    if pointer is not None:
+        payload = cache.get(pointer)
+        if payload is not None:
+            return payload
+
+    queryset, _, _ = CONTENT_TYPES[content_type]
+    obj = queryset().filter(pk=object_id).first()
+    if obj is None:
+        cache.set(_pointer_key(content_type, object_id), MISSING, MISSING_TIMEOUT)
+        return None
+    return _store(content_type, obj)
+
+
+def invalidate(content_type, object_ids):
+    """Drop the pointers of changed objects; their next request rebuilds the payload."""
+    cache.delete_many([_pointer_key(content_type, object_id) for object_id in object_ids])
+
+
+def warm(content_types=None, batch_size=500):
+    """
+    Cache the payloads of every object of the given content types.
+
+    Args:
+        content_types: CONTENT_TYPES keys (default: all)
+        batch_size: Rows fetched from the database per query
+
+    Returns:
+        int: Number of objects cached
+    """
+    total = 0
+    for content_type in content_types or CONTENT_TYPES:
+        queryset, _, _ = CONTENT_TYPES[content_type]
+        for obj in queryset().order_by('pk').iterator(chunk_size=batch_size):
+            _store(content_type, obj)
+            total += 1
+    return total
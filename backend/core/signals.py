@@ -1,23 +1,171 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.db.models import F
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import UserProfile
+from .models import (
+    Block, Callout, Event, EventParticipant, Follow, HotSpot, ListingCategory, Marketplace, MarketplaceListing,
+    ReputationRating, Subscription, Track, UserProfile,
+)
+from .marketplace_search import invalidate_search_cache
+from . import blocks, entitlements, event_calendar, follow_graph, reputation, seo, token_service
 
 User = get_user_model()
 
 
 @receiver(post_save, sender=User)
-def create_user_profile(sender, instance, created, **kwargs):
-    """Create a UserProfile when a User is created"""
-    if created:
+def create_user_profile(sender, instance, created, raw=False, **kwargs):
+    """
+    Create a UserProfile when a User is created.
+
+    Profile columns don't mirror any User columns, so later User saves (such as
+    the last_login update on every login) leave the profile row untouched.
+    """
+    if created and not raw:
+        # Creating through the relation also caches instance.profile
         UserProfile.objects.create(user=instance)
 
 
+@receiver(pre_save, sender=User)
+def remember_previous_active(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Note whether a user being saved as inactive was active before; only deactivating saves query."""
+    instance._was_active = None
+    if raw or instance.pk is None or instance.is_active:
+        return
+    if update_fields is not None and 'is_active' not in update_fields:
+        return
+    instance._was_active = sender.objects.filter(pk=instance.pk).values_list('is_active', flat=True).first()
+
+
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    """Save the UserProfile when a User is saved"""
-    try:
-        instance.profile.save()
-    except UserProfile.DoesNotExist:
-        # If profile doesn't exist, create it
-        UserProfile.objects.create(user=instance) 
\ No newline at end of file
+def revoke_tokens_on_deactivation(sender, instance, raw=False, **kwargs):
+    """Access tokens aren't checked against the user row; cut off a deactivated user's tokens."""
+    if not raw and getattr(instance, '_was_active', None) and not instance.is_active:
+        token_service.revoke_all_for_user(instance)
+
+
+@receiver(post_delete, sender=User)
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    """Outstanding tokens of a deleted user must not reach views that load the user row."""
+    token_service.revoke_all_for_user(instance)
+
+
+@receiver(post_save, sender=Marketplace)
+@receiver(post_delete, sender=Marketplace)
+def invalidate_marketplace_search(sender, **kwargs):
+    """Cached marketplace facets are stale once any listing changes."""
+    invalidate_search_cache()
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def invalidate_entitlements(sender, instance, **kwargs):
+    """A subscription change (usually a Stripe webhook) can change the user's plan."""
+    entitlements.invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=EventParticipant)
+def count_event_participant(sender, instance, created, raw=False, **kwargs):
+    """Keep Event.participant_count in step; core.event_registration counts its own joins."""
+    if created and not raw and not getattr(instance, '_counted', False):
+        Event.objects.filter(pk=instance.event_id).update(participant_count=F('participant_count') + 1)
+    event_calendar.invalidate_user_calendar(instance.user_id)
+
+
+@receiver(post_delete, sender=EventParticipant)
+def uncount_event_participant(sender, instance, **kwargs):
+    Event.objects.filter(pk=instance.event_id, participant_count__gt=0).update(
+        participant_count=F('participant_count') - 1
+    )
+    event_calendar.invalidate_user_calendar(instance.user_id)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_calendar(sender, **kwargs):
+    """Cached calendar buckets are stale once any event changes."""
+    event_calendar.invalidate_calendar()
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Track)
+@receiver(post_delete, sender=Track)
+@receiver(post_save, sender=Callout)
+@receiver(post_delete, sender=Callout)
+@receiver(post_save, sender=MarketplaceListing)
+@receiver(post_delete, sender=MarketplaceListing)
+@receiver(post_save, sender=HotSpot)
+@receiver(post_delete, sender=HotSpot)
+def invalidate_seo_payload(sender, instance, **kwargs):
+    """Cached SEO payloads are rebuilt on their next request once the object changes."""
+    content_type = {
+        Event: 'event', Track: 'track', Callout: 'callout', MarketplaceListing: 'listing', HotSpot: 'hotspot',
+    }[sender]
+    seo.invalidate(content_type, [instance.pk])
+    if sender is Track:
+        # Event payloads include the track's name and location
+        seo.invalidate('event', Event.objects.filter(track_id=instance.pk).values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=ListingCategory)
+def invalidate_category_seo_payloads(sender, instance, **kwargs):
+    """Listing payloads include their category's name."""
+    seo.invalidate('listing', MarketplaceListing.objects.filter(category_id=instance.pk).values_list('pk', flat=True))
+
+
+def _rating_state(user_id, rating):
+    return (user_id, rating) if user_id is not None and rating is not None else None
+
+
+def _locked_rating_state(sender, pk):
+    # Runs inside the rating's save/delete transaction; the row lock makes a
+    # concurrent edit of the same rating wait until this one's summary update commits
+    previous = sender.objects.select_for_update().filter(pk=pk).values_list('rated_user_id', 'rating').first()
+    return _rating_state(*previous) if previous else None
+
+
+@receiver(pre_save, sender=ReputationRating)
+def remember_previous_rating(sender, instance, raw=False, **kwargs):
+    """Note what an edited rating contributed before, so the summary can be moved by the difference."""
+    instance._previous_rating = None
+    if instance.pk and not raw:
+        instance._previous_rating = _locked_rating_state(sender, instance.pk)
+
+
+@receiver(post_save, sender=ReputationRating)
+def update_reputation_summary(sender, instance, raw=False, **kwargs):
+    if not raw:
+        reputation.record_change(
+            getattr(instance, '_previous_rating', None), _rating_state(instance.rated_user_id, instance.rating)
+        )
+
+
+@receiver(pre_delete, sender=ReputationRating)
+def remember_deleted_rating(sender, instance, **kwargs):
+    """Read the committed rating rather than the in-memory one, which may be stale."""
+    instance._previous_rating = _locked_rating_state(sender, instance.pk)
+
+
+@receiver(post_delete, sender=ReputationRating)
+def remove_from_reputation_summary(sender, instance, **kwargs):
+    reputation.record_change(getattr(instance, '_previous_rating', None), None)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_follow_graph(sender, instance, **kwargs):
+    follow_graph.invalidate(instance.follower_id, instance.following_id)
+
+
+@receiver(post_save, sender=Block)
+@receiver(post_delete, sender=Block)
+def invalidate_blocked_follow_graph(sender, instance, **kwargs):
+    """Blocking removes follows in both directions; drop both users' entries even if that bypassed signals."""
+    follow_graph.invalidate(instance.blocker_id, instance.blocked_id)
+    follow_graph.invalidate(instance.blocked_id, instance.blocker_id)
+
+
+@receiver(post_save, sender=Block)
+@receiver(post_delete, sender=Block)
+def invalidate_block_sets(sender, instance, **kwargs):
+    blocks.invalidate(instance.blocker_id, instance.blocked_id)
@@ -0,0 +1,279 @@
+"""
+Sitemap Pipeline for CalloutRacing Application
+
+Pre-renders XML sitemaps to storage (default_storage, under sitemaps/):
+- Every public URL is listed. Each content type is split into chunk files
+  of at most CHUNK_SIZE URLs, covering fixed ID ranges, and
+  sitemap.xml is the index of all of them
+- Builds are incremental: a chunk is rewritten only when its row count
+  or latest updated_at changed since the last build (recorded in
+  manifest.json), so an unchanged site costs one aggregate query per
+  chunk
+- Rows are streamed from the database into the files, never held in
+  memory all at once
+- <lastmod> is the newest updated_at of the rows a file lists
+
+Build with `python manage.py build_sitemaps`; api.views.seo serves the
+files with Last-Modified headers.
+"""
+
+import json
+import logging
+import tempfile
+from collections import namedtuple
+from itertools import chain
+from datetime import timezone as dt_timezone
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from .models.locations import HotSpot
+from .models.marketplace import Marketplace
+from .models.racing import Callout, Event, Track
+
+logger = logging.getLogger(__name__)
+
+# The sitemap protocol allows up to 50,000 URLs per file
+CHUNK_SIZE = 50000
+STORAGE_DIR = 'sitemaps'
+INDEX_FILE = 'sitemap.xml'
+PAGES_FILE = 'sitemap-pages.xml'
+MANIFEST_FILE = 'manifest.json'
+
+SitemapSection = namedtuple('SitemapSection', ['name', 'model', 'visible', 'path', 'changefreq', 'priority'])
+
+SECTIONS = [
+    SitemapSection('events', Event, Q(is_public=True, is_active=True), '/events/{id}', 'weekly', '0.7'),
+    SitemapSection('tracks', Track, Q(is_active=True), '/tracks/{id}', 'monthly', '0.6'),
+    SitemapSection('callouts', Callout, Q(is_private=False, status='pending'), '/callouts/{id}', 'daily', '0.6'),
+    SitemapSection('listings', Marketplace, Q(is_active=True), '/marketplace/{id}', 'weekly', '0.6'),
+    SitemapSection('hotspots', HotSpot, Q(is_active=True), '/hotspots/{id}', 'monthly', '0.5'),
+]
+
+STATIC_PAGES = [
+    ('/', 'daily', '1.0'),
+    ('/about', 'monthly', '0.8'),
+    ('/contact', 'monthly', '0.7'),
+    ('/callouts', 'hourly', '0.9'),
+    ('/events', 'daily', '0.9'),
+    ('/tracks', 'weekly', '0.8'),
+    ('/hotspots', 'daily', '0.8'),
+    ('/marketplace', 'daily', '0.8'),
+    ('/social', 'hourly', '0.8'),
+    ('/login', 'monthly', '0.6'),
+    ('/signup', 'monthly', '0.6'),
+]
+
+URLSET_OPEN = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = '</urlset>\n'
+
+
+def site_url():
+    """Public site root that page URLs (sitemaps, structured data) are built on."""
+    return getattr(settings, 'SITEMAP_SITE_URL', settings.FRONTEND_URL).rstrip('/')
+
+
+def _files_url():
+    return (getattr(settings, 'SITEMAP_FILES_URL', '') or f"{site_url()}/sitemaps").rstrip('/')
+
+
+def _path(filename):
+    return f"{STORAGE_DIR}/{filename}"
+
+
+def format_lastmod(value):
+    """W3C datetime in UTC, as sitemaps expect."""
+    return value.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%S+00:00')
+
+
+def _url_entry(loc, lastmod=None, changefreq=None, priority=None):
+    parts = [f"<url><loc>{escape(loc)}</loc>"]
+    if lastmod:
+        parts.append(f"<lastmod>{lastmod}</lastmod>")
+    if changefreq:
+        parts.append(f"<changefreq>{changefreq}</changefreq>")
+    if priority:
+        parts.append(f"<priority>{priority}</priority>")
+    parts.append("</url>\n")
+    return ''.join(parts)
+
+
+def _write(filename, chunks):
+    """Stream text chunks into a storage file, replacing any previous version."""
+    name = _path(filename)
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as buffer:
+        for chunk in chunks:
+            buffer.write(chunk.encode('utf-8'))
+        buffer.seek(0)
+        if default_storage.exists(name):
+            default_storage.delete(name)
+        default_storage.save(name, File(buffer))
+
+
+def _delete(filename):
+    name = _path(filename)
+    if default_storage.exists(name):
+        default_storage.delete(name)
+
+
+def read_manifest():
+    """The last build's manifest, or an empty one."""
+    name = _path(MANIFEST_FILE)
+    if not default_storage.exists(name):
+        return {'sections': {}}
+    with default_storage.open(name) as manifest:
+        return json.loads(manifest.read())
+
+
+def _range_filter(chunk):
+    condition = Q(id__gte=chunk['lo'])
+    if chunk['hi'] is not None:
+        condition &= Q(id__lt=chunk['hi'])
+    return condition
+
+
+def _plan_chunks(queryset, chunks):
+    """
+    Fixed ID ranges for a section's chunk files.
+
+    Existing ranges are kept, so a new row only ever changes the last file;
+    the open-ended last range is split whenever it outgrows CHUNK_SIZE.
+    """
+    chunks = [dict(chunk) for chunk in chunks] or [{'lo': 0, 'hi': None}]
+    last = chunks[-1]
+    while True:
+        boundary = list(
+            queryset.filter(id__gte=last['lo']).order_by('id').values_list('id', flat=True)[CHUNK_SIZE:CHUNK_SIZE + 1]
+        )
+        if not boundary:
+            return chunks
+        last['hi'] = boundary[0]
+        last = {'lo': boundary[0], 'hi': None}
+        chunks.append(last)
+
+
+def _section_entries(section, queryset):
+    root = site_url()
+    rows = queryset.order_by('id').values_list('id', 'updated_at').iterator(chunk_size=2000)
+    for object_id, updated_at in rows:
+        yield _url_entry(
+            root + section.path.format(id=object_id),
+            format_lastmod(updated_at) if updated_at else None,
+            section.changefreq,
+            section.priority,
+        )
+
+
+def _build_section(section, previous, full):
+    queryset = section.model.objects.filter(section.visible)
+    chunks = _plan_chunks(queryset, previous)
+    written = 0
+
+    for number, chunk in enumerate(chunks, start=1):
+        filename = f"sitemap-{section.name}-{number}.xml"
+        stats = queryset.filter(_range_filter(chunk)).aggregate(count=Count('id'), lastmod=Max('updated_at'))
+        count = stats['count']
+        # Full precision for change detection; <lastmod> only shows seconds
+        latest = stats['lastmod'].isoformat() if stats['lastmod'] else None
+        lastmod = format_lastmod(stats['lastmod']) if stats['lastmod'] else None
+        old = previous[number - 1] if number <= len(previous) else {}
+
+        changed = (
+            full or old.get('count') != count or old.get('latest') != latest
+            or old.get('hi') != chunk['hi'] or old.get('file') != filename
+        )
+        if changed:
+            if count:
+                entries = _section_entries(section, queryset.filter(_range_filter(chunk)))
+                _write(filename, chain([URLSET_OPEN], entries, [URLSET_CLOSE]))
+            else:
+                _delete(filename)
+            written += 1
+
+        chunk.update({'file': filename, 'count': count, 'latest': latest, 'lastmod': lastmod})
+
+    return chunks, written
+
+
+def _render_index(manifest):
+    files_url = _files_url()
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    yield f"<sitemap><loc>{escape(files_url)}/{PAGES_FILE}</loc></sitemap>\n"
+    for chunks in manifest['sections'].values():
+        for chunk in chunks:
+            if not chunk['count']:
+                continue
+            lastmod = f"<lastmod>{chunk['lastmod']}</lastmod>" if chunk['lastmod'] else ''
+            yield f"<sitemap><loc>{escape(files_url)}/{chunk['file']}</loc>{lastmod}</sitemap>\n"
+    yield '</sitemapindex>\n'
+
+
+def build_sitemaps(full=False):
+    """
+    Bring the stored sitemaps up to date.
+
+    Args:
+        full: Rewrite every file instead of only the changed ones
+
+    Returns:
+        dict: {'files_written': int, 'urls': int}
+    """
+    previous = read_manifest()
+    manifest = {'sections': {}}
+    files_written = 0
+
+    if full or not default_storage.exists(_path(PAGES_FILE)):
+        # Static pages have no meaningful modification time, so no <lastmod>
+        root = site_url()
+        _write(PAGES_FILE, [
+            URLSET_OPEN,
+            *[_url_entry(root + path, None, changefreq, priority) for path, changefreq, priority in STATIC_PAGES],
+            URLSET_CLOSE,
+        ])
+        files_written += 1
+
+    for section in SECTIONS:
+        chunks, written = _build_section(section, previous['sections'].get(section.name, []), full)
+        manifest['sections'][section.name] = chunks
+        files_written += written
+
+    _write(INDEX_FILE, _render_index(manifest))
+    files_written += 1
+    manifest['generated_at'] = timezone.now().isoformat()
+    name = _path(MANIFEST_FILE)
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    default_storage.save(name, ContentFile(json.dumps(manifest).encode('utf-8')))
+
+    urls = len(STATIC_PAGES) + sum(chunk['count'] for chunks in manifest['sections'].values() for chunk in chunks)
+    logger.info(f"Sitemaps built: {files_written} files written, {urls} URLs")
+    return {'files_written': files_written, 'urls': urls}
+
+
+def is_sitemap_file(filename):
+    """Whether filename is one this pipeline writes (guards the serving view)."""
+    if filename in (INDEX_FILE, PAGES_FILE):
+        return True
+    prefix, _, number = filename[:-len('.xml')].rpartition('-') if filename.endswith('.xml') else ('', '', '')
+    return number.isdigit() and prefix in {f"sitemap-{section.name}" for section in SECTIONS}
+
+
+def open_sitemap(filename):
+    """Open a stored sitemap file; raises FileNotFoundError if it hasn't been built."""
+    name = _path(filename)
+    if not default_storage.exists(name):
+        raise FileNotFoundError(name)
+    return default_storage.open(name)
+
+
+def sitemap_modified_time(filename):
+    name = _path(filename)
+    try:
+        return default_storage.get_modified_time(name)
+    except (FileNotFoundError, NotImplementedError, OSError):
+        return None
@@ -0,0 +1,274 @@
+"""
+SMS Providers for CalloutRacing Application
+
+Each provider wraps one SMS gateway behind the same small interface so the
+SMS queue can fail over between them:
+- TwilioProvider: Twilio REST API over a pooled HTTP session
+- VonageProvider: Vonage (Nexmo) SMS API over a pooled HTTP session
+- SNSProvider: AWS SNS through a reused boto3 client (optional dependency)
+- ConsoleProvider: logs messages instead of sending them (development only;
+  the queue counts them as sent only when DEBUG is on)
+- LocMemProvider: keeps messages in LocMemProvider.outbox (tests)
+
+settings.SMS_PROVIDERS lists provider names in failover order; providers
+without credentials are skipped. A provider is only cooled down for errors
+that affect every message (transport failures, HTTP 5xx and 429); a 4xx for
+one message, e.g. an invalid number, leaves it in rotation.
+"""
+
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# SNS Integration
+try:
+    import boto3
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+    boto3 = None
+
+
+class SMSDeliveryError(Exception):
+    """
+    Raised when a provider could not accept a message.
+
+    `provider_failure` is True when the provider itself is unavailable
+    (network error, 5xx, rate limited) rather than rejecting this message.
+    """
+
+    def __init__(self, message, provider_failure=True):
+        super().__init__(message)
+        self.provider_failure = provider_failure
+
+
+def mask_phone(phone_number):
+    """Mask a phone number for logging purposes."""
+    if len(phone_number) > 5:
+        return f"{phone_number[:3]}***{phone_number[-2:]}"
+    return "***"
+
+
+class SMSProvider:
+    """Base class for SMS gateways."""
+    name = None
+    # False for providers that only pretend to send (console outside DEBUG)
+    delivers = True
+
+    def is_configured(self):
+        """Whether the credentials this provider needs are present."""
+        return True
+
+    def send(self, to, body):
+        """
+        Send a single message.
+
+        Args:
+            to: Recipient phone number in E.164 format
+            body: Message text
+
+        Returns:
+            str: Provider message id
+
+        Raises:
+            SMSDeliveryError: If the provider rejected the message
+        """
+        raise NotImplementedError
+
+
+class HTTPProvider(SMSProvider):
+    """Provider talking to a REST API over one keep-alive session per process."""
+
+    def __init__(self):
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                pool_size = getattr(settings, 'SMS_HTTP_POOL_SIZE', 10)
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+                self._session = session
+            return self._session
+
+    def post(self, url, **kwargs):
+        try:
+            response = self.session.post(url, timeout=getattr(settings, 'SMS_HTTP_TIMEOUT', 10), **kwargs)
+        except requests.RequestException as e:
+            raise SMSDeliveryError(f"{self.name} request failed: {str(e)}") from e
+        if response.status_code >= 400:
+            raise SMSDeliveryError(
+                f"{self.name} returned HTTP {response.status_code}: {response.text[:200]}",
+                provider_failure=response.status_code == 429 or response.status_code >= 500,
+            )
+        return response.json()
+
+
+class TwilioProvider(HTTPProvider):
+    name = 'twilio'
+
+    def is_configured(self):
+        return all([settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN, settings.TWILIO_FROM_NUMBER])
+
+    def send(self, to, body):
+        data = self.post(
+            f"https://api.twilio.com/2010-04-01/Accounts/{settings.TWILIO_ACCOUNT_SID}/Messages.json",
+            auth=(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN),
+            data={'To': to, 'From': settings.TWILIO_FROM_NUMBER, 'Body': body},
+        )
+        return data.get('sid', '')
+
+
+class VonageProvider(HTTPProvider):
+    name = 'vonage'
+
+    def is_configured(self):
+        return all([settings.VONAGE_API_KEY, settings.VONAGE_API_SECRET, settings.VONAGE_FROM_NUMBER])
+
+    def send(self, to, body):
+        data = self.post(
+            'https://rest.nexmo.com/sms/json',
+            data={
+                'api_key': settings.VONAGE_API_KEY,
+                'api_secret': settings.VONAGE_API_SECRET,
+                'from': settings.VONAGE_FROM_NUMBER,
+                'to': to.lstrip('+'),
+                'text': body,
+            },
+        )
+        # Vonage reports per-message failures with HTTP 200
+        message = (data.get('messages') or [{}])[0]
+        if message.get('status') != '0':
+            # Status 1 is throttling and 5 an internal error; the rest are about this message
+            raise SMSDeliveryError(
+                f"vonage rejected message: {message.get('error-text', 'unknown error')}",
+                provider_failure=message.get('status') in ('1', '5'),
+            )
+        return message.get('message-id', '')
+
+
+class SNSProvider(SMSProvider):
+    name = 'sns'
+
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+
+    def is_configured(self):
+        return BOTO3_AVAILABLE and all([settings.AWS_ACCESS_KEY_ID, settings.AWS_SECRET_ACCESS_KEY])
+
+    @property
+    def client(self):
+        # boto3 clients keep their own connection pool, so build one per process
+        with self._lock:
+            if self._client is None:
+                self._client = boto3.client(
+                    'sns',
+                    region_name=settings.AWS_REGION,
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                )
+            return self._client
+
+    def send(self, to, body):
+        try:
+            response = self.client.publish(PhoneNumber=to, Message=body)
+        except Exception as e:
+            # botocore ClientErrors carry the HTTP status; anything else is a transport failure
+            status_code = (getattr(e, 'response', None) or {}).get('ResponseMetadata', {}).get('HTTPStatusCode', 500)
+            raise SMSDeliveryError(
+                f"sns publish failed: {str(e)}",
+                provider_failure=status_code == 429 or status_code >= 500,
+            ) from e
+        return response.get('MessageId', '')
+
+
+class ConsoleProvider(SMSProvider):
+    name = 'console'
+
+    @property
+    def delivers(self):
+        # In development the log line is the delivery: it carries the OTP code
+        return settings.DEBUG
+
+    def send(self, to, body):
+        if settings.DEBUG:
+            logger.info(f"📱 SMS to {mask_phone(to)} (console provider): {body}")
+        else:
+            logger.info(f"📱 SMS to {mask_phone(to)} (console provider, not delivered)")
+        return ''
+
+
+class LocMemProvider(SMSProvider):
+    name = 'locmem'
+    outbox = []
+
+    def send(self, to, body):
+        LocMemProvider.outbox.append({'to': to, 'body': body})
+        return f"locmem-{len(LocMemProvider.outbox)}"
+
+
+PROVIDER_CLASSES = {
+    cls.name: cls
+    for cls in (TwilioProvider, VonageProvider, SNSProvider, ConsoleProvider, LocMemProvider)
+}
+
+_instances = {}
+_cooldown_until = {}
+
+
+def get_provider(name):
+    """Return the shared instance of a provider, so pooled sessions are reused."""
+    if name not in _instances:
+        _instances[name] = PROVIDER_CLASSES[name]()
+    return _instances[name]
+
+
+def get_active_providers():
+    """Configured providers in failover order, skipping ones cooling down after a failure."""
+    now = time.monotonic()
+    providers = []
+    for name in getattr(settings, 'SMS_PROVIDERS', []):
+        if name not in PROVIDER_CLASSES:
+            logger.warning(f"Unknown SMS provider '{name}' in SMS_PROVIDERS")
+            continue
+        provider = get_provider(name)
+        if provider.is_configured() and _cooldown_until.get(name, 0) <= now:
+            providers.append(provider)
+    return providers
+
+
+def send_with_failover(to, body):
+    """
+    Send a message through the first provider that accepts it.
+
+    Returns:
+        tuple: (provider name, provider message id)
+
+    Raises:
+        SMSDeliveryError: If every active provider failed
+    """
+    providers = get_active_providers()
+    if not providers:
+        raise SMSDeliveryError('No SMS provider is configured')
+
+    errors = []
+    for provider in providers:
+        try:
+            return provider.name, provider.send(to, body)
+        except SMSDeliveryError as e:
+            if e.provider_failure:
+                # Skip this provider for a while so later messages go straight to the next one
+                _cooldown_until[provider.name] = time.monotonic() + getattr(settings, 'SMS_PROVIDER_COOLDOWN_SECONDS', 60)
+            logger.warning(f"SMS provider {provider.name} failed for {mask_phone(to)}: {str(e)}")
+            errors.append(str(e))
+
+    raise SMSDeliveryError('; '.join(errors))
@@ -0,0 +1,117 @@
+"""
+Outbound SMS Queue for CalloutRacing Application
+
+Text messages are stored as OutboundSMS rows and delivered by a background
+worker, so OTP requests return as soon as the code is persisted:
+- Batches of due messages are claimed with a lease (see core.background)
+- Each message fails over between the providers in settings.SMS_PROVIDERS
+- Failed deliveries are retried with exponential backoff; a message only
+  handled by the console provider counts as sent when DEBUG is on and as
+  failed otherwise
+- Sent and failed messages (OTP codes) are deleted after
+  settings.OUTBOX_RETENTION_HOURS by `python manage.py purge_outbox`
+
+Run a dedicated worker with `python manage.py process_sms_queue --loop`
+when BACKGROUND_WORKER_MODE is 'external'.
+"""
+
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+
+from .background import BackgroundWorker, claim_due, purge_finished, retry_delay
+from .models.outbox import OutboundSMS
+from .sms_providers import SMSDeliveryError, get_provider, mask_phone, send_with_failover
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_sms(to, body):
+    """
+    Queue a text message for background delivery.
+
+    Args:
+        to: Recipient phone number in E.164 format
+        body: Message text
+
+    Returns:
+        OutboundSMS: The queued message
+    """
+    sms = OutboundSMS.objects.create(to=to, body=body)
+    sms_worker.notify()
+    return sms
+
+
+def deliver_pending_sms(batch_size=None):
+    """
+    Deliver every due text message.
+
+    Args:
+        batch_size: Messages claimed per round trip, defaults to settings.SMS_QUEUE_BATCH_SIZE
+
+    Returns:
+        dict: {'sent': int, 'retried': int, 'failed': int}
+    """
+    batch_size = batch_size or getattr(settings, 'SMS_QUEUE_BATCH_SIZE', 50)
+    max_attempts = getattr(settings, 'SMS_QUEUE_MAX_ATTEMPTS', 3)
+    results = {'sent': 0, 'retried': 0, 'failed': 0}
+
+    while True:
+        batch = claim_due(OutboundSMS, batch_size)
+        if not batch:
+            break
+
+        for sms in batch:
+            sms.attempts += 1
+            try:
+                provider, message_id = send_with_failover(sms.to, sms.body)
+                if not get_provider(provider).delivers:
+                    # Retried later, when a real provider may be back
+                    raise SMSDeliveryError(f"{provider} provider does not deliver messages")
+                sms.provider, sms.provider_message_id = provider, message_id
+            except Exception as e:
+                sms.last_error = str(e)
+                if sms.attempts >= max_attempts:
+                    sms.status = 'failed'
+                    results['failed'] += 1
+                    logger.error(f"Giving up on SMS to {mask_phone(sms.to)} after {sms.attempts} attempts: {str(e)}")
+                else:
+                    sms.next_attempt_at = timezone.now() + retry_delay(sms.attempts)
+                    results['retried'] += 1
+            else:
+                sms.status = 'sent'
+                sms.sent_at = timezone.now()
+                sms.last_error = ''
+                results['sent'] += 1
+                logger.info(f"SMS sent to {mask_phone(sms.to)} via {sms.provider}")
+
+            sms.lease_token = None
+            sms.save(update_fields=[
+                'attempts', 'status', 'provider', 'provider_message_id', 'sent_at',
+                'last_error', 'next_attempt_at', 'lease_token',
+            ])
+
+    return results
+
+
+def purge_finished_sms(retention_hours=None, batch_size=1000):
+    """
+    Delete sent and failed text messages older than the retention window.
+
+    Args:
+        retention_hours: Defaults to settings.OUTBOX_RETENTION_HOURS
+        batch_size: Rows deleted per statement
+
+    Returns:
+        int: Number of text messages deleted
+    """
+    if retention_hours is None:
+        retention_hours = getattr(settings, 'OUTBOX_RETENTION_HOURS', 24)
+    deleted = purge_finished(OutboundSMS, retention_hours, batch_size)
+    if deleted:
+        logger.info(f"Purged {deleted} finished text messages")
+    return deleted
+
+
+sms_worker = BackgroundWorker('sms-queue', deliver_pending_sms)
@@ -0,0 +1,142 @@
+"""
+Stripe Object Cache for CalloutRacing Application
+
+Read-through cache for Stripe objects that views look up on page loads:
+- retrieve() serves accounts, customers, prices and checkout sessions from
+  the Django cache and only calls Stripe on a miss
+- Webhook events invalidate the objects they describe (see
+  core.webhook_inbox.record_event), so TTLs are only a backstop
+- Open checkout sessions are cached briefly because their status changes
+  as the customer pays; completed and expired sessions never change
+"""
+
+import logging
+import time
+from functools import reduce
+
+import stripe
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Stripe API class for each cached resource, resolved when used so tests can
+# swap in a stub client
+RESOURCES = {
+    'account': 'Account',
+    'customer': 'Customer',
+    'price': 'Price',
+    'checkout_session': 'checkout.Session',
+}
+
+# Value of a Stripe object's `object` field for each resource
+OBJECT_TYPES = {
+    'account': 'account',
+    'customer': 'customer',
+    'price': 'price',
+    'checkout.session': 'checkout_session',
+}
+
+OPEN_SESSION_TIMEOUT = 30
+FINAL_SESSION_TIMEOUT = 86400
+# How long a checkout session is offered again for the same purchase
+REUSE_TIMEOUT = 1800
+
+
+def _cache_key(resource, object_id):
+    return f"stripe:{resource}:{object_id}"
+
+
+def _api_class(resource):
+    return reduce(getattr, RESOURCES[resource].split('.'), stripe)
+
+
+def _timeout(resource, data):
+    if resource == 'checkout_session':
+        return FINAL_SESSION_TIMEOUT if data.get('status') in ('complete', 'expired') else OPEN_SESSION_TIMEOUT
+    return getattr(settings, 'STRIPE_CACHE_TIMEOUT', 3600)
+
+
+def _to_dict(obj):
+    return obj.to_dict_recursive() if hasattr(obj, 'to_dict_recursive') else dict(obj)
+
+
+def store(resource, obj):
+    """Cache a Stripe object returned by another API call (e.g. a create)."""
+    data = _to_dict(obj)
+    cache.set(_cache_key(resource, data['id']), data, _timeout(resource, data))
+
+
+def retrieve(resource, object_id):
+    """
+    Get a Stripe object, from the cache when possible.
+
+    Args:
+        resource: Key of RESOURCES
+        object_id: Stripe ID of the object
+
+    Returns:
+        StripeObject: The object, typed as Stripe returns it
+
+    Raises:
+        stripe.error.StripeError: If the object isn't cached and Stripe fails
+    """
+    data = cache.get(_cache_key(resource, object_id))
+    if data is None:
+        obj = _api_class(resource).retrieve(object_id)
+        store(resource, obj)
+        return obj
+    return stripe.util.convert_to_stripe_object(data, stripe.api_key)
+
+
+def invalidate(resource, object_id):
+    """Drop a cached Stripe object."""
+    cache.delete(_cache_key(resource, object_id))
+
+
+def invalidate_for_event(event):
+    """
+    Drop every cached object a webhook event describes.
+
+    Covers the event's object itself and, for Connect events and objects
+    owned by a connected account (capabilities, persons, external
+    accounts), that account.
+    """
+    data_object = event['data']['object']
+    resource = OBJECT_TYPES.get(data_object.get('object'))
+    if resource and data_object.get('id'):
+        invalidate(resource, data_object['id'])
+
+    for account_id in (event.get('account'), data_object.get('account')):
+        if isinstance(account_id, str):
+            invalidate('account', account_id)
+
+
+def reusable_checkout_session(key, create):
+    """
+    Return the open checkout session previously created for key, or create one.
+
+    Repeated clicks on a checkout button reuse one session instead of
+    creating a new one in Stripe each time.
+
+    Args:
+        key: Identifies the purchase, e.g. f"subscription:{user_id}:{price_id}"
+        create: Callable that creates the checkout session in Stripe
+
+    Returns:
+        StripeObject: An open checkout session
+    """
+    reuse_key = f"stripe:checkout_reuse:{key}"
+    session_id = cache.get(reuse_key)
+    if session_id:
+        try:
+            session = retrieve('checkout_session', session_id)
+            if session.get('status') == 'open' and (session.get('expires_at') or 0) > time.time() + 60:
+                return session
+        except stripe.error.StripeError as e:
+            logger.warning(f"Could not reuse checkout session {session_id}: {str(e)}")
+
+    session = create()
+    store('checkout_session', session)
+    cache.set(reuse_key, session.id, REUSE_TIMEOUT)
+    return session
@@ -0,0 +1,132 @@
+"""
+Token Service for CalloutRacing Application
+
+This module issues and revokes the signed (JWT) tokens used by mobile and
+API clients:
+- Access/refresh token pairs for a user
+- Revocation of a single access token (logout)
+- Revocation of every token issued to a user before a point in time
+  (password reset, account deactivation)
+
+Revocation state lives in the cache rather than the database so that
+checking it on every authenticated request stays a single cache round trip.
+Refresh tokens are additionally blacklisted in the database by
+rest_framework_simplejwt's token_blacklist app when they are rotated.
+"""
+
+import logging
+import time
+
+from django.core.cache import cache
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+REVOKED_JTI_KEY = "jwt_revoked:{jti}"
+REVOKED_BEFORE_KEY = "jwt_revoked_before:{user_id}"
+
+
+def issue_token_pair(user):
+    """
+    Issue a new access/refresh token pair for a user.
+
+    Args:
+        user: User instance to issue tokens for
+
+    Returns:
+        dict: {'access': str, 'refresh': str}
+    """
+    refresh = RefreshToken.for_user(user)
+    return {
+        'access': str(refresh.access_token),
+        'refresh': str(refresh),
+    }
+
+
+def _revocation_keys(payload):
+    jti = payload.get(api_settings.JTI_CLAIM)
+    user_id = payload.get(api_settings.USER_ID_CLAIM)
+    return (
+        REVOKED_JTI_KEY.format(jti=jti),
+        REVOKED_BEFORE_KEY.format(user_id=user_id),
+    )
+
+
+def is_revoked(payload):
+    """
+    Check whether a validated token payload has been revoked.
+
+    Args:
+        payload: Decoded token claims
+
+    Returns:
+        bool: True if the token was revoked individually or was issued
+        before the user's revocation cutoff
+    """
+    jti_key, before_key = _revocation_keys(payload)
+    state = cache.get_many([jti_key, before_key])
+
+    if jti_key in state:
+        return True
+
+    # iat has one-second resolution, so tokens minted in the same second as
+    # the cutoff (e.g. a login right after a password reset) stay valid
+    revoked_before = state.get(before_key)
+    if revoked_before is not None and payload.get('iat', 0) < revoked_before:
+        return True
+
+    return False
+
+
+def revoke_token(token):
+    """
+    Revoke a single token until it would have expired anyway.
+
+    Args:
+        token: A validated simplejwt Token instance (access or refresh)
+    """
+    jti_key, _ = _revocation_keys(token.payload)
+    remaining = int(token.payload.get('exp', 0) - time.time())
+    if remaining > 0:
+        cache.set(jti_key, True, remaining)
+
+    # Refresh tokens are also blacklisted permanently in the database
+    if hasattr(token, 'blacklist'):
+        try:
+            token.blacklist()
+        except TokenError:
+            pass
+
+
+def revoke_refresh_token(raw_token):
+    """
+    Revoke a refresh token given as a string.
+
+    Args:
+        raw_token: Encoded refresh token
+
+    Returns:
+        bool: True if the token was valid and has been revoked
+    """
+    try:
+        refresh = RefreshToken(raw_token)
+    except TokenError:
+        return False
+
+    revoke_token(refresh)
+    return True
+
+
+def revoke_all_for_user(user):
+    """
+    Revoke every token issued to a user up to now.
+
+    Args:
+        user: User instance whose tokens should be revoked
+    """
+    user_id = getattr(user, api_settings.USER_ID_FIELD)
+    lifetime = int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+    cache.set(REVOKED_BEFORE_KEY.format(user_id=user_id), int(time.time()), lifetime)
+    logger.info(f"Revoked all tokens for user {user_id}")
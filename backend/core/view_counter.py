@@ -0,0 +1,131 @@
+"""
+Buffered View Counting for CalloutRacing Application
+
+Counting a view with `obj.views += 1; obj.save()` writes the same hot row on
+every page view. Instead, record_view():
+- ignores repeat views by the same viewer within VIEW_COUNT_DEDUP_SECONDS
+  (tracked in the shared cache, so it holds across processes)
+- adds the view to an in-process buffer
+
+A background thread flushes the buffer every VIEW_COUNT_FLUSH_INTERVAL
+seconds, turning it into a few `UPDATE ... SET views = views + n WHERE id IN
+(...)` statements, one per (model, n). Views buffered in a process that is
+killed before its next flush are lost, which is acceptable for view counts.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from rest_framework.throttling import BaseThrottle
+
+from .background import BackgroundWorker
+
+logger = logging.getLogger(__name__)
+
+# Models whose `views` column is counted through this buffer
+COUNTED_MODELS = ('core.Marketplace', 'core.BuildLog', 'core.CarTour')
+UPDATE_CHUNK_SIZE = 500
+
+_lock = threading.Lock()
+_pending = defaultdict(int)
+
+
+def viewer_key(request):
+    """
+    Identify a viewer for deduplication: user id when logged in, else client IP.
+
+    The IP is resolved like DRF's throttles: the address REST_FRAMEWORK
+    ['NUM_PROXIES'] hops from the end of X-Forwarded-For (REMOTE_ADDR when
+    it's 0), so entries a client prepends itself are ignored.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    return f"ip:{BaseThrottle().get_ident(request)}"
+
+
+def record_view(obj, viewer):
+    """
+    Count a view of obj unless this viewer already viewed it recently.
+
+    Args:
+        obj: Instance of one of COUNTED_MODELS
+        viewer: Viewer identifier, usually viewer_key(request)
+
+    Returns:
+        bool: True if the view was counted
+    """
+    label = obj._meta.label
+    if label not in COUNTED_MODELS:
+        raise ValueError(f"{label} is not a view-counted model")
+
+    window = getattr(settings, 'VIEW_COUNT_DEDUP_SECONDS', 1800)
+    if not cache.add(f"viewed:{label}:{obj.pk}:{viewer}", 1, window):
+        return False
+
+    with _lock:
+        _pending[(label, obj.pk)] += 1
+
+    if getattr(settings, 'BACKGROUND_WORKER_MODE', 'thread') == 'inline':
+        flush_view_counts()
+    else:
+        view_count_worker.start()
+    return True
+
+
+def pending_views(obj):
+    """Views of obj recorded in this process but not flushed yet."""
+    with _lock:
+        return _pending.get((obj._meta.label, obj.pk), 0)
+
+
+def flush_view_counts():
+    """
+    Write buffered views to the database.
+
+    Returns:
+        int: Number of views flushed
+    """
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+    if not batch:
+        return 0
+
+    # One UPDATE per (model, delta, chunk of ids) so each statement adds the same n to many rows
+    grouped = defaultdict(list)
+    for (label, pk), delta in batch.items():
+        grouped[(label, delta)].append(pk)
+    remaining = [
+        (label, delta, ids[i:i + UPDATE_CHUNK_SIZE])
+        for (label, delta), ids in grouped.items()
+        for i in range(0, len(ids), UPDATE_CHUNK_SIZE)
+    ]
+
+    flushed = 0
+    try:
+        while remaining:
+            label, delta, ids = remaining[0]
+            apps.get_model(label).objects.filter(pk__in=ids).update(views=F('views') + delta)
+            flushed += delta * len(ids)
+            remaining.pop(0)
+    except Exception:
+        # Put back only the views that weren't written so the next flush retries them
+        with _lock:
+            for label, delta, ids in remaining:
+                for pk in ids:
+                    _pending[(label, pk)] += delta
+        raise
+
+    logger.debug(f"Flushed {flushed} buffered views")
+    return flushed
+
+
+view_count_worker = BackgroundWorker(
+    'view-counter', flush_view_counts, poll_interval=getattr(settings, 'VIEW_COUNT_FLUSH_INTERVAL', 30)
+)
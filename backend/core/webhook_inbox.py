@@ -0,0 +1,139 @@
+"""
+Stripe Webhook Inbox for CalloutRacing Application
+
+Webhook views verify the signature, store the event with record_event() and
+return 200 straight away. A background worker then processes stored events:
+- Each Stripe event ID is stored once per endpoint, so Stripe's retries
+  are ignored but an event sent to both endpoints reaches both handlers
+- Each event is handled in its own transaction and retried with backoff
+  if its handler raises
+- Events about the same Stripe object are handled in the order Stripe
+  created them; a later event waits until earlier ones are done
+- Cached copies of the objects an event describes (core.stripe_cache) are
+  dropped when the event arrives
+
+Run a dedicated worker with `python manage.py process_webhooks --loop`
+when BACKGROUND_WORKER_MODE is 'external'.
+"""
+
+import logging
+from datetime import timedelta
+
+import stripe
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import stripe_cache
+from .background import BackgroundWorker, claim_due, retry_delay
+from .models.payments import StripeWebhookEvent
+
+logger = logging.getLogger(__name__)
+
+# Function that handles a verified event for each webhook endpoint
+DISPATCHERS = {
+    'subscriptions': 'api.views.subscription_views.dispatch_event',
+    'marketplace': 'api.views.marketplace_views.dispatch_event',
+}
+
+# How long an event waits for an earlier event about the same object
+ORDERING_DELAY_SECONDS = 5
+
+
+def record_event(event, endpoint):
+    """
+    Store a verified Stripe event for background processing.
+
+    Args:
+        event: Event returned by stripe.Webhook.construct_event
+        endpoint: Key of DISPATCHERS for the receiving webhook
+
+    Returns:
+        bool: False if the event was already received by this endpoint
+    """
+    # Cached copies are stale as soon as Stripe reports a change
+    stripe_cache.invalidate_for_event(event)
+
+    data_object = event['data']['object']
+    try:
+        with transaction.atomic():
+            StripeWebhookEvent.objects.create(
+                event_id=event['id'],
+                event_type=event['type'],
+                endpoint=endpoint,
+                object_id=data_object.get('id') or '',
+                stripe_created=event.get('created') or 0,
+                payload=event.to_dict_recursive() if hasattr(event, 'to_dict_recursive') else event,
+            )
+    except IntegrityError:
+        logger.info(f"Ignoring duplicate Stripe event {event['id']} for {endpoint}")
+        return False
+
+    webhook_worker.notify()
+    return True
+
+
+def _has_earlier_pending(event):
+    if not event.object_id:
+        return False
+    return StripeWebhookEvent.objects.filter(
+        object_id=event.object_id,
+        status='pending',
+        stripe_created__lt=event.stripe_created,
+    ).exclude(pk=event.pk).exists()
+
+
+def process_webhook_events(batch_size=None):
+    """
+    Process every due webhook event.
+
+    Returns:
+        dict: {'processed': int, 'deferred': int, 'retried': int, 'failed': int}
+    """
+    batch_size = batch_size or getattr(settings, 'WEBHOOK_QUEUE_BATCH_SIZE', 50)
+    max_attempts = getattr(settings, 'WEBHOOK_QUEUE_MAX_ATTEMPTS', 8)
+    results = {'processed': 0, 'deferred': 0, 'retried': 0, 'failed': 0}
+    fields = ['status', 'attempts', 'last_error', 'next_attempt_at', 'lease_token', 'processed_at']
+
+    while True:
+        batch = claim_due(StripeWebhookEvent, batch_size)
+        if not batch:
+            break
+
+        for event in sorted(batch, key=lambda e: (e.stripe_created, e.id)):
+            if _has_earlier_pending(event):
+                event.next_attempt_at = timezone.now() + timedelta(seconds=ORDERING_DELAY_SECONDS)
+                event.lease_token = None
+                event.save(update_fields=fields)
+                results['deferred'] += 1
+                continue
+
+            event.attempts += 1
+            try:
+                dispatch = import_string(DISPATCHERS[event.endpoint])
+                with transaction.atomic():
+                    dispatch(stripe.Event.construct_from(event.payload, stripe.api_key))
+            except Exception as e:
+                event.last_error = str(e)
+                if event.attempts >= max_attempts:
+                    event.status = 'failed'
+                    results['failed'] += 1
+                    logger.error(f"Giving up on Stripe event {event.event_id} after {event.attempts} attempts: {str(e)}")
+                else:
+                    event.next_attempt_at = timezone.now() + retry_delay(event.attempts)
+                    results['retried'] += 1
+                    logger.warning(f"Stripe event {event.event_id} failed (attempt {event.attempts}), retrying: {str(e)}")
+            else:
+                event.status = 'processed'
+                event.processed_at = timezone.now()
+                event.last_error = ''
+                results['processed'] += 1
+
+            event.lease_token = None
+            event.save(update_fields=fields)
+
+    return results
+
+
+webhook_worker = BackgroundWorker('stripe-webhooks', process_webhook_events)
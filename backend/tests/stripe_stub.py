@@ -0,0 +1,94 @@
+"""
+Local Stripe stub for tests.
+
+StripeStub builds webhook events and signs them the way Stripe does, so the
+real signature verification runs. It also stands in for the Stripe API
+classes used by core.stripe_cache, serving objects from memory and
+recording API calls.
+"""
+
+import hashlib
+import hmac
+import json
+import time
+from unittest.mock import patch
+
+import stripe
+
+WEBHOOK_SECRET = 'whsec_test_secret'
+
+
+class FakeResource:
+    """Stands in for one Stripe API class (stripe.Account, stripe.checkout.Session, ...)."""
+
+    def __init__(self, stub, object_type):
+        self.stub = stub
+        self.object_type = object_type
+        self.created = 0
+
+    def retrieve(self, object_id, **params):
+        self.stub.calls.append(('retrieve', self.object_type, object_id))
+        data = self.stub.objects.get(object_id)
+        if data is None:
+            raise stripe.error.InvalidRequestError(f"No such {self.object_type}: '{object_id}'", 'id')
+        return stripe.util.convert_to_stripe_object(dict(data), stripe.api_key)
+
+    def create(self, **params):
+        self.created += 1
+        object_id = f"{self.object_type.replace('.', '_')}_test_{self.created}"
+        self.stub.calls.append(('create', self.object_type, object_id))
+        data = {'id': object_id, 'object': self.object_type, **self.stub.create_defaults.get(self.object_type, {})}
+        self.stub.objects[object_id] = data
+        return stripe.util.convert_to_stripe_object(dict(data), stripe.api_key)
+
+
+class StripeStub:
+    def __init__(self, secret=WEBHOOK_SECRET):
+        self.secret = secret
+        self.counter = 0
+        self.objects = {}
+        self.calls = []
+        self.resources = {}
+        self.create_defaults = {
+            'checkout.session': {
+                'status': 'open',
+                'url': 'https://checkout.stripe.test/session',
+                'expires_at': int(time.time()) + 86400,
+            },
+        }
+
+    def add(self, object_type, object_id, **fields):
+        self.objects[object_id] = {'id': object_id, 'object': object_type, **fields}
+
+    def api_calls(self, kind='retrieve'):
+        return [call for call in self.calls if call[0] == kind]
+
+    def resource(self, resource):
+        """The fake API class for a core.stripe_cache resource name."""
+        object_type = 'checkout.session' if resource == 'checkout_session' else resource
+        return self.resources.setdefault(resource, FakeResource(self, object_type))
+
+    def patch(self):
+        """Route core.stripe_cache's Stripe API calls to this stub; use as a context manager."""
+        return patch('core.stripe_cache._api_class', self.resource)
+
+    def event(self, event_type, data_object, created=None, account=None):
+        self.counter += 1
+        event = {
+            'id': f'evt_test_{self.counter}',
+            'object': 'event',
+            'type': event_type,
+            'created': created or int(time.time()),
+            'data': {'object': data_object},
+        }
+        if account:
+            event['account'] = account
+        return event
+
+    def signed(self, event):
+        payload = json.dumps(event)
+        timestamp = int(time.time())
+        signature = hmac.new(
+            self.secret.encode(), f'{timestamp}.{payload}'.encode(), hashlib.sha256
+        ).hexdigest()
+        return payload, f't={timestamp},v1={signature}'
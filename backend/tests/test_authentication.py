@@ -268,6 +268,213 @@ class AuthenticationSecurityTests(TestCase):
         # API returns 403 for invalid token, not 401
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
+class ProfileQueryCountTests(TestCase):
+    """Profile rows are only written when profile fields change."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user_data = {
+            'username': 'countuser',
+            'email': 'count@example.com',
+            'password': 'countpass123'
+        }
+
+    def capture(self, method, url, data):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as context:
+            response = method(url, data, format='json')
+        # Savepoints depend on the test transaction, not on the view
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if not query['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT'))
+        ]
+        return response, queries
+
+    def profile_writes(self, queries):
+        return [sql for sql in queries if sql.startswith(('INSERT', 'UPDATE')) and 'core_userprofile' in sql.split('(')[0]]
+
+    def test_user_save_does_not_write_profile(self):
+        user = User.objects.create_user(**self.user_data)
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
+
+    def test_registration_query_count(self):
+        response, queries = self.capture(self.client.post, reverse('register'), self.user_data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # username/email checks, user insert, profile insert, verification token update,
+        # verification email queued (OutboundEmail insert; delivery happens off the request)
+        self.assertEqual(len(queries), 6)
+        self.assertEqual(len(self.profile_writes(queries)), 2)
+
+    def test_login_query_count(self):
+        user = User.objects.create_user(**self.user_data)
+        user.profile.email_verified = True
+        user.profile.save()
+        response, queries = self.capture(self.client.post, reverse('login'), {
+            'username': self.user_data['username'],
+            'password': self.user_data['password']
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # user + profile lookup, session create, last_login update, refresh token, session save
+        self.assertEqual(len(queries), 7)
+        self.assertEqual(self.profile_writes(queries), [])
+
+class JWTAuthenticationTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.client = APIClient(enforce_csrf_checks=True)
+        self.user_data = {
+            'username': 'jwtuser',
+            'email': 'jwt@example.com',
+            'password': 'jwtpass123'
+        }
+        self.user = User.objects.create_user(**self.user_data)
+        profile, created = UserProfile.objects.get_or_create(user=self.user)
+        profile.email_verified = True
+        profile.save()
+        self.token_url = reverse('token-obtain')
+        self.refresh_url = reverse('token-refresh')
+        self.revoke_url = reverse('token-revoke')
+
+    def obtain(self):
+        response = self.client.post(self.token_url, {
+            'username': self.user_data['username'],
+            'password': self.user_data['password']
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_obtain_token_pair(self):
+        tokens = self.obtain()
+        self.assertIn('access', tokens)
+        self.assertIn('refresh', tokens)
+
+    def test_obtain_token_pair_requires_verified_email(self):
+        self.user.profile.email_verified = False
+        self.user.profile.save()
+        response = self.client.post(self.token_url, {
+            'username': self.user_data['username'],
+            'password': self.user_data['password']
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bearer_token_skips_session_and_csrf(self):
+        tokens = self.obtain()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        # Unsafe method without a CSRF token or session cookie
+        response = self.client.post(reverse('logout'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_authentication_does_not_query_database(self):
+        from django.test import RequestFactory
+        from api.authentication import StatelessJWTAuthentication
+        tokens = self.obtain()
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        with self.assertNumQueries(0):
+            user, token = StatelessJWTAuthentication().authenticate(request)
+            self.assertTrue(user.is_authenticated)
+            self.assertEqual(user.id, self.user.id)
+        # The user row is loaded lazily on first real use
+        self.assertEqual(user.username, self.user.username)
+
+    def test_refresh_rotation_blacklists_old_refresh_token(self):
+        tokens = self.obtain()
+        response = self.client.post(self.refresh_url, {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+        self.assertIn('refresh', response.data)
+        self.assertNotEqual(response.data['refresh'], tokens['refresh'])
+        # Re-using the rotated refresh token is rejected
+        response = self.client.post(self.refresh_url, {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_revokes_access_token(self):
+        tokens = self.obtain()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = self.client.post(reverse('logout'), {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.credentials()
+        response = self.client.post(self.refresh_url, {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoke_refresh_token(self):
+        tokens = self.obtain()
+        response = self.client.post(self.revoke_url, {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(self.refresh_url, {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def later(self):
+        """Move the revocation clock past the second the tokens were issued in."""
+        import time
+        return patch('core.token_service.time.time', return_value=time.time() + 1)
+
+    def test_revoke_all_for_user(self):
+        from core.token_service import revoke_all_for_user
+        tokens = self.obtain()
+        with self.later():
+            revoke_all_for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.credentials()
+        response = self.client.post(self.refresh_url, {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivation_revokes_tokens(self):
+        tokens = self.obtain()
+        self.user.is_active = False
+        with self.later():
+            self.user.save()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_refresh_rejects_inactive_or_missing_user(self):
+        from django.core.cache import cache
+        tokens = self.obtain()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        # Even without the cached revocation cutoff the refresh is refused
+        cache.clear()
+        response = self.client.post(self.refresh_url, {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        User.objects.filter(pk=self.user.pk).update(is_active=True)
+        tokens = self.obtain()
+        self.user.delete()
+        response = self.client.post(self.refresh_url, {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_token_is_rejected(self):
+        from django.core.cache import cache
+        tokens = self.obtain()
+        with self.later():
+            self.user.delete()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        # Without the cached revocation cutoff, loading the user fails authentication instead of erroring
+        cache.clear()
+        response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['code'], 'user_not_found')
+
+    def test_process_local_cache_fails_check_outside_debug(self):
+        from django.test import override_settings
+        from core.checks import check_shared_cache
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost:6379/0'}}
+        with override_settings(CACHES=locmem, DEBUG=False):
+            self.assertEqual([m.id for m in check_shared_cache(None)], ['core.E001'])
+        with override_settings(CACHES=locmem, DEBUG=True):
+            self.assertEqual([m.id for m in check_shared_cache(None)], ['core.W001'])
+        with override_settings(CACHES=redis, DEBUG=False):
+            self.assertEqual(check_shared_cache(None), [])
+
 class AuthenticationOTPTests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -0,0 +1,89 @@
+"""
+API Benchmark Suite Tests
+
+Tests for the benchmark measurements, the baseline comparison and the
+benchmark_api command.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core import benchmarks, seeding
+
+User = get_user_model()
+
+
+def result(p50=10.0, p95=20.0, queries=3, size=1000, status=200):
+    return {'p50_ms': p50, 'p95_ms': p95, 'queries': queries, 'bytes': size, 'status': status}
+
+
+class BenchmarkTests(TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(benchmarks.percentile(values, 0.5), 50)
+        self.assertEqual(benchmarks.percentile(values, 0.95), 95)
+        self.assertEqual(benchmarks.percentile([7], 0.95), 7)
+
+    def test_compare(self):
+        baseline = {'callouts': result(), 'marketplace': result()}
+
+        self.assertEqual(benchmarks.compare({'callouts': result(p95=23.0)}, baseline), [])
+
+        regressions = benchmarks.compare({
+            'callouts': result(p95=30.0, queries=4),
+            'marketplace': result(status=500),
+            'new-endpoint': result(),
+        }, baseline)
+        self.assertEqual(regressions, [
+            'callouts: queries 3 -> 4',
+            'callouts: p95_ms 20.0 -> 30.0 (+50%)',
+            'marketplace: status 200 -> 500',
+        ])
+
+    def test_run_suite(self):
+        seeding.seed(scale=0.01)
+        user = seeding.seeded_users().first()
+
+        results = benchmarks.run_suite(user, iterations=3, warmup=1, endpoints=['marketplace', 'callouts'])
+
+        self.assertEqual(set(results), {'marketplace', 'callouts'})
+        self.assertEqual(results['callouts']['status'], 200)
+        self.assertGreater(results['marketplace']['bytes'], 0)
+        self.assertGreater(results['marketplace']['queries'], 0)
+
+
+class BenchmarkCommandTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.baseline = os.path.join(directory, 'api.json')
+
+    def run_command(self, *args):
+        call_command(
+            'benchmark_api', '--scale', '0.01', '--iterations', '2', '--warmup', '0',
+            '--endpoints', 'marketplace', '--baseline', self.baseline, *args, stdout=StringIO(),
+        )
+
+    def test_save_and_compare(self):
+        self.run_command('--save')
+
+        with open(self.baseline) as baseline:
+            saved = json.load(baseline)
+        self.assertEqual(saved['scale'], 0.01)
+        self.assertIn('marketplace', saved['results'])
+        # Seeded rows are rolled back
+        self.assertFalse(seeding.seeded_users().exists())
+
+        saved['results']['marketplace']['queries'] = 0
+        with open(self.baseline, 'w') as baseline:
+            json.dump(saved, baseline)
+        with self.assertRaises(CommandError):
+            self.run_command()
@@ -0,0 +1,70 @@
+"""
+Row Count Tests
+
+Tests for the cached, approximate counts service and its admin paginator.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from core import counts
+from core.models.racing import Event, Track
+
+User = get_user_model()
+
+
+class CountsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='organizer', email='organizer@example.com', password='testpass123')
+        self.track = Track.objects.create(name='Test Track', location='Test Location', description='Test track')
+        start = timezone.now() + timedelta(days=3)
+        for is_public in (True, True, False):
+            Event.objects.create(
+                title='Test Event', description='Test event', event_type='race', start_date=start,
+                end_date=start + timedelta(hours=2), organizer=self.user, track=self.track, is_public=is_public,
+            )
+
+    def test_counts_exactly_and_caches(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(counts.count(Event.objects.filter(is_public=True)), 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(counts.count(Event.objects.filter(is_public=True)), 2)
+        self.assertEqual(counts.count(Event.objects.all()), 3)
+
+    def test_no_estimate_off_postgres(self):
+        self.assertIsNone(counts.estimate(Event.objects.all()))
+
+    def test_large_estimates_are_used(self):
+        with patch('core.counts.estimate', return_value=250000):
+            self.assertEqual(counts.count(Event.objects.all()), 250000)
+            self.assertEqual(counts.count(Event.objects.all(), exact=True), 3)
+
+    def test_small_estimates_are_counted_exactly(self):
+        with patch('core.counts.estimate', return_value=12):
+            self.assertEqual(counts.count(Event.objects.all()), 3)
+
+    def test_paginator(self):
+        with patch('core.counts.estimate', return_value=250000):
+            paginator = counts.ApproximateCountPaginator(Event.objects.order_by('id'), 100)
+            self.assertEqual(paginator.count, 250000)
+            self.assertEqual(paginator.num_pages, 2500)
+
+    def test_empty_querysets_count_zero(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(counts.count(Event.objects.none()), 0)
+            self.assertEqual(counts.count(Event.objects.filter(pk__in=[]), exact=True), 0)
+        paginator = counts.ApproximateCountPaginator(Event.objects.none(), 100)
+        self.assertEqual(paginator.count, 0)
+
+    def test_seo_analytics(self):
+        response = self.client.get('/api/seo/analytics/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['content_counts']['events'], 3)
+        self.assertEqual(response.data['content_counts']['tracks'], 1)
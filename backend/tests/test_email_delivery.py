@@ -0,0 +1,137 @@
+"""
+Email Delivery Tests
+
+Tests for the outbound email queue: enqueueing, batched delivery over a
+reused connection, retry backoff and queue statistics.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.email_queue import deliver_pending_emails, enqueue_email, queue_stats
+from core.email_service import send_email_verification, send_welcome_email
+from core.models.outbox import OutboundEmail
+
+User = get_user_model()
+
+
+class CountingBackend(EmailBackend):
+    """locmem backend that records how many connections were opened."""
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return True
+
+
+class FailingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP unavailable')
+
+
+class EmailQueueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='mailer',
+            email='mailer@example.com',
+            password='testpass123'
+        )
+
+    def test_send_email_verification_queues_instead_of_sending(self):
+        self.assertTrue(send_email_verification(self.user))
+        self.assertEqual(len(mail.outbox), 0)
+
+        queued = OutboundEmail.objects.get()
+        self.assertEqual(queued.status, 'pending')
+        self.assertEqual(queued.to, ['mailer@example.com'])
+        self.assertIn('verify-email', queued.body)
+        self.assertTrue(queued.html_body)
+
+    @override_settings(BACKGROUND_WORKER_MODE='inline')
+    def test_enqueue_delivers_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            send_welcome_email(self.user)
+            self.assertEqual(len(mail.outbox), 0)
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(OutboundEmail.objects.get().status, 'sent')
+
+    @override_settings(EMAIL_BACKEND='tests.test_email_delivery.CountingBackend')
+    def test_batch_reuses_one_connection(self):
+        for i in range(5):
+            enqueue_email('Hello', [f'user{i}@example.com'], 'Body')
+
+        CountingBackend.opened = 0
+        results = deliver_pending_emails(batch_size=2)
+
+        self.assertEqual(results, {'sent': 5, 'retried': 0, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(CountingBackend.opened, 1)
+        self.assertFalse(OutboundEmail.objects.filter(lease_token__isnull=False).exists())
+
+    @override_settings(
+        EMAIL_BACKEND='tests.test_email_delivery.FailingBackend',
+        EMAIL_QUEUE_MAX_ATTEMPTS=2,
+    )
+    def test_failed_delivery_backs_off_then_gives_up(self):
+        email = enqueue_email('Hello', ['someone@example.com'], 'Body')
+
+        results = deliver_pending_emails()
+        self.assertEqual(results, {'sent': 0, 'retried': 1, 'failed': 0})
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'pending')
+        self.assertEqual(email.attempts, 1)
+        self.assertIn('SMTP unavailable', email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+
+        # Not due yet, so a second drain leaves it alone
+        self.assertEqual(deliver_pending_emails()['retried'], 0)
+
+        OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        results = deliver_pending_emails()
+        self.assertEqual(results, {'sent': 0, 'retried': 0, 'failed': 1})
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'failed')
+
+    def test_claimed_email_is_not_sent_twice(self):
+        enqueue_email('Hello', ['someone@example.com'], 'Body')
+
+        # Simulate a second worker holding the lease
+        OutboundEmail.objects.update(next_attempt_at=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(deliver_pending_emails()['sent'], 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_queue_stats(self):
+        enqueue_email('Pending', ['a@example.com'], 'Body')
+        sent = enqueue_email('Sent', ['b@example.com'], 'Body')
+        OutboundEmail.objects.filter(pk=sent.pk).update(
+            status='sent', sent_at=sent.created_at + timedelta(milliseconds=250)
+        )
+
+        stats = queue_stats()
+        self.assertEqual(stats['pending'], 1)
+        self.assertEqual(stats['sent'], 1)
+        self.assertEqual(stats['failed'], 0)
+        self.assertEqual(stats['latency_p50_ms'], 250.0)
+        self.assertEqual(stats['latency_max_ms'], 250.0)
+
+    def test_purge_outbox_deletes_old_finished_emails(self):
+        from io import StringIO
+        from django.core.management import call_command
+
+        old = timezone.now() - timedelta(hours=48)
+        pending = enqueue_email('Pending', ['a@example.com'], 'Body')
+        for status in ('sent', 'failed'):
+            email = enqueue_email(status, ['b@example.com'], 'Reset link')
+            OutboundEmail.objects.filter(pk=email.pk).update(status=status, created_at=old)
+        recent = enqueue_email('Recent', ['c@example.com'], 'Body')
+        OutboundEmail.objects.filter(pk=recent.pk).update(status='sent')
+
+        call_command('purge_outbox', stdout=StringIO())
+
+        self.assertEqual(set(OutboundEmail.objects.values_list('pk', flat=True)), {pending.pk, recent.pk})
@@ -0,0 +1,107 @@
+"""
+Entitlement Tests
+
+Tests for the cached plan/feature resolver, its invalidation from Stripe
+subscription webhooks and the DRF permission classes built on it.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.permissions import HasActiveSubscription, requires_feature, requires_plan
+from api.views.subscription_views import handle_subscription_deleted
+from core import entitlements
+from core.models.payments import Subscription
+
+User = get_user_model()
+
+
+class EntitlementTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='racer', email='racer@example.com', password='testpass123')
+
+    def subscribe(self, plan='pro', status='active'):
+        return Subscription.objects.create(
+            user=self.user,
+            stripe_subscription_id=f'sub_{plan}',
+            stripe_price_id=settings.SUBSCRIPTION_PLANS[plan]['price_id'],
+            status=status,
+        )
+
+    def test_free_user(self):
+        result = entitlements.get_entitlements(self.user)
+
+        self.assertFalse(result.is_subscribed)
+        self.assertFalse(result.includes_plan('basic'))
+
+    def test_resolves_plan_and_features(self):
+        self.subscribe('pro')
+
+        result = entitlements.get_entitlements(self.user)
+
+        self.assertEqual(result.plan, 'pro')
+        self.assertTrue(result.has_feature('Analytics'))
+        self.assertTrue(result.includes_plan('basic'))
+        self.assertFalse(result.includes_plan('premium'))
+
+    def test_inactive_subscription_grants_nothing(self):
+        self.subscribe('pro', status='past_due')
+
+        self.assertFalse(entitlements.get_entitlements(self.user).is_subscribed)
+
+    def test_result_is_cached(self):
+        self.subscribe('pro')
+        entitlements.get_entitlements(self.user)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(entitlements.get_entitlements(self.user).plan, 'pro')
+
+    def test_subscription_webhook_invalidates_cache(self):
+        self.subscribe('pro')
+        self.assertTrue(entitlements.get_entitlements(self.user).is_subscribed)
+
+        handle_subscription_deleted(type('StripeSubscription', (), {'id': 'sub_pro'})())
+
+        self.assertFalse(entitlements.get_entitlements(self.user).is_subscribed)
+
+
+class EntitlementPermissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='racer', email='racer@example.com', password='testpass123')
+        Subscription.objects.create(
+            user=self.user, stripe_subscription_id='sub_basic',
+            stripe_price_id=settings.SUBSCRIPTION_PLANS['basic']['price_id'], status='active',
+        )
+
+    def request(self):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        return request
+
+    def test_permissions_share_one_lookup_per_request(self):
+        request = self.request()
+        checks = [HasActiveSubscription(), requires_feature('Community access')(), requires_plan('pro')()]
+
+        with self.assertNumQueries(1):
+            results = [permission.has_permission(request, None) for permission in checks]
+
+        self.assertEqual(results, [True, True, False])
+
+    def test_subscription_status_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        client.get(reverse('get-subscription-status'))
+
+        with self.assertNumQueries(0):
+            response = client.get(reverse('get-subscription-status'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['plan'], 'basic')
+        self.assertEqual(response.data['subscription']['status'], 'active')
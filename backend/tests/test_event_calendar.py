@@ -0,0 +1,174 @@
+"""
+Event Calendar Tests
+
+Tests for the cached calendar buckets, their invalidation, the cached
+upcoming/my events lists and the iCalendar feed.
+"""
+
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from core import event_calendar
+from core.event_registration import register
+from core.models.racing import Event, Track
+
+User = get_user_model()
+
+
+class EventCalendarTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='organizer', email='organizer@example.com', password='testpass123')
+        self.racer = User.objects.create_user(username='racer', email='racer@example.com', password='testpass123')
+        self.track = Track.objects.create(name='Test Track', location='Test Location', description='Test track')
+        self.other_track = Track.objects.create(name='Other Track', location='Elsewhere', description='Other track')
+        self.today = timezone.localdate()
+
+    def event(self, days_ahead, track=None, **fields):
+        start = timezone.now() + timedelta(days=days_ahead)
+        return Event.objects.create(**{
+            'title': f'Event in {days_ahead} days', 'description': 'Test event', 'event_type': 'race',
+            'start_date': start, 'end_date': start + timedelta(hours=2),
+            'organizer': self.user, 'track': track or self.track, **fields,
+        })
+
+    def test_range_is_served_from_cache(self):
+        events = [self.event(days) for days in (1, 5, 12, 40)]
+        end = self.today + timedelta(days=30)
+
+        with self.assertNumQueries(2):
+            first = event_calendar.events_between('all', self.today, end)
+        with self.assertNumQueries(1):
+            second = event_calendar.events_between('all', self.today, end)
+
+        self.assertEqual([e['id'] for e in first], [e.id for e in events[:3]])
+        self.assertEqual(first, second)
+
+    def test_split_range_uses_whole_weeks(self):
+        monday = self.today - timedelta(days=self.today.weekday())
+        buckets = event_calendar._split_range(monday - timedelta(days=1), monday + timedelta(days=16))
+
+        self.assertEqual([kind for kind, _, _ in buckets], ['day', 'week', 'week', 'day', 'day'])
+
+    def test_event_changes_invalidate_calendar(self):
+        event = self.event(3)
+        end = self.today + timedelta(days=14)
+        event_calendar.events_between('all', self.today, end)
+
+        event.title = 'Renamed'
+        event.save()
+        self.event(4)
+
+        titles = [e['title'] for e in event_calendar.events_between('all', self.today, end)]
+        self.assertEqual(titles, ['Renamed', 'Event in 4 days'])
+
+    def test_scopes(self):
+        self.event(2)
+        other = self.event(3, track=self.other_track)
+        joined = self.event(4, organizer=self.racer)
+        self.event(5, is_active=False)
+        end = self.today + timedelta(days=14)
+
+        self.assertEqual(len(event_calendar.events_between('all', self.today, end)), 3)
+        self.assertEqual(
+            [e['id'] for e in event_calendar.events_between(f'track:{self.other_track.id}', self.today, end)], [other.id]
+        )
+        self.assertEqual(len(event_calendar.events_between(f'user:{self.user.id}', self.today, end)), 3)
+
+        event_calendar.events_between(f'user:{self.racer.id}', self.today, end)
+        register(other, self.racer)
+        self.assertEqual(
+            [e['id'] for e in event_calendar.events_between(f'user:{self.racer.id}', self.today, end)],
+            [other.id, joined.id]
+        )
+
+    def test_participant_counts_stay_live(self):
+        event = self.event(2)
+        event_calendar.upcoming_events()
+
+        register(event, self.racer)
+
+        summary = event_calendar.upcoming_events()[0]
+        self.assertEqual(summary['participants_count'], 1)
+        self.assertNotIn('participant_count', summary)
+
+    def test_participating_list_is_cached_per_user(self):
+        event = self.event(2)
+        register(event, self.racer)
+        event_calendar.user_events(self.racer.id, 'participant')
+
+        with self.assertNumQueries(1):
+            events = event_calendar.user_events(self.racer.id, 'participant')
+        self.assertEqual([e['id'] for e in events], [event.id])
+
+    def test_ical_feed(self):
+        event = self.event(2, title='Friday Night, Drags', description='Bring; a helmet')
+
+        feed = ''.join(event_calendar.ical_feed('all', self.today, self.today + timedelta(days=7)))
+
+        self.assertTrue(feed.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertTrue(feed.endswith('END:VCALENDAR\r\n'))
+        self.assertIn(f'UID:event-{event.id}@calloutracing\r\n', feed)
+        self.assertIn('SUMMARY:Friday Night\\, Drags\r\n', feed)
+        self.assertIn('DESCRIPTION:Bring\\; a helmet\r\n', feed)
+
+    def test_long_ical_lines_are_folded(self):
+        folded = event_calendar._fold('DESCRIPTION:' + 'é' * 100)
+
+        lines = folded.rstrip('\r\n').split('\r\n')
+        self.assertTrue(all(len(line.encode('utf-8')) <= 75 for line in lines))
+        self.assertEqual(''.join(line[1:] if i else line for i, line in enumerate(lines)), 'DESCRIPTION:' + 'é' * 100)
+
+
+class EventCalendarAPITests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='organizer', email='organizer@example.com', password='testpass123')
+        track = Track.objects.create(name='Test Track', location='Test Location', description='Test track')
+        start = timezone.now() + timedelta(days=2)
+        self.event = Event.objects.create(
+            title='Test Event', description='Test event', event_type='race', start_date=start,
+            end_date=start + timedelta(hours=2), organizer=self.user, track=track,
+        )
+
+    def test_calendar_endpoint(self):
+        response = self.client.get('/api/events/calendar/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([e['id'] for e in response.data['events']], [self.event.id])
+        self.assertEqual(self.client.get('/api/events/calendar/', {'start': 'soon'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/events/calendar/', {'mine': 'true'}).status_code, 401)
+
+    def test_ical_endpoint(self):
+        response = self.client.get('/api/events/ical/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        self.assertIn(f'UID:event-{self.event.id}@calloutracing', b''.join(response.streaming_content).decode())
+
+    def test_upcoming_and_my_events(self):
+        self.client.force_login(self.user)
+
+        self.assertEqual([e['id'] for e in self.client.get('/api/events/upcoming/').data], [self.event.id])
+        self.assertEqual([e['id'] for e in self.client.get('/api/events/my_events/').data], [self.event.id])
+        self.assertEqual(self.client.get('/api/events/participating/').data, [])
+
+    def test_cached_lists_match_event_serializer(self):
+        from rest_framework.renderers import JSONRenderer
+        from api.serializers import EventSerializer
+
+        self.client.force_login(self.user)
+        self.client.get('/api/events/upcoming/')
+        self.user.username = 'renamed'
+        self.user.save()
+
+        expected = json.loads(JSONRenderer().render([EventSerializer(Event.objects.get(pk=self.event.pk)).data]))
+        self.assertEqual(expected[0]['track']['name'], 'Test Track')
+        self.assertEqual(self.client.get('/api/events/upcoming/').json(), expected)
+        self.assertEqual(self.client.get('/api/events/my_events/').json(), expected)
+        self.assertEqual(self.client.get('/api/events/calendar/').json()['events'], expected)
@@ -0,0 +1,161 @@
+"""
+Event Registration Tests
+
+Tests for race-safe event registration (the conditional capacity counter,
+duplicate joins and a concurrent load test against an oversubscribed
+event) and for the denormalized count in event and participant listings.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from core.event_registration import ALREADY_REGISTERED, EVENT_FULL, register, unregister
+from core.models.racing import Event, EventParticipant, Track
+
+User = get_user_model()
+
+
+def make_event(organizer, max_participants):
+    track = Track.objects.create(name='Test Track', location='Test Location', description='Test track')
+    return Event.objects.create(
+        title='Test Event', description='Test event description', event_type='race',
+        start_date=timezone.now() + timedelta(days=7), end_date=timezone.now() + timedelta(days=7, hours=2),
+        max_participants=max_participants, organizer=organizer, track=track,
+    )
+
+
+class EventRegistrationTests(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f'racer{i}', email=f'racer{i}@example.com', password='testpass123')
+            for i in range(3)
+        ]
+        self.event = make_event(self.users[0], max_participants=2)
+
+    def test_register_until_full(self):
+        results = [register(self.event, user)[1] for user in self.users]
+
+        self.assertEqual(results, [None, None, EVENT_FULL])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, 2)
+        self.assertEqual(self.event.participants.count(), 2)
+
+    def test_duplicate_join_releases_reservation(self):
+        register(self.event, self.users[0])
+
+        self.assertEqual(register(self.event, self.users[0])[1], ALREADY_REGISTERED)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, 1)
+
+    def test_rejoining_a_full_event_reports_already_registered(self):
+        register(self.event, self.users[0])
+        register(self.event, self.users[1])
+
+        self.assertEqual(register(self.event, self.users[0])[1], ALREADY_REGISTERED)
+        self.assertEqual(register(self.event, self.users[2])[1], EVENT_FULL)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, 2)
+
+    def test_leaving_frees_a_place(self):
+        register(self.event, self.users[0])
+        register(self.event, self.users[1])
+
+        self.assertTrue(unregister(self.event, self.users[0]))
+        self.assertFalse(unregister(self.event, self.users[0]))
+        self.assertIsNone(register(self.event, self.users[2])[1])
+
+    def test_count_follows_participants_created_elsewhere(self):
+        EventParticipant.objects.create(event=self.event, user=self.users[1])
+        EventParticipant.objects.create(event=self.event, user=self.users[2])
+
+        self.assertEqual(register(self.event, self.users[0])[1], EVENT_FULL)
+
+    def test_join_endpoint_reports_full_event(self):
+        self.client.force_login(self.users[1])
+        self.assertEqual(self.client.post(f'/api/events/{self.event.id}/join/').status_code, 201)
+        self.assertEqual(self.client.post(f'/api/events/{self.event.id}/join/').status_code, 400)
+
+        self.client.force_login(self.users[2])
+        self.assertEqual(self.client.post(f'/api/events/{self.event.id}/join/').status_code, 201)
+
+        self.client.force_login(self.users[0])
+        response = self.client.post(f'/api/events/{self.event.id}/join/')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['detail'], 'This event is full.')
+
+
+class ConcurrentRegistrationTests(TransactionTestCase):
+    """Many users join one event at once; it must never be oversold."""
+
+    CAPACITY = 25
+    JOINS = 200
+    THREADS = 16
+
+    def join(self, user_id):
+        user = User(pk=user_id)
+        try:
+            # SQLite serializes writers and reports a lock instead of waiting
+            # for it; a user who hits one simply tries again
+            for _ in range(200):
+                try:
+                    return register(self.event, user)[1]
+                except OperationalError:
+                    continue
+            raise AssertionError('join never got the database lock')
+        finally:
+            connection.close()
+
+    def test_no_overselling_under_concurrent_joins(self):
+        users = User.objects.bulk_create([
+            User(username=f'load{i}', email=f'load{i}@example.com') for i in range(self.JOINS)
+        ])
+        self.event = make_event(users[0], max_participants=self.CAPACITY)
+
+        with ThreadPoolExecutor(max_workers=self.THREADS) as pool:
+            results = list(pool.map(self.join, [user.pk for user in users]))
+
+        self.assertEqual(results.count(None), self.CAPACITY)
+        self.assertEqual(results.count(EVENT_FULL), self.JOINS - self.CAPACITY)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, self.CAPACITY)
+        self.assertEqual(self.event.participants.count(), self.CAPACITY)
+
+
+class EventListingTests(TestCase):
+    def setUp(self):
+        self.users = User.objects.bulk_create([
+            User(username=f'racer{i}', email=f'racer{i}@example.com') for i in range(60)
+        ])
+        self.event = make_event(self.users[0], max_participants=100)
+        for user in self.users[:55]:
+            register(self.event, user)
+
+    def test_list_reports_count_without_counting_queries(self):
+        for i in range(5):
+            Event.objects.create(
+                title=f'Event {i}', description='Another event', event_type='meet',
+                start_date=self.event.start_date, end_date=self.event.end_date,
+                organizer=self.users[0], track=self.event.track,
+            )
+
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/events/')
+
+        counts = {event['id']: event['participants_count'] for event in response.data['results']}
+        self.assertEqual(counts[self.event.id], 55)
+
+    def test_participants_are_paginated(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/events/{self.event.id}/participants/')
+
+        self.assertEqual(response.data['count'], 55)
+        self.assertEqual(len(response.data['results']), 50)
+        self.assertEqual(response.data['results'][0]['username'], 'racer0')
+
+        response = self.client.get(f'/api/events/{self.event.id}/participants/', {'page': 2})
+        self.assertEqual([p['username'] for p in response.data['results']], [f'racer{i}' for i in range(50, 55)])
@@ -409,7 +409,8 @@ class EventAPITests(TestCase):
         
         response = self.client.get(f'/api/events/{event.id}/participants/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
     
     def test_get_upcoming_events(self):
         """Test getting upcoming events."""
@@ -0,0 +1,138 @@
+"""
+Follow Graph Tests
+
+Tests for cached follower counts, follow sets, mutual follows and suggestions.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core import follow_graph
+from core.models.social import Block, Follow
+
+User = get_user_model()
+
+
+class FollowGraphTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = {
+            name: User.objects.create_user(username=name, email=f'{name}@example.com', password='testpass123')
+            for name in ('ann', 'ben', 'cat', 'dan', 'eve')
+        }
+
+    def follow(self, follower, following):
+        Follow.objects.create(follower=self.users[follower], following=self.users[following])
+
+    def ids(self, *names):
+        return {self.users[name].id for name in names}
+
+    def test_counts_are_cached_and_invalidated(self):
+        ann = self.users['ann'].id
+        self.follow('ben', 'ann')
+        self.follow('ann', 'cat')
+
+        self.assertEqual(follow_graph.counts(ann), {'followers': 1, 'following': 1})
+        with self.assertNumQueries(0):
+            follow_graph.counts(ann)
+
+        self.follow('dan', 'ann')
+        self.assertEqual(follow_graph.counts(ann)['followers'], 2)
+        Follow.objects.filter(follower=self.users['ann']).delete()
+        self.assertEqual(follow_graph.counts(ann)['following'], 0)
+
+    def test_counts_for_a_page_of_users(self):
+        self.follow('ben', 'ann')
+        self.follow('cat', 'ann')
+        with self.assertNumQueries(2):
+            counts = follow_graph.counts_for(self.ids('ann', 'ben', 'eve'))
+        self.assertEqual(counts[self.users['ann'].id], {'followers': 2, 'following': 0})
+        self.assertEqual(counts[self.users['ben'].id], {'followers': 0, 'following': 1})
+        self.assertEqual(counts[self.users['eve'].id], {'followers': 0, 'following': 0})
+
+    def test_is_following_is_a_set_lookup(self):
+        self.follow('ann', 'ben')
+        ann, ben, cat = (self.users[name].id for name in ('ann', 'ben', 'cat'))
+
+        self.assertTrue(follow_graph.is_following(ann, ben))
+        with self.assertNumQueries(0):
+            self.assertFalse(follow_graph.is_following(ann, cat))
+
+        self.follow('ann', 'cat')
+        self.assertTrue(follow_graph.is_following(ann, cat))
+
+    def test_mutual_follows_and_followers_you_follow(self):
+        for follower, following in [('ann', 'ben'), ('ben', 'ann'), ('ann', 'cat'), ('cat', 'dan'), ('ben', 'dan')]:
+            self.follow(follower, following)
+
+        self.assertEqual(follow_graph.mutual_follows(self.users['ann'].id), self.ids('ben'))
+        self.assertEqual(
+            follow_graph.followers_you_follow(self.users['ann'].id, self.users['dan'].id), self.ids('ben', 'cat')
+        )
+
+    def test_suggestions_rank_by_followed_friends(self):
+        for follower, following in [
+            ('ann', 'ben'), ('ann', 'cat'), ('ben', 'dan'), ('cat', 'dan'), ('cat', 'eve'), ('ben', 'ann'),
+        ]:
+            self.follow(follower, following)
+
+        ann = self.users['ann'].id
+        self.assertEqual(follow_graph.suggestions(ann), [self.users['dan'].id, self.users['eve'].id])
+        self.assertEqual(follow_graph.suggestions(ann, exclude=[self.users['dan'].id]), [self.users['eve'].id])
+
+    @override_settings(FOLLOW_GRAPH_MAX_SET_SIZE=1)
+    def test_large_sets_fall_back_to_queries(self):
+        for follower, following in [('ann', 'ben'), ('ann', 'cat'), ('ben', 'ann'), ('ben', 'dan'), ('cat', 'dan')]:
+            self.follow(follower, following)
+        ann = self.users['ann'].id
+
+        self.assertIsNone(follow_graph.following_ids(ann))
+        self.assertTrue(follow_graph.is_following(ann, self.users['cat'].id))
+        self.assertEqual(follow_graph.mutual_follows(ann), self.ids('ben'))
+        self.assertEqual(follow_graph.suggestions(ann), [self.users['dan'].id])
+
+    def test_block_invalidates_both_users(self):
+        self.follow('ann', 'ben')
+        ann, ben = self.users['ann'].id, self.users['ben'].id
+        self.assertTrue(follow_graph.is_following(ann, ben))
+
+        # Follows removed without signals, as a raw cleanup would
+        Follow.objects.filter(follower_id=ann)._raw_delete('default')
+        Block.objects.create(blocker=self.users['ben'], blocked=self.users['ann'])
+        self.assertFalse(follow_graph.is_following(ann, ben))
+        self.assertEqual(follow_graph.counts(ben)['followers'], 0)
+
+
+class FollowGraphAPITests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='racer', email='racer@example.com', password='testpass123')
+        self.fans = [
+            User.objects.create_user(username=f'fan{i}', email=f'fan{i}@example.com', password='testpass123')
+            for i in range(3)
+        ]
+        for fan in self.fans:
+            Follow.objects.create(follower=fan, following=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_followers_are_paginated(self):
+        profile_id = self.user.profile.id
+        response = self.client.get(f'/api/profiles/{profile_id}/followers/', {'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual([row['username'] for row in response.data['results']], ['fan2', 'fan1'])
+        self.assertIsNotNone(response.data['next'])
+
+    def test_profile_includes_follow_counts(self):
+        response = self.client.get('/api/profiles/me/')
+        self.assertEqual(response.data['followers_count'], 3)
+        self.assertEqual(response.data['following_count'], 0)
+
+    def test_suggestions(self):
+        Follow.objects.create(follower=self.user, following=self.fans[0])
+        Follow.objects.create(follower=self.fans[0], following=self.fans[1])
+        response = self.client.get('/api/profiles/suggestions/')
+        self.assertEqual(response.data['results'], [{'id': self.fans[1].id, 'username': 'fan1'}])
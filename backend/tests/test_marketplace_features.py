@@ -4,7 +4,7 @@ from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.urls import reverse
 from core.models import (
-    UserProfile, MarketplaceListing, ListingCategory, ListingImage,
+    UserProfile, Marketplace, MarketplaceOrder, MarketplaceReview, MarketplaceListing, ListingCategory, ListingImage,
     CarListing, CarImage, Review, Rating, PaymentTransaction,
     UserWallet, Order, OrderItem, ShippingAddress
 )
@@ -592,4 +592,119 @@ class MarketplaceIntegrationTests(APITestCase):
         self.wallet1.refresh_from_db()
         self.wallet2.refresh_from_db()
         self.assertEqual(self.wallet1.balance, Decimal('500.00'))  # Seller received payment
-        self.assertEqual(self.wallet2.balance, Decimal('500.00'))  # Buyer paid 
\ No newline at end of file
+        self.assertEqual(self.wallet2.balance, Decimal('500.00'))  # Buyer paid 
+
+
+class ListingQueryCountTests(APITestCase):
+    """ListingViewSet.list must not issue per-listing queries."""
+    def setUp(self):
+        self.client = APIClient()
+        self.buyer = User.objects.create_user(
+            username='buyer',
+            email='buyer@test.com',
+            password='testpass123'
+        )
+
+    def create_listings(self, count):
+        start = Marketplace.objects.count()
+        for i in range(start, start + count):
+            seller = User.objects.create_user(
+                username=f'seller{i}',
+                email=f'seller{i}@test.com',
+                password='testpass123'
+            )
+            listing = Marketplace.objects.create(
+                seller=seller,
+                title=f'Turbo kit {i}',
+                description='Bolt-on turbo kit',
+                category='parts',
+                condition='good',
+                price=Decimal('1200.00'),
+                location='Phoenix, AZ'
+            )
+            for rating in (4, 5):
+                order = MarketplaceOrder.objects.create(
+                    buyer=self.buyer, seller=seller, item=listing, total_amount=Decimal('1200.00')
+                )
+                MarketplaceReview.objects.create(
+                    reviewer=self.buyer, order=order, rating=rating, title='Great', comment='Fast shipping'
+                )
+
+    def test_list_query_count_is_constant(self):
+        self.create_listings(3)
+        # count + listings (with seller/profile/review aggregates) + images
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('marketplace-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.create_listings(10)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('marketplace-list'))
+        self.assertEqual(len(response.data['results']), 13)
+
+    def test_list_reads_review_aggregates(self):
+        self.create_listings(1)
+
+        listing = self.client.get(reverse('marketplace-list')).data['results'][0]
+
+        self.assertEqual(listing['reviews_count'], 2)
+        self.assertEqual(listing['average_rating'], 4.5)
+        self.assertEqual(listing['seller']['username'], 'seller0')
+        self.assertEqual(listing['images'], [])
+
+
+class MarketplaceSearchTests(APITestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.client = APIClient()
+        self.seller = User.objects.create_user(
+            username='seller',
+            email='seller@test.com',
+            password='testpass123'
+        )
+        for title, category, condition, price in [
+            ('Turbo kit', 'parts', 'new', '1500.00'),
+            ('Intercooler', 'parts', 'good', '250.00'),
+            ('Forged wheels', 'wheels', 'like_new', '2200.00'),
+            ('Project Mustang', 'car', 'fair', '18000.00'),
+        ]:
+            Marketplace.objects.create(
+                seller=self.seller, title=title, description=f'{title} for sale',
+                category=category, condition=condition, price=Decimal(price), location='Austin, TX'
+            )
+
+    def test_facets_in_one_query_then_cached(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('marketplace-facets'))
+        facets = response.data
+
+        self.assertEqual(facets['total'], 4)
+        self.assertEqual(facets['category'], {'parts': 2, 'wheels': 1, 'car': 1})
+        self.assertEqual(facets['condition']['new'], 1)
+        self.assertEqual(
+            [(bucket['min'], bucket['count']) for bucket in facets['price'] if bucket['count']],
+            [(100, 1), (1000, 2), (10000, 1)]
+        )
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse('marketplace-facets'))
+
+    def test_facets_follow_filters_and_listing_changes(self):
+        response = self.client.get(reverse('marketplace-facets'), {'category': 'parts', 'max_price': '1000'})
+        self.assertEqual(response.data['total'], 1)
+        self.assertEqual(response.data['condition'], {'good': 1})
+
+        Marketplace.objects.create(
+            seller=self.seller, title='Blow-off valve', description='Barely used',
+            category='parts', condition='good', price=Decimal('180.00'), location='Austin, TX'
+        )
+        response = self.client.get(reverse('marketplace-facets'), {'category': 'parts', 'max_price': '1000'})
+        self.assertEqual(response.data['total'], 2)
+
+    def test_list_filters_and_text_search(self):
+        response = self.client.get(reverse('marketplace-list'), {'search': 'TURBO'})
+        self.assertEqual([item['title'] for item in response.data['results']], ['Turbo kit'])
+
+        response = self.client.get(reverse('marketplace-list'), {'condition': 'fair', 'min_price': 'abc'})
+        self.assertEqual([item['title'] for item in response.data['results']], ['Project Mustang'])
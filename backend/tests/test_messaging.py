@@ -0,0 +1,135 @@
+"""
+Direct Messaging Tests
+
+Tests for conversations, inbox summaries and keyset pagination of messages.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core import messaging
+from core.models.social import Block, Conversation, InboxEntry, Message
+
+User = get_user_model()
+
+
+class MessagingServiceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(username='alice', email='alice@example.com', password='testpass123')
+        self.bob = User.objects.create_user(username='bob', email='bob@example.com', password='testpass123')
+        self.carol = User.objects.create_user(username='carol', email='carol@example.com', password='testpass123')
+
+    def test_one_conversation_per_pair(self):
+        messaging.send_message(self.bob, self.alice, 'Race tonight?')
+        messaging.send_message(self.alice, self.bob, 'You are on')
+
+        self.assertEqual(Conversation.objects.count(), 1)
+        conversation = messaging.conversation_between(self.alice, self.bob)
+        self.assertEqual(conversation, messaging.conversation_between(self.bob, self.alice))
+        self.assertLess(conversation.user_low_id, conversation.user_high_id)
+        self.assertEqual(conversation.messages.count(), 2)
+
+    def test_send_updates_inbox_entries(self):
+        messaging.send_message(self.bob, self.alice, 'First')
+        last = messaging.send_message(self.bob, self.alice, 'Second')
+
+        alice_entry = InboxEntry.objects.get(user=self.alice)
+        bob_entry = InboxEntry.objects.get(user=self.bob)
+        self.assertEqual(alice_entry.unread_count, 2)
+        self.assertEqual(bob_entry.unread_count, 0)
+        self.assertEqual(alice_entry.other_user, self.bob)
+        self.assertEqual(alice_entry.last_message, last)
+        self.assertEqual(bob_entry.last_message, last)
+        self.assertEqual(alice_entry.conversation.last_message, last)
+
+    def test_mark_read(self):
+        messaging.send_message(self.bob, self.alice, 'First')
+        messaging.send_message(self.bob, self.alice, 'Second')
+        messaging.send_message(self.alice, self.bob, 'Reply')
+        conversation = messaging.conversation_between(self.alice, self.bob)
+
+        self.assertEqual(messaging.mark_read(self.alice, conversation), 2)
+        self.assertEqual(InboxEntry.objects.get(user=self.alice).unread_count, 0)
+        self.assertEqual(messaging.unread_total(self.bob), 1)
+
+    def test_rejects_self_and_blocked(self):
+        with self.assertRaises(messaging.MessagingError):
+            messaging.send_message(self.alice, self.alice, 'Hi me')
+        Block.objects.create(blocker=self.bob, blocked=self.alice)
+        with self.assertRaises(messaging.MessagingError):
+            messaging.send_message(self.alice, self.bob, 'Hi')
+        self.assertFalse(Message.objects.exists())
+
+    def test_inbox_is_one_query_in_recent_order(self):
+        messaging.send_message(self.bob, self.alice, 'From bob')
+        messaging.send_message(self.carol, self.alice, 'From carol')
+
+        with self.assertNumQueries(1):
+            entries, cursor = messaging.inbox(self.alice)
+            names = [entry.other_user.username for entry in entries]
+            previews = [entry.last_message.content for entry in entries]
+        self.assertEqual(names, ['carol', 'bob'])
+        self.assertEqual(previews, ['From carol', 'From bob'])
+        self.assertIsNone(cursor)
+
+    def test_inbox_pages_with_cursor(self):
+        for sender in (self.bob, self.carol):
+            messaging.send_message(sender, self.alice, 'Hi')
+
+        first, cursor = messaging.inbox(self.alice, limit=1)
+        second, last_cursor = messaging.inbox(self.alice, cursor=cursor, limit=1)
+        self.assertEqual([entry.other_user for entry in first + second], [self.carol, self.bob])
+        self.assertIsNone(last_cursor)
+        with self.assertRaises(ValueError):
+            messaging.inbox(self.alice, cursor='garbage')
+
+    def test_history_pages_newest_first(self):
+        sent = [messaging.send_message(self.bob, self.alice, f'Message {i}') for i in range(5)]
+        conversation = messaging.conversation_between(self.alice, self.bob)
+
+        page, before = messaging.history(conversation, limit=2)
+        self.assertEqual(page, [sent[4], sent[3]])
+        page, before = messaging.history(conversation, before=before, limit=2)
+        self.assertEqual(page, [sent[2], sent[1]])
+        page, before = messaging.history(conversation, before=before, limit=2)
+        self.assertEqual(page, [sent[0]])
+        self.assertIsNone(before)
+
+
+class MessagingAPITests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(username='alice', email='alice@example.com', password='testpass123')
+        self.bob = User.objects.create_user(username='bob', email='bob@example.com', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.alice)
+
+    def test_send_list_and_read(self):
+        response = self.client.post('/api/messages/', {'recipient': self.bob.id, 'content': 'Race tonight?'}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+        self.client.force_authenticate(user=self.bob)
+        response = self.client.get('/api/messages/inbox/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['other_user']['username'], 'alice')
+        self.assertEqual(response.data['results'][0]['unread_count'], 1)
+        self.assertEqual(self.client.get('/api/messages/unread-count/').data['unread_count'], 1)
+
+        response = self.client.get(f'/api/messages/with/{self.alice.id}/')
+        self.assertEqual(response.data['results'][0]['content'], 'Race tonight?')
+
+        response = self.client.post(f'/api/messages/with/{self.alice.id}/read/')
+        self.assertEqual(response.data['marked_read'], 1)
+        self.assertEqual(self.client.get('/api/messages/unread-count/').data['unread_count'], 0)
+
+    def test_blocked_send_is_forbidden(self):
+        Block.objects.create(blocker=self.bob, blocked=self.alice)
+        response = self.client.post('/api/messages/', {'recipient': self.bob.id, 'content': 'Hi'}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_bad_cursor_is_rejected(self):
+        response = self.client.get('/api/messages/inbox/', {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 400)
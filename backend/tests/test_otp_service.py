@@ -0,0 +1,51 @@
+"""
+OTP Service Tests
+
+Tests for OTP storage cleanup by the expiry sweeper.
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models.auth import OTP
+from core.otp_service import OTPService
+
+User = get_user_model()
+
+
+class OTPStorageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='racer', email='racer@example.com', password='testpass123')
+
+    def make_otp(self, expires_in, is_used=False):
+        return OTP.objects.create(
+            user=self.user,
+            identifier='racer@example.com',
+            otp_type='email',
+            code='123456',
+            is_used=is_used,
+            expires_at=timezone.now() + expires_in,
+        )
+
+    def test_purge_deletes_only_codes_past_retention(self):
+        fresh = self.make_otp(timedelta(minutes=10))
+        recently_used = self.make_otp(timedelta(minutes=-5), is_used=True)
+        self.make_otp(timedelta(hours=-30))
+        self.make_otp(timedelta(hours=-48), is_used=True)
+
+        self.assertEqual(OTPService.purge_stale_otps(retention_hours=24, batch_size=1), 2)
+        self.assertEqual(set(OTP.objects.values_list('id', flat=True)), {fresh.id, recently_used.id})
+
+    def test_purge_command(self):
+        self.make_otp(timedelta(minutes=-1), is_used=True)
+
+        call_command('purge_otps', '--retention-hours', '0', stdout=StringIO())
+
+        self.assertFalse(OTP.objects.exists())
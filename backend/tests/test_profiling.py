@@ -0,0 +1,65 @@
+"""
+Request Profiling Tests
+
+Tests for the opt-in profiling middleware: query and serializer timing,
+duplicate query detection, Server-Timing headers and sampling.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from core.models.racing import Track
+from core.profiling import RequestProfile
+
+User = get_user_model()
+
+
+class RequestProfilingTests(TestCase):
+    def setUp(self):
+        Track.objects.create(name='Test Track', location='Test Location', description='Test track')
+
+    def test_off_by_default(self):
+        with self.assertNoLogs('core.profiling', level='INFO'):
+            response = self.client.get('/api/tracks/')
+
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(REQUEST_PROFILING='all')
+    def test_profiles_every_request(self):
+        with self.assertLogs('core.profiling', level='INFO') as logs:
+            response = self.client.get('/api/tracks/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['Server-Timing'], r'^total;dur=[\d.]+, sql;dur=[\d.]+;desc="\d+ queries, \d+ duplicate", serializer;dur=[\d.]+$')
+        profile = logs.records[-1].profile
+        self.assertEqual(profile['path'], '/api/tracks/')
+        self.assertEqual(profile['view'], 'api.views.racing.TrackListView')
+        self.assertGreaterEqual(profile['queries'], 1)
+        self.assertGreater(profile['serializer_ms'], 0)
+
+    @override_settings(REQUEST_PROFILING='sample', REQUEST_PROFILING_SAMPLE_RATE=1.0)
+    def test_sampled_headers_are_staff_only(self):
+        with self.assertLogs('core.profiling', level='INFO'):
+            self.assertNotIn('Server-Timing', self.client.get('/api/tracks/'))
+
+        staff = User.objects.create_user(username='staff', email='staff@example.com', password='testpass123', is_staff=True)
+        self.client.force_login(staff)
+        self.assertIn('Server-Timing', self.client.get('/api/tracks/'))
+
+    @override_settings(REQUEST_PROFILING='sample', REQUEST_PROFILING_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_are_not_profiled(self):
+        with self.assertNoLogs('core.profiling', level='INFO'):
+            self.assertNotIn('Server-Timing', self.client.get('/api/tracks/'))
+
+    def test_duplicate_queries(self):
+        user = User.objects.create_user(username='racer', email='racer@example.com', password='testpass123')
+        profile = RequestProfile()
+
+        with connection.execute_wrapper(profile):
+            for _ in range(3):
+                User.objects.get(pk=user.pk)
+            Track.objects.count()
+
+        self.assertEqual(profile.queries, 4)
+        self.assertEqual([count for _, count in profile.duplicates()], [3])
@@ -0,0 +1,135 @@
+"""
+Rate Limiting Tests
+
+Tests for the shared sliding-window limiter, the DRF throttles built on it
+and the OTP limits that use it.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import rate_limit
+from core.otp_service import OTPService
+
+User = get_user_model()
+
+
+def throttle_rates(**rates):
+    return {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {
+        **settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], **rates,
+    }}
+
+
+class SlidingWindowTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_allows_up_to_limit(self):
+        results = [rate_limit.hit('test', 'client', 3, 60) for _ in range(4)]
+
+        self.assertEqual([r.allowed for r in results], [True, True, True, False])
+        self.assertEqual([r.remaining for r in results], [2, 1, 0, 0])
+        self.assertGreater(results[-1].retry_after, 0)
+
+    def test_rejected_requests_do_not_use_capacity(self):
+        for _ in range(10):
+            rate_limit.hit('test', 'client', 2, 60)
+
+        self.assertEqual(rate_limit.peek('test', 'client', 5, 60).remaining, 3)
+
+    def test_previous_window_is_weighted(self):
+        rate_limit.hit('test', 'client', 10, 60)
+        _, previous_key, _ = rate_limit._window_keys('test', 'client', 60, rate_limit.time.time())
+        cache.set(previous_key, 1000, 120)
+
+        self.assertFalse(rate_limit.hit('test', 'client', 10, 60).allowed)
+
+    def test_concurrent_hits_cannot_exceed_limit(self):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: rate_limit.hit('test', 'race', 20, 3600).allowed, range(100)))
+
+        self.assertEqual(sum(results), 20)
+
+
+class ThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        User.objects.create_user(username='racer', email='racer@example.com', password='testpass123')
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(login_account='2/min'))
+    def test_login_is_throttled_per_account(self):
+        for _ in range(2):
+            response = self.client.post(reverse('login'), {'username': 'racer', 'password': 'wrong'}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.post(reverse('login'), {'username': 'racer', 'password': 'testpass123'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+        # Other accounts from the same client are unaffected
+        response = self.client.post(reverse('login'), {'username': 'someone', 'password': 'wrong'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Failed attempts from one client can't lock the account out for everyone else
+        response = self.client.post(
+            reverse('login'), {'username': 'racer', 'password': 'wrong'}, format='json', REMOTE_ADDR='203.0.113.7',
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(user_lookup='1/min'))
+    def test_check_user_exists_is_throttled(self):
+        url = reverse('check-user')
+        self.assertEqual(self.client.post(url, {'username': 'racer'}, format='json').status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.client.post(url, {'username': 'racer'}, format='json').status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(contact='1/hour'))
+    def test_contact_form_is_throttled(self):
+        url = reverse('contact-form')
+        self.client.post(url, {}, format='json')
+        self.assertEqual(self.client.post(url, {}, format='json').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+class OTPRateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_otp_checks_respect_hourly_limit(self):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: OTPService.check_rate_limit('+15551234567')[0], range(20)))
+
+        self.assertEqual(sum(results), OTPService.MAX_ATTEMPTS_PER_HOUR)
+        self.assertEqual(OTPService.get_remaining_attempts('+15551234567'), 0)
+
+    def test_resend_cooldown_starts_once(self):
+        # Checking doesn't start the cooldown; only a send that was handed off does
+        self.assertEqual(OTPService.check_resend_cooldown('+15551234567'), (True, None))
+        self.assertEqual(OTPService.get_resend_cooldown_remaining('+15551234567'), 0)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: OTPService.start_resend_cooldown('+15551234567'), range(8)))
+
+        self.assertEqual(sum(results), 1)
+        self.assertFalse(OTPService.check_resend_cooldown('+15551234567')[0])
+
+    def test_failed_delivery_does_not_start_resend_cooldown(self):
+        user = User.objects.create_user(username='otpuser', email='otp@example.com', password='testpass123')
+        with patch.object(OTPService, 'send_email_otp', return_value=False):
+            success, _ = OTPService.send_otp(user, 'otp@example.com', 'email')
+        self.assertFalse(success)
+        self.assertEqual(OTPService.get_resend_cooldown_remaining('otp@example.com'), 0)
+
+        success, _ = OTPService.send_otp(user, 'otp@example.com', 'email')
+        self.assertTrue(success)
+        self.assertGreater(OTPService.get_resend_cooldown_remaining('otp@example.com'), 0)
@@ -0,0 +1,124 @@
+"""
+Reputation Tests
+
+Tests for the maintained reputation summaries and the endpoints reading them.
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core import reputation
+from core.models.social import ReputationRating, ReputationSummary
+
+User = get_user_model()
+
+
+class ReputationSummaryTests(TestCase):
+    def setUp(self):
+        self.racer = User.objects.create_user(username='racer', email='racer@example.com', password='testpass123')
+        self.raters = [
+            User.objects.create_user(username=f'rater{i}', email=f'rater{i}@example.com', password='testpass123')
+            for i in range(3)
+        ]
+
+    def rate(self, rater, value):
+        return ReputationRating.objects.create(rater=rater, rated_user=self.racer, rating=value)
+
+    def test_create_update_delete_keep_summary_in_step(self):
+        first = self.rate(self.raters[0], 5)
+        self.rate(self.raters[1], 3)
+        self.assertEqual(reputation.stats(self.racer.id), {'average_rating': 4, 'total_ratings': 2})
+
+        first.rating = 1
+        first.save()
+        self.assertEqual(reputation.stats(self.racer.id), {'average_rating': 2, 'total_ratings': 2})
+
+        first.delete()
+        summary = ReputationSummary.objects.get(user=self.racer)
+        self.assertEqual((summary.rating_sum, summary.rating_count), (3, 1))
+
+    def test_moving_a_rating_to_another_user(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        rating = self.rate(self.raters[0], 4)
+        rating.rated_user = other
+        rating.save()
+
+        self.assertEqual(reputation.stats(self.racer.id)['total_ratings'], 0)
+        self.assertEqual(reputation.stats(other.id), {'average_rating': 4, 'total_ratings': 1})
+
+    def test_stale_instances_move_the_committed_value(self):
+        rating = self.rate(self.raters[0], 5)
+        stale = ReputationRating.objects.get(pk=rating.pk)
+        rating.rating = 2
+        rating.save()
+
+        # The stale copy still says 5; the summary must lose what was actually stored
+        stale.rating = 4
+        stale.save()
+        self.assertEqual(reputation.stats(self.racer.id), {'average_rating': 4, 'total_ratings': 1})
+        rating.delete()
+        summary = ReputationSummary.objects.get(user=self.racer)
+        self.assertEqual((summary.rating_sum, summary.rating_count), (0, 0))
+
+    def test_stats_is_one_query(self):
+        self.rate(self.raters[0], 4)
+        with self.assertNumQueries(1):
+            self.assertEqual(reputation.stats(self.racer.id)['total_ratings'], 1)
+
+    def test_fallback_without_summary(self):
+        self.rate(self.raters[0], 4)
+        self.rate(self.raters[1], 2)
+        ReputationSummary.objects.all().delete()
+
+        with self.assertNumQueries(2):
+            self.assertEqual(reputation.stats(self.racer.id), {'average_rating': 3, 'total_ratings': 2})
+
+    def test_rebuild_repairs_drift(self):
+        self.rate(self.raters[0], 4)
+        self.rate(self.raters[1], 2)
+        ReputationRating.objects.update(rating=5)
+
+        self.assertEqual(reputation.rebuild(), 1)
+        self.assertEqual(reputation.stats(self.racer.id), {'average_rating': 5, 'total_ratings': 2})
+
+    def test_leaderboard_orders_by_average(self):
+        rival = User.objects.create_user(username='rival', email='rival@example.com', password='testpass123')
+        for rater in self.raters:
+            self.rate(rater, 3)
+            ReputationRating.objects.create(rater=rater, rated_user=rival, rating=5)
+
+        self.assertEqual([summary.user for summary in reputation.leaderboard()], [rival, self.racer])
+        self.assertEqual(list(reputation.leaderboard(min_ratings=4)), [])
+
+
+class ReputationAPITests(TestCase):
+    def setUp(self):
+        self.racer = User.objects.create_user(username='racer', email='racer@example.com', password='testpass123')
+        self.rater = User.objects.create_user(username='rater', email='rater@example.com', password='testpass123')
+        ReputationRating.objects.create(rater=self.rater, rated_user=self.racer, rating=4)
+        self.client = APIClient()
+
+    def test_reputation_endpoint(self):
+        response = self.client.get('/api/profiles/reputation/', {'user_id': self.racer.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['username'], 'racer')
+        self.assertEqual(response.data['average_rating'], 4)
+        self.assertEqual(response.data['total_ratings'], 1)
+
+        self.assertEqual(self.client.get('/api/profiles/reputation/').status_code, 400)
+        self.assertEqual(self.client.get('/api/profiles/reputation/', {'user_id': 999999}).status_code, 404)
+
+    def test_profile_includes_reputation(self):
+        response = self.client.get('/api/profiles/username/racer/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['reputation'], {'average_rating': 4, 'total_ratings': 1})
+
+        response = self.client.get('/api/profiles/username/rater/')
+        self.assertEqual(response.data['reputation'], {'average_rating': 0, 'total_ratings': 0})
+
+    def test_leaderboard_rejects_bad_limits(self):
+        self.assertEqual(self.client.get('/api/profiles/leaderboard/', {'limit': 5}).status_code, 200)
+        self.assertEqual(self.client.get('/api/profiles/leaderboard/', {'limit': -1}).status_code, 400)
+        self.assertEqual(self.client.get('/api/profiles/leaderboard/', {'limit': 0}).status_code, 400)
+        self.assertEqual(self.client.get('/api/profiles/leaderboard/', {'limit': 'ten'}).status_code, 400)
@@ -0,0 +1,75 @@
+"""
+Bulk Seeding Tests
+
+Tests for the bulk insert helpers, the synthetic dataset generator and the
+populate_* commands built on them.
+"""
+
+import random
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core import seeding
+from core.models.auth import UserProfile
+from core.models.racing import Callout, Event, Track
+from core.models.social import Follow, UserPost
+
+
+class SeedingTests(TestCase):
+    def test_seed_generates_consistent_dataset(self):
+        inserted = seeding.seed(scale=0.03, seed_value=7, batch_size=16)
+
+        users = seeding.seeded_users()
+        self.assertEqual(users.count(), 30)
+        self.assertEqual(UserProfile.objects.filter(user__in=users).count(), 30)
+        self.assertEqual(Follow.objects.count(), 30 * seeding.FOLLOWS_PER_USER)
+        self.assertFalse(Follow.objects.filter(follower=F('following')).exists())
+        self.assertEqual(UserPost.objects.count(), 30 * seeding.POSTS_PER_USER)
+        self.assertEqual(Callout.objects.count(), inserted['callouts'])
+        self.assertTrue(users.first().check_password(seeding.SEED_PASSWORD))
+
+    def test_seed_is_deterministic(self):
+        first = [(p.content, p.likes_count) for p in seeding._posts(random.Random(3), [1, 2, 3], 4)]
+        second = [(p.content, p.likes_count) for p in seeding._posts(random.Random(3), [1, 2, 3], 4)]
+        self.assertEqual(first, second)
+
+    def test_seeding_again_appends(self):
+        seeding.seed(scale=0.01)
+        seeding.seed(scale=0.01)
+
+        self.assertEqual(seeding.seeded_users().count(), 20)
+
+    def test_upsert_by(self):
+        Track.objects.create(name='Existing', location='Old', description='Old')
+        rows = [
+            {'name': 'Existing', 'location': 'New', 'description': 'Updated'},
+            {'name': 'Fresh', 'location': 'Here', 'description': 'New track'},
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            created, updated = seeding.upsert_by(Track, 'name', rows)
+
+        writes = [q['sql'].split()[0] for q in queries.captured_queries if q['sql'].startswith(('INSERT', 'UPDATE'))]
+        self.assertEqual(writes, ['INSERT', 'UPDATE'])
+
+        self.assertEqual([t.name for t in created], ['Fresh'])
+        self.assertEqual(Track.objects.get(name='Existing').location, 'New')
+
+        created, updated = seeding.upsert_by(Track, 'name', rows, update=False)
+        self.assertEqual((created, updated), ([], []))
+
+    def test_populate_commands(self):
+        call_command('populate_dragstrips', stdout=StringIO())
+        dragstrips = Track.objects.count()
+        call_command('populate_dragstrips', stdout=StringIO())
+        self.assertEqual(Track.objects.count(), dragstrips)
+
+        call_command('populate_railway_data', stdout=StringIO())
+        call_command('populate_railway_data', stdout=StringIO())
+        self.assertEqual(Event.objects.count(), 2)
+        self.assertEqual(Callout.objects.count(), 2)
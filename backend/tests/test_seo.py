@@ -0,0 +1,82 @@
+"""
+SEO Payload Tests
+
+Tests for the cached meta tags / JSON-LD payloads, their invalidation and
+the SEO endpoint.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import seo
+from core.models.racing import Event, Track
+
+User = get_user_model()
+
+
+@override_settings(SITEMAP_SITE_URL='https://calloutracing.test')
+class SEOPayloadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='organizer', email='organizer@example.com', password='testpass123')
+        self.track = Track.objects.create(name='Test Track', location='Test Location', description='Test track')
+        start = timezone.now() + timedelta(days=3)
+        self.event = Event.objects.create(
+            title='Test Event', description='Test event', event_type='race', start_date=start,
+            end_date=start + timedelta(hours=2), organizer=self.user, track=self.track,
+        )
+
+    def test_payload_is_served_from_cache(self):
+        with self.assertNumQueries(1):
+            first = seo.get_payload('event', self.event.id)
+        with self.assertNumQueries(0):
+            second = seo.get_payload('event', self.event.id)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first['url'], f'https://calloutracing.test/events/{self.event.id}')
+        self.assertEqual(first['structured_data']['startDate'], self.event.start_date.isoformat())
+
+    def test_changes_invalidate_payloads(self):
+        seo.get_payload('event', self.event.id)
+        seo.get_payload('track', self.track.id)
+
+        self.event.title = 'Renamed'
+        self.event.save()
+        self.track.name = 'Renamed Track'
+        self.track.save()
+
+        self.assertEqual(seo.get_payload('track', self.track.id)['structured_data']['name'], 'Renamed Track')
+        location = seo.get_payload('event', self.event.id)['structured_data']['location']
+        self.assertEqual(location['name'], 'Renamed Track')
+
+    def test_missing_objects_are_remembered(self):
+        self.assertIsNone(seo.get_payload('event', 999))
+        with self.assertNumQueries(0):
+            self.assertIsNone(seo.get_payload('event', 999))
+
+    def test_deleted_object_is_not_served(self):
+        event_id = self.event.id
+        seo.get_payload('event', event_id)
+
+        self.event.delete()
+
+        self.assertIsNone(seo.get_payload('event', event_id))
+
+    def test_warm(self):
+        self.assertEqual(seo.warm(['event', 'track']), 2)
+
+        with self.assertNumQueries(0):
+            seo.get_payload('event', self.event.id)
+            seo.get_payload('track', self.track.id)
+
+    def test_endpoint(self):
+        response = self.client.get(f'/api/seo/event/{self.event.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['structured_data']['@type'], 'Event')
+
+        self.assertEqual(self.client.get('/api/seo/event/999/').status_code, 404)
+        self.assertEqual(self.client.get('/api/seo/').data['structured_data']['@type'], 'WebSite')
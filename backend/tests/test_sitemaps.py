@@ -0,0 +1,116 @@
+"""
+Sitemap Tests
+
+Tests for the chunked, incremental sitemap pipeline and the views serving
+the pre-rendered files.
+"""
+
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+from xml.etree import ElementTree
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import sitemaps
+from core.models.racing import Event, Track
+
+User = get_user_model()
+
+NS = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+
+
+class SitemapTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root, SITEMAP_SITE_URL='https://calloutracing.test', SITEMAP_FILES_URL=''
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        chunk_size = patch('core.sitemaps.CHUNK_SIZE', 3)
+        chunk_size.start()
+        self.addCleanup(chunk_size.stop)
+
+        self.user = User.objects.create_user(username='organizer', email='organizer@example.com', password='testpass123')
+        self.track = Track.objects.create(name='Test Track', location='Test Location', description='Test track')
+
+    def event(self, **fields):
+        start = timezone.now() + timedelta(days=3)
+        return Event.objects.create(**{
+            'title': 'Test Event', 'description': 'Test event', 'event_type': 'race', 'start_date': start,
+            'end_date': start + timedelta(hours=2), 'organizer': self.user, 'track': self.track, **fields,
+        })
+
+    def read(self, filename):
+        with sitemaps.open_sitemap(filename) as sitemap:
+            return ElementTree.fromstring(sitemap.read())
+
+    def locs(self, filename):
+        return [loc.text for loc in self.read(filename).findall('.//sm:loc', NS)]
+
+    def test_sections_are_chunked_with_an_index(self):
+        events = [self.event() for _ in range(7)]
+        self.event(is_public=False)
+
+        result = sitemaps.build_sitemaps()
+
+        index = self.locs('sitemap.xml')
+        self.assertIn('https://calloutracing.test/sitemaps/sitemap-pages.xml', index)
+        self.assertIn('https://calloutracing.test/sitemaps/sitemap-events-3.xml', index)
+        self.assertEqual(self.locs('sitemap-events-1.xml'), [f'https://calloutracing.test/events/{e.id}' for e in events[:3]])
+        self.assertEqual(len(self.locs('sitemap-events-3.xml')), 1)
+        self.assertEqual(result['urls'], len(sitemaps.STATIC_PAGES) + 7 + 1)
+
+    def test_lastmod_is_newest_update(self):
+        events = [self.event() for _ in range(2)]
+        Event.objects.filter(pk=events[1].pk).update(updated_at=timezone.now() + timedelta(hours=1))
+        events[1].refresh_from_db()
+
+        sitemaps.build_sitemaps()
+
+        entries = self.read('sitemap.xml').findall('sm:sitemap', NS)
+        lastmods = {e.find('sm:loc', NS).text.rsplit('/', 1)[1]: e.find('sm:lastmod', NS) for e in entries}
+        self.assertIsNone(lastmods['sitemap-pages.xml'])
+        self.assertEqual(lastmods['sitemap-events-1.xml'].text, sitemaps.format_lastmod(events[1].updated_at))
+
+    def test_incremental_build_only_rewrites_changed_chunks(self):
+        events = [self.event() for _ in range(7)]
+        sitemaps.build_sitemaps()
+
+        self.assertEqual(sitemaps.build_sitemaps()['files_written'], 1)
+
+        events[0].title = 'Renamed'
+        events[0].save()
+        self.assertEqual(sitemaps.build_sitemaps()['files_written'], 2)
+
+        events[4].delete()
+        for _ in range(3):
+            self.event()
+        result = sitemaps.build_sitemaps()
+
+        # Chunk 2 lost a row, chunk 3 filled up and chunk 4 was split off; chunk 1 is untouched
+        self.assertEqual(result['files_written'], 4)
+        self.assertNotIn(f'https://calloutracing.test/events/{events[4].id}', self.locs('sitemap-events-2.xml'))
+        self.assertEqual(len(self.locs('sitemap-events-4.xml')), 1)
+
+    def test_sitemap_views(self):
+        self.event()
+        sitemaps.build_sitemaps()
+
+        response = self.client.get('/sitemap.xml')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/xml')
+        self.assertIn('Last-Modified', response)
+        self.assertIn(b'sitemap-events-1.xml', b''.join(response.streaming_content))
+
+        not_modified = self.client.get('/sitemap.xml', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(not_modified.status_code, 304)
+
+        self.assertEqual(self.client.get('/sitemaps/sitemap-events-1.xml').status_code, 200)
+        self.assertEqual(self.client.get('/sitemaps/manifest.json').status_code, 404)
+        self.assertEqual(self.client.get('/sitemaps/sitemap-events-9.xml').status_code, 404)
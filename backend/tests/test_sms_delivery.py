@@ -0,0 +1,153 @@
+"""
+SMS Delivery Tests
+
+Tests for queued OTP text messages: the login request only persists the
+OTP, and the SMS queue delivers it with failover between providers.
+"""
+
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import sms_providers
+from core.models.auth import OTP
+from core.models.outbox import OutboundSMS
+from core.sms_providers import LocMemProvider, SMSDeliveryError, TwilioProvider
+from core.sms_queue import deliver_pending_sms, enqueue_sms
+
+User = get_user_model()
+
+
+@override_settings(SMS_PROVIDERS=['locmem'])
+class SMSQueueTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        LocMemProvider.outbox = []
+        sms_providers._cooldown_until.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='racer',
+            email='racer@example.com',
+            password='testpass123',
+            phone_number='+15551234567'
+        )
+
+    def test_phone_login_returns_before_sms_is_sent(self):
+        response = self.client.post(reverse('phone-login'), {'phone_number': '+15551234567'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        otp = OTP.objects.get(user=self.user, otp_type='phone')
+        sms = OutboundSMS.objects.get()
+        self.assertEqual(sms.status, 'pending')
+        self.assertIn(otp.code, sms.body)
+        self.assertEqual(LocMemProvider.outbox, [])
+
+        self.assertEqual(deliver_pending_sms(), {'sent': 1, 'retried': 0, 'failed': 0})
+        self.assertEqual(LocMemProvider.outbox[0]['to'], '+15551234567')
+        sms.refresh_from_db()
+        self.assertEqual(sms.status, 'sent')
+        self.assertEqual(sms.provider, 'locmem')
+
+    @override_settings(BACKGROUND_WORKER_MODE='inline')
+    def test_enqueue_delivers_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue_sms('+15551234567', 'Hello')
+
+        self.assertEqual(len(LocMemProvider.outbox), 1)
+
+    @override_settings(
+        SMS_PROVIDERS=['twilio', 'locmem'],
+        TWILIO_ACCOUNT_SID='AC123',
+        TWILIO_AUTH_TOKEN='secret',
+        TWILIO_FROM_NUMBER='+15550000000',
+    )
+    def test_fails_over_to_next_provider(self):
+        enqueue_sms('+15551234567', 'Hello')
+        enqueue_sms('+15557654321', 'Hello again')
+
+        with patch.object(TwilioProvider, 'send', side_effect=SMSDeliveryError('twilio down')) as twilio_send:
+            results = deliver_pending_sms()
+
+        self.assertEqual(results['sent'], 2)
+        self.assertEqual(len(LocMemProvider.outbox), 2)
+        self.assertEqual(set(OutboundSMS.objects.values_list('provider', flat=True)), {'locmem'})
+        # After the first failure twilio is skipped while it cools down
+        self.assertEqual(twilio_send.call_count, 1)
+
+    @override_settings(
+        SMS_PROVIDERS=['twilio', 'locmem'],
+        TWILIO_ACCOUNT_SID='AC123',
+        TWILIO_AUTH_TOKEN='secret',
+        TWILIO_FROM_NUMBER='+15550000000',
+    )
+    def test_message_rejection_does_not_cool_down_provider(self):
+        enqueue_sms('+1555', 'Hello')
+        enqueue_sms('+15557654321', 'Hello again')
+
+        rejected = SMSDeliveryError('twilio returned HTTP 400: invalid number', provider_failure=False)
+        with patch.object(TwilioProvider, 'send', side_effect=[rejected, 'SM123']) as twilio_send:
+            results = deliver_pending_sms()
+
+        self.assertEqual(results['sent'], 2)
+        self.assertEqual(twilio_send.call_count, 2)
+        self.assertEqual(sorted(OutboundSMS.objects.values_list('provider', flat=True)), ['locmem', 'twilio'])
+        self.assertNotIn('twilio', sms_providers._cooldown_until)
+
+    @override_settings(TWILIO_ACCOUNT_SID='AC123', TWILIO_AUTH_TOKEN='secret', TWILIO_FROM_NUMBER='+15550000000')
+    def test_only_provider_wide_http_errors_are_failures(self):
+        provider = TwilioProvider()
+        for status_code, provider_failure in ((400, False), (404, False), (429, True), (503, True)):
+            response = Mock(status_code=status_code, text='error')
+            with patch.object(provider.session, 'post', return_value=response):
+                with self.assertRaises(SMSDeliveryError) as raised:
+                    provider.send('+15551234567', 'Hello')
+            self.assertEqual(raised.exception.provider_failure, provider_failure, status_code)
+
+    @override_settings(SMS_PROVIDERS=['console'], SMS_QUEUE_MAX_ATTEMPTS=1, DEBUG=True)
+    def test_console_provider_counts_as_sent_in_debug(self):
+        sms = enqueue_sms('+15551234567', 'Your code is 123456')
+
+        with self.assertLogs('core.sms_providers', level='INFO') as logs:
+            self.assertEqual(deliver_pending_sms(), {'sent': 1, 'retried': 0, 'failed': 0})
+        self.assertIn('Your code is 123456', '\n'.join(logs.output))
+        sms.refresh_from_db()
+        self.assertEqual(sms.status, 'sent')
+        self.assertEqual(sms.provider, 'console')
+
+    @override_settings(SMS_PROVIDERS=['console'], SMS_QUEUE_MAX_ATTEMPTS=1, DEBUG=False)
+    def test_console_provider_is_not_counted_as_sent(self):
+        sms = enqueue_sms('+15551234567', 'Your code is 123456')
+
+        self.assertEqual(deliver_pending_sms(), {'sent': 0, 'retried': 0, 'failed': 1})
+        sms.refresh_from_db()
+        self.assertEqual(sms.status, 'failed')
+        self.assertIsNone(sms.sent_at)
+        self.assertIn('does not deliver', sms.last_error)
+
+    @override_settings(SMS_PROVIDERS=[], SMS_QUEUE_MAX_ATTEMPTS=1)
+    def test_no_provider_marks_message_failed(self):
+        sms = enqueue_sms('+15551234567', 'Hello')
+
+        self.assertEqual(deliver_pending_sms()['failed'], 1)
+        sms.refresh_from_db()
+        self.assertEqual(sms.status, 'failed')
+        self.assertIn('No SMS provider', sms.last_error)
+
+    def test_purge_outbox_deletes_old_finished_messages(self):
+        from datetime import timedelta
+        from io import StringIO
+        from django.core.management import call_command
+        from django.utils import timezone
+
+        old = enqueue_sms('+15551234567', 'Your code is 123456')
+        OutboundSMS.objects.filter(pk=old.pk).update(status='sent', created_at=timezone.now() - timedelta(hours=48))
+        pending = enqueue_sms('+15551234567', 'Your code is 654321')
+
+        call_command('purge_outbox', stdout=StringIO())
+
+        self.assertEqual(list(OutboundSMS.objects.values_list('pk', flat=True)), [pending.pk])
@@ -0,0 +1,124 @@
+"""
+Stripe Cache Tests
+
+Tests for the read-through Stripe object cache and its webhook
+invalidation, against the local Stripe stub.
+"""
+
+import stripe
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import stripe_cache
+from tests.stripe_stub import WEBHOOK_SECRET, StripeStub
+
+User = get_user_model()
+
+
+class StripeCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.stripe = StripeStub()
+        patcher = self.stripe.patch()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_retrieve_calls_stripe_once(self):
+        self.stripe.add('account', 'acct_1', charges_enabled=True, requirements={'currently_due': []})
+
+        first = stripe_cache.retrieve('account', 'acct_1')
+        second = stripe_cache.retrieve('account', 'acct_1')
+
+        self.assertEqual(len(self.stripe.api_calls()), 1)
+        self.assertIsInstance(second, stripe.Account)
+        self.assertEqual(second.charges_enabled, first.charges_enabled)
+        self.assertEqual(second.requirements.currently_due, [])
+
+    def test_missing_objects_are_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(stripe.error.InvalidRequestError):
+                stripe_cache.retrieve('price', 'price_missing')
+
+        self.assertEqual(len(self.stripe.api_calls()), 2)
+
+    def test_open_sessions_expire_quickly(self):
+        self.assertEqual(stripe_cache._timeout('checkout_session', {'status': 'open'}), stripe_cache.OPEN_SESSION_TIMEOUT)
+        self.assertEqual(stripe_cache._timeout('checkout_session', {'status': 'complete'}), stripe_cache.FINAL_SESSION_TIMEOUT)
+
+    def test_event_invalidates_object_and_connected_account(self):
+        self.stripe.add('account', 'acct_1', charges_enabled=False)
+        self.stripe.add('customer', 'cus_1', email='old@example.com')
+        stripe_cache.retrieve('account', 'acct_1')
+        stripe_cache.retrieve('customer', 'cus_1')
+
+        self.stripe.objects['acct_1']['charges_enabled'] = True
+        stripe_cache.invalidate_for_event(self.stripe.event(
+            'capability.updated', {'id': 'card_payments', 'object': 'capability', 'account': 'acct_1'}
+        ))
+
+        self.assertTrue(stripe_cache.retrieve('account', 'acct_1').charges_enabled)
+        stripe_cache.retrieve('customer', 'cus_1')
+        self.assertEqual(len(self.stripe.api_calls()), 3)
+
+    def test_checkout_session_is_reused_while_open(self):
+        create = lambda: self.stripe.resource('checkout_session').create(mode='subscription')
+
+        first = stripe_cache.reusable_checkout_session('subscription:1:price_pro', create)
+        second = stripe_cache.reusable_checkout_session('subscription:1:price_pro', create)
+        other = stripe_cache.reusable_checkout_session('subscription:2:price_pro', create)
+
+        self.assertEqual(first.id, second.id)
+        self.assertNotEqual(first.id, other.id)
+        self.assertEqual(len(self.stripe.api_calls('create')), 2)
+        self.assertEqual(len(self.stripe.api_calls()), 0)
+
+    def test_completed_session_is_not_reused(self):
+        create = lambda: self.stripe.resource('checkout_session').create(mode='subscription')
+        first = stripe_cache.reusable_checkout_session('subscription:1:price_pro', create)
+
+        self.stripe.objects[first.id]['status'] = 'complete'
+        stripe_cache.invalidate('checkout_session', first.id)
+
+        second = stripe_cache.reusable_checkout_session('subscription:1:price_pro', create)
+        self.assertNotEqual(first.id, second.id)
+
+
+@override_settings(STRIPE_WEBHOOK_SECRET=WEBHOOK_SECRET, BACKGROUND_WORKER_MODE='external')
+class StripeCacheViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.stripe = StripeStub()
+        patcher = self.stripe.patch()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(username='seller', email='seller@example.com', password='testpass123')
+        self.user.stripe_connect_account_id = 'acct_seller'
+        self.user.save()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_connect_status_is_served_from_cache_until_webhook(self):
+        self.stripe.add('account', 'acct_seller', charges_enabled=False, payouts_enabled=False,
+                        details_submitted=False, requirements={})
+        url = reverse('connect-account-status')
+
+        for _ in range(3):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertFalse(response.data['charges_enabled'])
+        self.assertEqual(len(self.stripe.api_calls()), 1)
+
+        self.stripe.objects['acct_seller']['charges_enabled'] = True
+        payload, signature = self.stripe.signed(self.stripe.event(
+            'account.updated', dict(self.stripe.objects['acct_seller']), account='acct_seller'
+        ))
+        self.client.post(reverse('stripe-webhook'), data=payload, content_type='application/json',
+                         HTTP_STRIPE_SIGNATURE=signature)
+
+        self.assertTrue(self.client.get(url).data['charges_enabled'])
+        self.assertEqual(len(self.stripe.api_calls()), 2)
@@ -0,0 +1,158 @@
+"""
+Stripe Webhook Tests
+
+Tests for the webhook inbox against a local Stripe stub: events are signed
+here with a test secret exactly as Stripe signs them, so the real signature
+verification runs.
+"""
+
+import json
+import time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models.payments import Payment, StripeWebhookEvent, Subscription
+from core.webhook_inbox import process_webhook_events
+from tests.stripe_stub import WEBHOOK_SECRET, StripeStub
+
+User = get_user_model()
+
+
+@override_settings(STRIPE_WEBHOOK_SECRET=WEBHOOK_SECRET)
+class StripeWebhookInboxTests(TestCase):
+    def setUp(self):
+        self.stripe = StripeStub()
+        self.user = User.objects.create_user(username='buyer', email='buyer@example.com', password='testpass123')
+
+    def post(self, event, url_name='stripe-webhook'):
+        payload, signature = self.stripe.signed(event)
+        return self.client.post(
+            reverse(url_name), data=payload, content_type='application/json', HTTP_STRIPE_SIGNATURE=signature
+        )
+
+    def payment_intent(self, status='succeeded'):
+        return {
+            'id': 'pi_test_1',
+            'object': 'payment_intent',
+            'amount': 2500,
+            'currency': 'usd',
+            'status': status,
+            'metadata': {'buyer_id': str(self.user.id), 'transaction_type': 'one_time'},
+        }
+
+    def test_webhook_is_acknowledged_before_processing(self):
+        response = self.post(self.stripe.event('payment_intent.succeeded', self.payment_intent()))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(StripeWebhookEvent.objects.get().status, 'pending')
+        self.assertFalse(Payment.objects.exists())
+
+        self.assertEqual(process_webhook_events()['processed'], 1)
+        payment = Payment.objects.get()
+        self.assertEqual(payment.status, 'succeeded')
+        self.assertEqual(payment.amount, 25)
+
+    def test_redelivered_event_is_processed_once(self):
+        event = self.stripe.event('payment_intent.succeeded', self.payment_intent())
+
+        for _ in range(3):
+            self.assertEqual(self.post(event).status_code, 200)
+        process_webhook_events()
+
+        self.assertEqual(StripeWebhookEvent.objects.count(), 1)
+        self.assertEqual(Payment.objects.count(), 1)
+
+    def test_invalid_signature_is_rejected(self):
+        payload, _ = self.stripe.signed(self.stripe.event('payment_intent.succeeded', self.payment_intent()))
+        forged = StripeStub(secret='whsec_wrong').signed(json.loads(payload))[1]
+
+        response = self.client.post(
+            reverse('stripe-webhook'), data=payload, content_type='application/json', HTTP_STRIPE_SIGNATURE=forged
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(StripeWebhookEvent.objects.exists())
+
+    def test_failed_handler_is_retried(self):
+        self.post(self.stripe.event('payment_intent.succeeded', self.payment_intent()))
+
+        with patch('api.views.subscription_views.Payment.objects.update_or_create', side_effect=RuntimeError('db down')):
+            self.assertEqual(process_webhook_events()['retried'], 1)
+
+        event = StripeWebhookEvent.objects.get()
+        self.assertEqual((event.status, event.attempts), ('pending', 1))
+        self.assertIn('db down', event.last_error)
+
+        StripeWebhookEvent.objects.update(next_attempt_at=event.received_at)
+        self.assertEqual(process_webhook_events()['processed'], 1)
+        self.assertEqual(Payment.objects.get().status, 'succeeded')
+
+    def test_events_for_one_object_are_processed_in_order(self):
+        now = int(time.time())
+        # Stripe delivered the success before the earlier failure
+        self.post(self.stripe.event('payment_intent.succeeded', self.payment_intent(), created=now))
+        self.post(self.stripe.event('payment_intent.payment_failed', self.payment_intent('requires_payment_method'), created=now - 60))
+
+        results = process_webhook_events()
+
+        self.assertEqual(results['processed'], 2)
+        self.assertEqual(Payment.objects.get().status, 'succeeded')
+
+    def test_later_event_waits_for_earlier_retry(self):
+        now = int(time.time())
+        self.post(self.stripe.event('payment_intent.payment_failed', self.payment_intent('requires_payment_method'), created=now - 60))
+        self.post(self.stripe.event('payment_intent.succeeded', self.payment_intent(), created=now))
+
+        with patch('api.views.subscription_views.handle_payment_intent_failed', side_effect=RuntimeError('timeout')):
+            results = process_webhook_events()
+
+        self.assertEqual((results['retried'], results['deferred'], results['processed']), (1, 1, 0))
+        self.assertFalse(Payment.objects.exists())
+
+    def test_subscription_period_is_stored_as_datetime(self):
+        Subscription.objects.create(user=self.user, stripe_subscription_id='sub_test_1', status='active')
+        self.post(self.stripe.event('customer.subscription.updated', {
+            'id': 'sub_test_1',
+            'object': 'subscription',
+            'status': 'past_due',
+            'current_period_start': 1700000000,
+            'current_period_end': 1702592000,
+            'cancel_at_period_end': False,
+        }))
+
+        self.assertEqual(process_webhook_events()['processed'], 1)
+        subscription = Subscription.objects.get()
+        self.assertEqual(subscription.status, 'past_due')
+        self.assertEqual(subscription.current_period_start.year, 2023)
+
+    def test_marketplace_webhook_uses_inbox(self):
+        with patch('api.views.marketplace_views.get_stripe_webhook_secret', return_value=WEBHOOK_SECRET):
+            response = self.post(
+                self.stripe.event('payment_intent.succeeded', {'id': 'pi_market_1', 'object': 'payment_intent'}),
+                url_name='marketplace-webhook'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(StripeWebhookEvent.objects.get().endpoint, 'marketplace')
+        self.assertEqual(process_webhook_events()['processed'], 1)
+
+    def test_event_sent_to_both_endpoints_reaches_both_dispatchers(self):
+        event = self.stripe.event('payment_intent.succeeded', self.payment_intent())
+        with patch('api.views.marketplace_views.get_stripe_webhook_secret', return_value=WEBHOOK_SECRET):
+            self.assertEqual(self.post(event).status_code, 200)
+            self.assertEqual(self.post(event, url_name='marketplace-webhook').status_code, 200)
+            # A retry to one endpoint is still ignored
+            self.assertEqual(self.post(event, url_name='marketplace-webhook').status_code, 200)
+
+        self.assertEqual(
+            sorted(StripeWebhookEvent.objects.values_list('endpoint', flat=True)), ['marketplace', 'subscriptions']
+        )
+        with patch('api.views.subscription_views.dispatch_event') as subscriptions, \
+                patch('api.views.marketplace_views.dispatch_event') as marketplace:
+            self.assertEqual(process_webhook_events()['processed'], 2)
+
+        self.assertEqual(subscriptions.call_count, 1)
+        self.assertEqual(marketplace.call_count, 1)
@@ -0,0 +1,91 @@
+"""
+View Count Tests
+
+Tests for buffered, deduplicated view counting.
+"""
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.conf import settings
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import view_counter
+from core.models.marketplace import Marketplace
+from core.view_counter import flush_view_counts, pending_views, record_view, viewer_key
+
+User = get_user_model()
+
+
+class ViewCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        view_counter._pending.clear()
+        self.seller = User.objects.create_user(username='seller', email='seller@example.com', password='testpass123')
+        self.listings = [
+            Marketplace.objects.create(
+                seller=self.seller, title=f'Listing {i}', description='For sale', category='parts',
+                condition='good', price=Decimal('100.00'), location='Austin, TX'
+            )
+            for i in range(3)
+        ]
+
+    def tearDown(self):
+        view_counter._pending.clear()
+
+    def test_repeat_views_are_deduplicated(self):
+        listing = self.listings[0]
+
+        self.assertTrue(record_view(listing, 'user:1'))
+        self.assertFalse(record_view(listing, 'user:1'))
+        self.assertTrue(record_view(listing, 'user:2'))
+
+        self.assertEqual(pending_views(listing), 2)
+
+    def test_flush_batches_updates_by_delta(self):
+        for viewer in ('a', 'b'):
+            record_view(self.listings[0], viewer)
+        record_view(self.listings[1], 'a')
+        record_view(self.listings[2], 'a')
+
+        # Listings 1 and 2 share delta 1, listing 0 has delta 2
+        with self.assertNumQueries(2):
+            self.assertEqual(flush_view_counts(), 4)
+
+        views = dict(Marketplace.objects.values_list('id', 'views'))
+        self.assertEqual([views[listing.id] for listing in self.listings], [2, 1, 1])
+        self.assertEqual(flush_view_counts(), 0)
+
+    def test_only_counted_models_are_accepted(self):
+        with self.assertRaises(ValueError):
+            record_view(self.seller, 'a')
+
+    def test_viewer_key_ignores_spoofed_forwarded_for(self):
+        factory = RequestFactory()
+        # DRF uses the whole X-Forwarded-For header when NUM_PROXIES is None
+        self.assertIsInstance(settings.REST_FRAMEWORK['NUM_PROXIES'], int)
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}):
+            keys = {
+                viewer_key(factory.get('/', HTTP_X_FORWARDED_FOR=f'10.0.0.{i}, 203.0.113.7'))
+                for i in range(3)
+            }
+            self.assertEqual(keys, {'ip:203.0.113.7'})
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 0}):
+            request = factory.get('/', HTTP_X_FORWARDED_FOR='10.0.0.1', REMOTE_ADDR='198.51.100.2')
+            self.assertEqual(viewer_key(request), 'ip:198.51.100.2')
+
+    @override_settings(BACKGROUND_WORKER_MODE='inline')
+    def test_listing_detail_counts_each_viewer_once(self):
+        client = APIClient()
+        url = reverse('marketplace-detail', args=[self.listings[0].id])
+
+        client.get(url)
+        client.get(url)
+        client.force_authenticate(self.seller)
+        client.get(url)
+
+        self.listings[0].refresh_from_db()
+        self.assertEqual(self.listings[0].views, 2)